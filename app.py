@@ -1,10 +1,21 @@
 import streamlit as st
 from config.settings import Settings
 from ui.chat_ui import render_chat_ui
-from ui.audio_ui import render_audio_ui
+from ui.metrics_ui import render_metrics_panel
+from ui import warmup
 
 st.set_page_config(page_title="Voice Tutor AI", page_icon="🧒🎧", layout="centered")
 
+@st.experimental_fragment(run_every=0.5)
+def _wait_for_voice_ui():
+    # The webrtc/audio stack imports in the background; swap it in once it's there
+    if warmup.audio_error:
+        st.warning(f"Voice input is unavailable: {warmup.audio_error}")
+    elif warmup.audio_ready.is_set():
+        st.rerun()
+    else:
+        st.info("Loading voice input...")
+
 def main():
     st.title("Genie — Voice Tutor AI")
     st.caption("Kid-friendly voice tutor using your Mistral API and local STT/TTS.")
@@ -21,11 +32,19 @@ def main():
         if rate != settings.VOICE_RATE or volume != int(settings.VOICE_VOLUME * 100):
             settings.VOICE_RATE = rate
             settings.VOICE_VOLUME = volume / 100.0
+        render_metrics_panel()
 
     st.divider()
-    render_audio_ui(settings)
+    if warmup.audio_ready.is_set() and not warmup.audio_error:
+        from ui.audio_ui import render_audio_ui
+        render_audio_ui(settings)
+    else:
+        _wait_for_voice_ui()
     st.divider()
     render_chat_ui(settings)
 
+    # Heavy engines load after the page is on screen (first run only)
+    warmup.start_warmup(settings)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,71 @@
+"""Offline benchmarks for the STT, LLM and TTS stages, and for startup imports.
+
+    python -m bench                         # everything, results in .cache/bench/latest.json
+    python -m bench --only audio,llm --quick
+    python -m bench --save-baseline         # record bench/baseline.json
+    python -m bench --baseline bench/baseline.json   # exit 1 on regressions
+"""
+import argparse
+import os
+import sys
+
+from config.settings import Settings
+from . import results as res
+from . import stages
+from .startup import bench_startup
+
+STAGES = ("audio", "whisper", "llm", "tts", "startup")
+
+
+def _csv(value: str, cast=str):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    settings = Settings.load()
+    p = argparse.ArgumentParser(prog="python -m bench", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--only", default=",".join(STAGES), help="comma-separated subset of: " + ", ".join(STAGES))
+    p.add_argument("--quick", action="store_true", help="fewer clips and repeats")
+    p.add_argument("--whisper-sizes", default=settings.WHISPER_MODEL_SIZE)
+    p.add_argument("--beams", default="1,5")
+    p.add_argument("--threads", default=f"1,{os.cpu_count() or 1}")
+    p.add_argument("--out", default=".cache/bench/latest.json")
+    p.add_argument("--baseline", default="", help="compare against this results file")
+    p.add_argument("--save-baseline", nargs="?", const="bench/baseline.json", default="")
+    p.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging")
+    args = p.parse_args(argv)
+
+    only = set(_csv(args.only))
+    repeat = 2 if args.quick else 5
+    results = []
+    if "audio" in only:
+        results += stages.bench_audio_load(stages.default_clips(args.quick), repeat=repeat)
+    if "whisper" in only:
+        results += stages.bench_whisper(settings, _csv(args.whisper_sizes), _csv(args.beams, int),
+                                        _csv(args.threads, int), stages.whisper_clips(args.quick),
+                                        repeat=1 if args.quick else 3)
+    if "llm" in only:
+        results += stages.bench_llm(settings, repeat=5 if args.quick else 20)
+    if "tts" in only:
+        results += stages.bench_tts(settings, repeat=1 if args.quick else 3)
+    if "startup" in only:
+        results += bench_startup(repeat=1 if args.quick else 3)
+
+    print(res.format_table(results))
+    res.save(results, args.out)
+    print(f"\nwrote {args.out}")
+    if args.save_baseline:
+        res.save(results, args.save_baseline)
+        print(f"wrote baseline {args.save_baseline}")
+
+    if args.baseline:
+        rows = res.compare(results, res.load(args.baseline), args.tolerance)
+        print("\n" + res.format_comparison(rows))
+        if any(regressed for *_, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import glob
+import io
+import os
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import lfilter
+
+# (F1, F2) for a handful of vowels; enough to give the clips a speech-like spectrum
+_VOWELS = [(730, 1090), (270, 2290), (300, 870), (530, 1840), (640, 1190)]
+
+
+@dataclass
+class Clip:
+    name: str
+    wav_bytes: bytes
+    sample_rate: int
+    channels: int
+    duration: float
+
+
+def _resonator(x: np.ndarray, freq: float, bw: float, sr: int) -> np.ndarray:
+    r = np.exp(-np.pi * bw / sr)
+    theta = 2 * np.pi * freq / sr
+    return lfilter([1 - r], [1, -2 * r * np.cos(theta), r * r], x)
+
+
+def synth_speech(duration: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """Deterministic speech-like float32 signal: voiced syllables with pauses between words."""
+    rng = np.random.default_rng(seed)
+    n = int(duration * sample_rate)
+    out = np.zeros(n, dtype=np.float64)
+    pos = int(0.2 * sample_rate)
+    while pos < n:
+        syl = int(rng.uniform(0.12, 0.3) * sample_rate)
+        end = min(n, pos + syl)
+        t = np.arange(end - pos) / sample_rate
+        f0 = rng.uniform(110, 220) * (1 + 0.1 * np.sin(2 * np.pi * 3 * t))
+        phase = np.cumsum(f0) / sample_rate
+        pulses = (np.diff(np.floor(phase), prepend=0) > 0).astype(np.float64)
+        f1, f2 = _VOWELS[rng.integers(len(_VOWELS))]
+        voiced = _resonator(pulses, f1, 90, sample_rate) + 0.5 * _resonator(pulses, min(f2, sample_rate / 2 - 200), 110, sample_rate)
+        voiced += 0.02 * rng.standard_normal(voiced.size)
+        out[pos:end] = voiced * np.hanning(voiced.size)
+        gap = rng.uniform(0.02, 0.08) if rng.random() < 0.7 else rng.uniform(0.2, 0.5)
+        pos = end + int(gap * sample_rate)
+    peak = np.abs(out).max() or 1.0
+    return (0.5 * out / peak).astype(np.float32)
+
+
+def _encode(samples: np.ndarray, sample_rate: int) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, samples, sample_rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def synthetic_clips(durations: Sequence[float] = (1, 5, 15, 30),
+                    sample_rates: Sequence[int] = (8000, 16000, 44100, 48000),
+                    channels: Sequence[int] = (1, 2)) -> List[Clip]:
+    clips = []
+    for i, duration in enumerate(durations):
+        for sr in sample_rates:
+            mono = synth_speech(duration, sr, seed=i)
+            for ch in channels:
+                samples = mono if ch == 1 else np.stack([mono] * ch, axis=1)
+                clips.append(Clip(f"synth/{sr}Hz/{ch}ch/{duration:g}s", _encode(samples, sr), sr, ch, duration))
+    return clips
+
+
+def recorded_clips(directory: str = "") -> List[Clip]:
+    # Real speech for Whisper timings: any wav/flac/ogg in BENCH_CLIPS_DIR (or bench/recordings/)
+    directory = directory or os.getenv("BENCH_CLIPS_DIR") or os.path.join(os.path.dirname(__file__), "recordings")
+    clips = []
+    for path in sorted(glob.glob(os.path.join(directory, "*"))):
+        if not path.lower().endswith((".wav", ".flac", ".ogg")):
+            continue
+        info = sf.info(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        clips.append(Clip(f"recorded/{os.path.basename(path)}", data, info.samplerate, info.channels, info.duration))
+    return clips
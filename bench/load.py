@@ -0,0 +1,148 @@
+"""Concurrent-session load generator for the full STT -> LLM -> TTS turn path.
+
+    python -m bench.load --concurrency 1,2,4,8,16 --turns 5 --tokens-per-sec 40 --latency-ms 300
+
+Each simulated session owns a TurnPipeline, like a browser tab, and runs
+turns back to back: real Whisper on a clip, the LLM against the local stub
+server (or --llm-base), and real TTS. Reports throughput and tail latency
+per concurrency level.
+"""
+import argparse
+import dataclasses
+import json
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.settings import Settings
+from nlp.mistral_service import MISTRAL_UNAVAILABLE, OLLAMA_UNAVAILABLE
+from pipeline.turn_pipeline import AUDIO, DONE, ERROR, TOKEN, TRANSCRIPT, TurnPipeline
+from stt.stt_service import STTService
+from .clips import Clip
+from .results import Result, save
+from .stages import QUESTION, whisper_clips
+from .stub_server import StubLLMServer, add_config_args, config_from_args
+
+
+def _run_turn(pipeline: TurnPipeline, stt: Optional[STTService], clip: Optional[Clip],
+              stats: Dict[str, list], lock: threading.Lock):
+    def transcribe() -> str:
+        # Synthetic clips decode to little or nothing; the LLM/TTS stages still get a real question
+        text = stt.transcribe(clip.wav_bytes, language=pipeline.settings.LANGUAGE) if stt else ""
+        return text or QUESTION
+
+    t0 = time.perf_counter()
+    marks, reply = {}, None
+    handle = pipeline.start(transcribe=transcribe)
+    for event in handle.events(timeout=120):
+        now = time.perf_counter() - t0
+        if event.kind in (TRANSCRIPT, TOKEN, AUDIO) and event.kind not in marks:
+            marks[event.kind] = now
+        elif event.kind in (DONE, ERROR):
+            marks[event.kind] = now
+            reply = event.data
+    with lock:
+        if DONE in marks and reply in (MISTRAL_UNAVAILABLE, OLLAMA_UNAVAILABLE):
+            stats["degraded"].append(marks[DONE])  # provider failed; the kid heard the apology
+        elif DONE in marks:
+            stats["turn"].append(marks[DONE])
+            for kind, key in ((TRANSCRIPT, "transcript"), (TOKEN, "first_token"), (AUDIO, "first_audio")):
+                if kind in marks:
+                    stats[key].append(marks[kind])
+        else:
+            stats["errors"].append(marks.get(ERROR, time.perf_counter() - t0))
+
+
+def run_level(settings: Settings, sessions: int, turns: int, clips: List[Clip],
+              use_stt: bool, think_sec: float) -> Dict[str, object]:
+    stats = {k: [] for k in ("turn", "transcript", "first_token", "first_audio", "errors", "degraded")}
+    lock = threading.Lock()
+    stt = STTService(settings) if use_stt else None
+
+    def session(i: int):
+        pipeline = TurnPipeline(settings, strict_api=True)
+        for t in range(turns):
+            clip = clips[(i + t) % len(clips)] if clips else None
+            _run_turn(pipeline, stt, clip, stats, lock)
+            if think_sec:
+                time.sleep(think_sec)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,), daemon=True) for i in range(sessions)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - t0
+
+    report = {"sessions": sessions, "turns": len(stats["turn"]), "errors": len(stats["errors"]),
+              "degraded": len(stats["degraded"]),
+              "wall_sec": wall, "turns_per_sec": len(stats["turn"]) / wall if wall else 0.0}
+    for key in ("turn", "transcript", "first_token", "first_audio"):
+        values = np.asarray(stats[key]) if stats[key] else np.zeros(1)
+        p50, p95, p99 = np.quantile(values, (0.5, 0.95, 0.99))
+        report[key] = {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+    return report
+
+
+def to_results(reports: List[Dict[str, object]]) -> List[Result]:
+    # Same shape as the offline suite, so load runs can be saved and compared too
+    out = []
+    for r in reports:
+        n = r["sessions"]
+        out.append(Result(f"load/c{n}/turns_per_sec", r["turns_per_sec"], "turns/s", "higher"))
+        for key in ("turn", "first_audio"):
+            for q in ("p50", "p95", "p99"):
+                out.append(Result(f"load/c{n}/{key}_{q}", r[key][q] * 1000, "ms"))
+    return out
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.load", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--concurrency", default="1,2,4,8")
+    p.add_argument("--turns", type=int, default=5, help="turns per session")
+    p.add_argument("--think-ms", type=float, default=0.0, help="pause between a session's turns")
+    p.add_argument("--provider", default="MISTRAL_API", choices=("MISTRAL_API", "OLLAMA"))
+    p.add_argument("--llm-base", default="", help="use this server instead of starting the stub")
+    p.add_argument("--no-stt", action="store_true", help="skip Whisper and send text turns")
+    p.add_argument("--cache", action="store_true", help="keep the answer/TTS caches and FAQ shortcut enabled")
+    p.add_argument("--out", default=".cache/bench/load.json")
+    add_config_args(p)
+    args = p.parse_args(argv)
+
+    stub = None if args.llm_base else StubLLMServer(config_from_args(args)).start()
+    base_url = args.llm_base or stub.url
+    settings = dataclasses.replace(
+        Settings.load(), LLM_PROVIDER=args.provider, MISTRAL_API_BASE=base_url, OLLAMA_HOST=base_url,
+        ANSWER_CACHE_ENABLED=args.cache, TTS_CACHE_ENABLED=args.cache, FAQ_ENABLED=args.cache,
+    )
+    if not settings.MISTRAL_API_KEY:
+        settings.MISTRAL_API_KEY = "load-test"
+
+    clips = [] if args.no_stt else whisper_clips(quick=True)
+    reports = []
+    try:
+        for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            report = run_level(settings, level, args.turns, clips, not args.no_stt, args.think_ms / 1000.0)
+            reports.append(report)
+            print(f"c={level:<3} {report['turns_per_sec']:6.2f} turns/s  errors={report['errors']:<3} degraded={report['degraded']:<3} "
+                  f"turn p50/p95/p99 {report['turn']['p50']:.2f}/{report['turn']['p95']:.2f}/{report['turn']['p99']:.2f}s  "
+                  f"first audio p95 {report['first_audio']['p95']:.2f}s", flush=True)
+    finally:
+        if stub is not None:
+            print("stub:", stub.stats)
+            stub.stop()
+
+    save(to_results(reports), args.out)
+    with open(args.out.replace(".json", "") + ".levels.json", "w") as f:
+        json.dump(reports, f, indent=2)
+    print(f"wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+
+@dataclass
+class Result:
+    name: str
+    value: float
+    unit: str
+    better: str = "lower"   # lower or higher
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> float:
+    # Median wall time of fn() in seconds
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def measure_overhead(base: Callable[[], object], fn: Callable[[], object], repeat: int = 5,
+                     warmup: int = 1) -> float:
+    # Median of fn() - base() over back-to-back pairs, alternating which runs first,
+    # so drift between two separate medians can't make the difference negative
+    for _ in range(warmup):
+        base()
+        fn()
+    pair = [("base", base), ("fn", fn)]
+    diffs = []
+    for i in range(repeat):
+        times = {}
+        for key, f in (pair if i % 2 == 0 else pair[::-1]):
+            t0 = time.perf_counter()
+            f()
+            times[key] = time.perf_counter() - t0
+        diffs.append(times["fn"] - times["base"])
+    return statistics.median(diffs)
+
+
+def environment() -> Dict[str, object]:
+    import numpy as np
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results: List[Result], path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"env": environment(), "results": [asdict(r) for r in results]}, f, indent=2)
+
+
+def load(path: str) -> List[Result]:
+    with open(path) as f:
+        return [Result(**r) for r in json.load(f)["results"]]
+
+
+def compare(current: List[Result], baseline: List[Result],
+            tolerance: float = 0.15) -> List[Tuple[Result, Result, float, bool]]:
+    """Pairs results by name; returns (current, baseline, change, regressed).
+
+    ``change`` is the relative change in the "better" direction, so a
+    negative number is always a slowdown.
+    """
+    base = {r.name: r for r in baseline}
+    rows = []
+    for cur in current:
+        old = base.get(cur.name)
+        if old is None or not old.value:
+            continue
+        change = (cur.value - old.value) / old.value
+        if cur.better == "lower":
+            change = -change
+        rows.append((cur, old, change, change < -tolerance))
+    return rows
+
+
+def format_table(results: List[Result]) -> str:
+    width = max((len(r.name) for r in results), default=10)
+    return "\n".join(f"{r.name:<{width}}  {r.value:>12.4g} {r.unit}" for r in results)
+
+
+def format_comparison(rows) -> str:
+    width = max((len(cur.name) for cur, *_ in rows), default=10)
+    lines = []
+    for cur, old, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        lines.append(f"{cur.name:<{width}}  {old.value:>10.4g} -> {cur.value:<10.4g} {cur.unit:<12} {change:+7.1%} {flag}")
+    return "\n".join(lines)
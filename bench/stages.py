@@ -0,0 +1,142 @@
+import dataclasses
+import tempfile
+from typing import List, Sequence
+
+import requests
+
+from config.settings import Settings
+from stt.utils import load_audio_to_mono_16k
+from .clips import Clip, recorded_clips, synthetic_clips
+from .results import Result, measure, measure_overhead
+from .stub_server import StubLLMServer
+
+QUESTION = "Why do plants need sunlight?"
+TTS_TEXTS = {
+    "short": "Great question!",
+    "long": "Plants make their own food from sunlight. They take in water and air, "
+            "and their leaves turn it into sugar. That is called photosynthesis!",
+}
+
+
+def bench_audio_load(clips: Sequence[Clip], repeat: int = 5) -> List[Result]:
+    results = []
+    for clip in clips:
+        t = measure(lambda: load_audio_to_mono_16k(clip.wav_bytes), repeat=repeat)
+        results.append(Result(
+            f"audio_load/{clip.name}", clip.duration / t, "x realtime", "higher",
+            {"sample_rate": clip.sample_rate, "channels": clip.channels, "duration": clip.duration},
+        ))
+    return results
+
+
+def bench_whisper(settings: Settings, sizes: Sequence[str], beams: Sequence[int],
+                  threads: Sequence[int], clips: Sequence[Clip], repeat: int = 3) -> List[Result]:
+    from faster_whisper import WhisperModel
+
+    audio = [(clip, load_audio_to_mono_16k(clip.wav_bytes)[0]) for clip in clips]
+    results = []
+    for size in sizes:
+        for n_threads in threads:
+            try:
+                # Offline: only models already in the local cache are benchmarked
+                model = WhisperModel(size, device=settings.WHISPER_DEVICE, compute_type=settings.WHISPER_COMPUTE_TYPE,
+                                     cpu_threads=n_threads, local_files_only=True)
+            except Exception as e:
+                print(f"skipping whisper {size}/threads{n_threads}: {e}")
+                continue
+            for beam in beams:
+                for clip, mono in audio:
+                    def run(model=model, mono=mono, beam=beam):
+                        segments, _ = model.transcribe(mono, language=settings.LANGUAGE, beam_size=beam)
+                        return [s.text for s in segments]
+                    t = measure(run, repeat=repeat)
+                    results.append(Result(
+                        f"whisper_rtf/{size}/beam{beam}/threads{n_threads}/{clip.name}", t / clip.duration, "rtf",
+                        "lower", {"model": size, "beam_size": beam, "cpu_threads": n_threads, "duration": clip.duration},
+                    ))
+            del model
+    return results
+
+
+def bench_llm(settings: Settings, repeat: int = 20) -> List[Result]:
+    from nlp.mistral_service import LLMService
+
+    results = []
+    with StubLLMServer() as stub:
+        base = dataclasses.replace(
+            settings, MISTRAL_API_KEY="bench", MISTRAL_API_BASE=stub.url, OLLAMA_HOST=stub.url,
+            ANSWER_CACHE_ENABLED=False, FAQ_ENABLED=False, HTTP_MAX_RETRIES=0,
+        )
+        session = requests.Session()
+        for provider, path, payload in [
+            ("MISTRAL_API", "/chat/completions", {"messages": [{"role": "user", "content": QUESTION}]}),
+            ("OLLAMA", "/api/generate", {"prompt": QUESTION, "stream": False}),
+        ]:
+            cfg = dataclasses.replace(base, LLM_PROVIDER=provider)
+            llm = LLMService(cfg, strict_api=True)
+            def post():
+                return session.post(stub.url + path, json=payload).json()
+
+            raw = measure(post, repeat=repeat)
+            full = measure(lambda: llm.generate(QUESTION), repeat=repeat)
+            overhead = measure_overhead(post, lambda: llm.generate(QUESTION), repeat=repeat)
+
+            def first_token():
+                stream = llm.stream_text(QUESTION)
+                next(stream)
+                stream.close()
+
+            ttft = measure(first_token, repeat=repeat)
+            name = provider.lower()
+            results += [
+                Result(f"llm/{name}/raw_http", raw * 1000, "ms"),
+                Result(f"llm/{name}/generate", full * 1000, "ms"),
+                Result(f"llm/{name}/generate_overhead", overhead * 1000, "ms"),
+                Result(f"llm/{name}/stream_first_token", ttft * 1000, "ms"),
+            ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = dataclasses.replace(base, ANSWER_CACHE_ENABLED=True, ANSWER_CACHE_PATH=f"{tmp}/answers.sqlite3")
+            llm = LLMService(cfg, strict_api=True)
+            llm.generate(QUESTION)
+            hit = measure(lambda: llm.generate(QUESTION), repeat=repeat)
+            results.append(Result("llm/answer_cache_hit", hit * 1000, "ms"))
+
+        cfg = dataclasses.replace(base, FAQ_ENABLED=True, FAQ_INDEX_PATH="")
+        llm = LLMService(cfg, strict_api=True)
+        llm.generate(QUESTION)  # builds the index
+        hit = measure(lambda: llm.generate("why do plants need sunlight"), repeat=repeat)
+        results.append(Result("llm/faq_hit", hit * 1000, "ms"))
+    return results
+
+
+def bench_tts(settings: Settings, repeat: int = 3) -> List[Result]:
+    from tts.tts_service import TTSService
+
+    cfg = dataclasses.replace(settings, TTS_CACHE_ENABLED=False)
+    tts = TTSService(cfg)
+    results = []
+    try:
+        tts.synthesize("Hello!")  # engine start-up is not part of the measurement
+    except Exception as e:
+        print(f"skipping tts: {e}")
+        return results
+    for label, text in TTS_TEXTS.items():
+        t = measure(lambda: tts.synthesize(text), repeat=repeat, warmup=0)
+        results.append(Result(f"tts/{label}/chars_per_sec", len(text) / t, "chars/s", "higher",
+                              {"chars": len(text), "workers": cfg.TTS_WORKERS}))
+    return results
+
+
+def default_clips(quick: bool = False):
+    if quick:
+        return synthetic_clips(durations=(1, 5), sample_rates=(16000, 48000))
+    return synthetic_clips()
+
+
+def whisper_clips(quick: bool = False) -> List[Clip]:
+    # Real recordings when available; Whisper's decode cost depends on what it hears
+    clips = recorded_clips()
+    if clips:
+        return clips[:2] if quick else clips
+    return synthetic_clips(durations=(5,) if quick else (5, 15), sample_rates=(16000,), channels=(1,))
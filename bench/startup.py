@@ -0,0 +1,78 @@
+"""Startup cost: what importing each entry point pulls in, measured in a fresh interpreter.
+
+    python -m bench.startup                     # app, ui.audio_ui, the engines
+    python -m bench.startup app --top 30        # biggest imports under app
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from .results import Result
+
+DEFAULT_MODULES = ("app", "ui.chat_ui", "ui.audio_ui", "stt.stt_service", "tts.tts_service", "faster_whisper")
+
+
+def import_times(module: str) -> Tuple[Dict[str, Tuple[float, float]], str]:
+    """{imported module: (self seconds, cumulative seconds)} for ``import module``, and any error."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    times = {}
+    error = ""
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            if line.strip():
+                error = line.strip()
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        times[fields[2].strip()] = (int(fields[0]) / 1e6, int(fields[1]) / 1e6)
+    return times, error if proc.returncode else ""
+
+
+def by_package(times: Dict[str, Tuple[float, float]]) -> List[Tuple[str, float]]:
+    # Self time summed per top-level package, largest first
+    totals: Dict[str, float] = defaultdict(float)
+    for name, (own, _) in times.items():
+        totals[name.split(".")[0]] += own
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def bench_startup(modules: Sequence[str] = DEFAULT_MODULES, repeat: int = 3) -> List[Result]:
+    results = []
+    for module in modules:
+        runs = []
+        for _ in range(repeat):
+            times, error = import_times(module)
+            if error or module not in times:
+                print(f"skipping startup/{module}: {error or 'not imported'}")
+                break
+            runs.append(times[module][1])
+        if runs:
+            results.append(Result(f"startup/import/{module}", statistics.median(runs), "s", "lower",
+                                  {"modules": len(times)}))
+    return results
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.startup", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    p.add_argument("--top", type=int, default=10, help="packages listed per module")
+    args = p.parse_args(argv)
+
+    for module in args.modules:
+        times, error = import_times(module)
+        total = times.get(module, (0.0, 0.0))[1]
+        status = f"FAILED: {error}" if error else f"{total * 1000:.0f} ms, {len(times)} modules"
+        print(f"\nimport {module}: {status}")
+        for package, seconds in by_package(times)[:args.top]:
+            print(f"  {package:<28} {seconds * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Local stand-in for the Mistral and Ollama endpoints LLMService calls.
+
+    python -m bench.stub_server --port 8099 --tokens-per-sec 40 --latency-ms 300 --jitter-ms 100 --error-rate 0.02
+
+then point MISTRAL_API_BASE (and any MISTRAL_API_KEY) or OLLAMA_HOST at it.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Plants make their own food from sunlight. They take in water and air, "
+    "and their leaves turn it into sugar. That is called photosynthesis!"
+)
+
+
+@dataclass
+class StubConfig:
+    reply: str = DEFAULT_REPLY
+    tokens_per_sec: float = 0.0     # 0 = whole reply at once
+    latency_ms: float = 0.0         # before the response / first token
+    jitter_ms: float = 0.0          # +/- uniform noise on latency and token gaps
+    error_rate: float = 0.0         # fraction of requests answered with error_status
+    error_status: int = 503
+    truncate_rate: float = 0.0      # fraction of streams cut off before the end marker
+    seed: int = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        cfg: StubConfig = self.server.config
+        if not self.path.endswith(("/chat/completions", "/api/generate")):
+            self.send_error(404)
+            return
+        self.server.count("requests")
+        self._sleep(cfg.latency_ms)
+        if self.server.chance(cfg.error_rate):
+            self.server.count("errors")
+            self.send_error(cfg.error_status, "injected error")
+            return
+
+        tokens = [t + " " for t in cfg.reply.split(" ")]
+        mistral = self.path.endswith("/chat/completions")
+        if not body.get("stream"):
+            for _ in tokens[1:]:
+                self._token_gap()
+            if mistral:
+                self._json({"choices": [{"message": {"content": cfg.reply}}]})
+            else:
+                self._json({"response": cfg.reply, "done": True})
+        elif mistral:
+            self._stream("text/event-stream", [
+                "data: " + json.dumps({"choices": [{"delta": {"content": t}}]}) + "\n\n" for t in tokens
+            ], "data: [DONE]\n\n")
+        else:
+            self._stream("application/x-ndjson", [
+                json.dumps({"response": t, "done": False}) + "\n" for t in tokens
+            ], json.dumps({"response": "", "done": True}) + "\n")
+
+    def _sleep(self, ms: float):
+        jitter = self.server.config.jitter_ms
+        delay = ms + (self.server.uniform(-jitter, jitter) if jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _token_gap(self):
+        rate = self.server.config.tokens_per_sec
+        if rate > 0:
+            self._sleep(1000.0 / rate)
+
+    def _json(self, obj):
+        data = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, content_type, chunks, last):
+        truncate = self.server.chance(self.server.config.truncate_rate)
+        if truncate:
+            self.server.count("truncated")
+            chunks, last = chunks[: len(chunks) // 2], None
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, chunk in enumerate(chunks + ([last] if last else [])):
+                if i:
+                    self._token_gap()
+                data = chunk.encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client stopped reading early
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = {"requests": 0, "errors": 0, "truncated": 0}
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def uniform(self, lo: float, hi: float) -> float:
+        with self._lock:
+            return self._rng.uniform(lo, hi)
+
+    def handle_error(self, request, client_address):
+        # clients dropping keep-alive or half-read streams are expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubLLMServer:
+    """Local stand-in for the Mistral and Ollama endpoints LLMService calls.
+
+    With the default config it answers instantly, so timings against it
+    measure our own client overhead; token rate, latency, jitter and
+    injected errors make it behave like a loaded provider instead.
+    """
+
+    def __init__(self, config: StubConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self._server = _Server((host, port), self.config)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._server.stats)
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_config_args(p: argparse.ArgumentParser):
+    p.add_argument("--tokens-per-sec", type=float, default=0.0)
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--error-status", type=int, default=503)
+    p.add_argument("--truncate-rate", type=float, default=0.0)
+    p.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args) -> StubConfig:
+    return StubConfig(
+        tokens_per_sec=args.tokens_per_sec, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, error_status=args.error_status, truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m bench.stub_server", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8099)
+    add_config_args(p)
+    args = p.parse_args(argv)
+    server = StubLLMServer(config_from_args(args), host=args.host, port=args.port).start()
+    print(f"stub LLM listening on {server.url}  (Mistral base: {server.url}, Ollama host: {server.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
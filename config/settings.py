@@ -2,6 +2,21 @@ from dataclasses import dataclass
 import os
 from dotenv import load_dotenv
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def project_path(path: str) -> str:
+    # Bundled data paths are relative to the checkout, not to wherever the app was launched
+    return path if not path or os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass
 class Settings:
     # LLM
@@ -11,14 +26,98 @@ class Settings:
     MISTRAL_MODEL: str = "mistral-small-latest"
     OLLAMA_HOST: str = "http://localhost:11434" 
 
+    # HTTP client (shared keep-alive pool for LLM providers)
+    HTTP_CONNECT_TIMEOUT: float = 3.05
+    HTTP_READ_TIMEOUT: float = 60.0
+    HTTP_MAX_RETRIES: int = 2           # retries on connect errors and 429/5xx
+    HTTP_BACKOFF_SEC: float = 0.5
+    HTTP_POOL_SIZE: int = 8             # connections kept per provider host
+
+    # Provider routing (deadlines, circuit breaker, hedging)
+    LLM_DEADLINE_FACTOR: float = 2.0    # deadline = p95 latency x factor, clamped to the range below
+    LLM_DEADLINE_MIN_SEC: float = 2.0
+    LLM_DEADLINE_MAX_SEC: float = 20.0  # also the deadline until enough latency has been observed
+    LLM_BREAKER_FAILURES: int = 3       # consecutive failures that open the circuit
+    LLM_BREAKER_COOLDOWN_SEC: float = 30.0
+    LLM_HEDGE_PROVIDER: str = ""        # MISTRAL_API or OLLAMA, raced when the primary runs past its p95; empty = off
+
+    # Answer cache (memory LRU + SQLite)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_PATH: str = ".cache/answers.sqlite3"
+    ANSWER_CACHE_TTL_SEC: float = 7 * 24 * 3600
+    ANSWER_CACHE_MAX_ENTRIES: int = 5000
+    ANSWER_CACHE_MEMORY_ENTRIES: int = 256
+
+    # FAQ retrieval (answers common questions without the LLM)
+    FAQ_ENABLED: bool = True
+    FAQ_PATH: str = "nlp/data/faq.json"   # relative to the project
+    FAQ_INDEX_PATH: str = ".cache/faq_index.json.gz"   # prebuilt index; empty = don't persist
+    FAQ_BEFORE_PROVIDER: bool = True    # confident matches skip the remote provider entirely
+    FAQ_MIN_CONFIDENCE: float = 0.9
+    FAQ_FALLBACK_CONFIDENCE: float = 0.7  # looser bar when no provider answered
+
+    # Safety filter
+    SAFETY_LEXICON_DIR: str = "nlp/data/safety"   # <lang>.txt word lists, relative to the project; en.txt always applies
+    SAFETY_SCAN_OUTPUT: bool = True     # also check generated replies before they reach TTS
+
+    # Conversation context (per session)
+    CONTEXT_MAX_TOKENS: int = 800       # history budget on top of the system prompt; 0 = single-turn
+    CONTEXT_RECENT_TURNS: int = 3       # exchanges kept verbatim, older ones are summarized
+    CONTEXT_SUMMARY_TOKENS: int = 200
+
     # STT
     STT_ENGINE: str = "WHISPER"        
     WHISPER_MODEL_SIZE: str = "base"    # tiny, base, small
+    WHISPER_COMPUTE_TYPE: str = "int8"
+    WHISPER_DEVICE: str = "cpu"
+    WHISPER_CPU_THREADS: int = 0        # 0 = CTranslate2 default
+    WHISPER_MAX_MODELS: int = 1         # models kept resident in the shared registry
+    WHISPER_WARMUP: bool = True         # load the model in the background at app start
+    STT_BACKEND: str = "thread"        # thread: in the app process; process: worker pool below
+    STT_WORKERS: int = 2                # worker processes, each with its own model
+    STT_THREADS_PER_WORKER: int = 0     # 0 = split the machine's cores evenly
+    STT_BATCHING: bool = True           # one shared queue; concurrent decodes run as a batch
+    STT_BATCH_MAX: int = 8
+    STT_BATCH_WINDOW_MS: float = 15.0   # how long a job waits for others to join its batch
+    STT_SPECULATIVE: bool = True        # transcribe finished segments while still recording
+    STT_SEGMENT_PAUSE_MS: int = 500     # pause that closes a segment
+    STT_SEGMENT_MAX_SEC: float = 15.0   # longest segment before a forced cut
+
+    # Voice activity detection (webrtcvad)
+    VAD_ENABLED: bool = True
+    VAD_AGGRESSIVENESS: int = 2         # 0 (least) .. 3 (most aggressive)
+    VAD_FRAME_MS: int = 30              # 10, 20 or 30
+    VAD_PADDING_MS: int = 300           # audio kept around each speech region
+    VAD_ENDPOINT_MS: int = 800          # trailing silence that ends an utterance
+    VAD_AUTO_REPLY: bool = True         # run the turn automatically at end of utterance
 
     # TTS
     TTS_ENGINE: str = "PYTTSX3"       
     VOICE_RATE: int = 160
     VOICE_VOLUME: float = 0.9
+    VOICE_ID: str = ""                  # pyttsx3 voice id; empty = engine default
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = ".cache/tts"
+    TTS_CACHE_MEMORY_MB: float = 32
+    TTS_CACHE_DISK_MB: float = 256
+    TTS_PRESYNTHESIZE: bool = True      # synthesize canned replies in the background at start
+    TTS_WORKERS: int = 2                # pre-initialized engines; 0 = synthesize inline
+    TTS_WORKER_MODE: str = "process"    # process or thread
+    AUDIO_FORMAT: str = "wav"           # sent to the browser: wav, or opus (Ogg/Opus; not on older Safari/iOS)
+    AUDIO_OPUS_BITRATE: int = 24000     # bits/s; 16-32k is plenty for speech
+
+    # Turn pipeline (STT -> LLM -> TTS)
+    TURN_WORKERS: int = 8               # concurrent turns across all sessions
+    TURN_MAX_PENDING_AUDIO: int = 3     # sentences synthesizing ahead of playback
+
+    # Headless API server (python -m server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8765
+    SERVER_WORKERS: int = 1             # processes sharing the port; 0 = one per CPU
+    SERVER_STT_CONCURRENCY: int = 2     # decodes in flight per process
+    SERVER_LLM_CONCURRENCY: int = 16    # replies in flight per process; turns also cap at TURN_WORKERS
+    SERVER_TTS_CONCURRENCY: int = 4     # syntheses and encodes in flight per process
+    SERVER_MAX_QUEUE: int = 64          # waiting per stage before answering 503
 
     # General
     LANGUAGE: str = "en"
@@ -37,14 +136,98 @@ class Settings:
         s.MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", s.MISTRAL_MODEL)
         s.OLLAMA_HOST = os.getenv("OLLAMA_HOST", s.OLLAMA_HOST)
 
+        # HTTP client
+        s.HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", s.HTTP_CONNECT_TIMEOUT))
+        s.HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", s.HTTP_READ_TIMEOUT))
+        s.HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", s.HTTP_MAX_RETRIES))
+        s.HTTP_BACKOFF_SEC = float(os.getenv("HTTP_BACKOFF_SEC", s.HTTP_BACKOFF_SEC))
+        s.HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", s.HTTP_POOL_SIZE))
+
+        # Provider routing
+        s.LLM_DEADLINE_FACTOR = float(os.getenv("LLM_DEADLINE_FACTOR", s.LLM_DEADLINE_FACTOR))
+        s.LLM_DEADLINE_MIN_SEC = float(os.getenv("LLM_DEADLINE_MIN_SEC", s.LLM_DEADLINE_MIN_SEC))
+        s.LLM_DEADLINE_MAX_SEC = float(os.getenv("LLM_DEADLINE_MAX_SEC", s.LLM_DEADLINE_MAX_SEC))
+        s.LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", s.LLM_BREAKER_FAILURES))
+        s.LLM_BREAKER_COOLDOWN_SEC = float(os.getenv("LLM_BREAKER_COOLDOWN_SEC", s.LLM_BREAKER_COOLDOWN_SEC))
+        s.LLM_HEDGE_PROVIDER = os.getenv("LLM_HEDGE_PROVIDER", s.LLM_HEDGE_PROVIDER)
+
+        # Answer cache
+        s.ANSWER_CACHE_ENABLED = _env_bool("ANSWER_CACHE_ENABLED", s.ANSWER_CACHE_ENABLED)
+        s.ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", s.ANSWER_CACHE_PATH)
+        s.ANSWER_CACHE_TTL_SEC = float(os.getenv("ANSWER_CACHE_TTL_SEC", s.ANSWER_CACHE_TTL_SEC))
+        s.ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", s.ANSWER_CACHE_MAX_ENTRIES))
+        s.ANSWER_CACHE_MEMORY_ENTRIES = int(os.getenv("ANSWER_CACHE_MEMORY_ENTRIES", s.ANSWER_CACHE_MEMORY_ENTRIES))
+
+        # FAQ
+        s.FAQ_ENABLED = _env_bool("FAQ_ENABLED", s.FAQ_ENABLED)
+        s.FAQ_PATH = os.getenv("FAQ_PATH", s.FAQ_PATH)
+        s.FAQ_INDEX_PATH = os.getenv("FAQ_INDEX_PATH", s.FAQ_INDEX_PATH)
+        s.FAQ_BEFORE_PROVIDER = _env_bool("FAQ_BEFORE_PROVIDER", s.FAQ_BEFORE_PROVIDER)
+        s.FAQ_MIN_CONFIDENCE = float(os.getenv("FAQ_MIN_CONFIDENCE", s.FAQ_MIN_CONFIDENCE))
+        s.FAQ_FALLBACK_CONFIDENCE = float(os.getenv("FAQ_FALLBACK_CONFIDENCE", s.FAQ_FALLBACK_CONFIDENCE))
+
+        # Safety filter
+        s.SAFETY_LEXICON_DIR = os.getenv("SAFETY_LEXICON_DIR", s.SAFETY_LEXICON_DIR)
+        s.SAFETY_SCAN_OUTPUT = _env_bool("SAFETY_SCAN_OUTPUT", s.SAFETY_SCAN_OUTPUT)
+
+        # Conversation context
+        s.CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", s.CONTEXT_MAX_TOKENS))
+        s.CONTEXT_RECENT_TURNS = int(os.getenv("CONTEXT_RECENT_TURNS", s.CONTEXT_RECENT_TURNS))
+        s.CONTEXT_SUMMARY_TOKENS = int(os.getenv("CONTEXT_SUMMARY_TOKENS", s.CONTEXT_SUMMARY_TOKENS))
+
         # STT
         s.STT_ENGINE = os.getenv("STT_ENGINE", s.STT_ENGINE)
         s.WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", s.WHISPER_MODEL_SIZE)
+        s.WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", s.WHISPER_COMPUTE_TYPE)
+        s.WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", s.WHISPER_DEVICE)
+        s.WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", s.WHISPER_CPU_THREADS))
+        s.WHISPER_MAX_MODELS = int(os.getenv("WHISPER_MAX_MODELS", s.WHISPER_MAX_MODELS))
+        s.WHISPER_WARMUP = _env_bool("WHISPER_WARMUP", s.WHISPER_WARMUP)
+        s.STT_BACKEND = os.getenv("STT_BACKEND", s.STT_BACKEND).lower()
+        s.STT_WORKERS = int(os.getenv("STT_WORKERS", s.STT_WORKERS))
+        s.STT_THREADS_PER_WORKER = int(os.getenv("STT_THREADS_PER_WORKER", s.STT_THREADS_PER_WORKER))
+        s.STT_BATCHING = _env_bool("STT_BATCHING", s.STT_BATCHING)
+        s.STT_BATCH_MAX = int(os.getenv("STT_BATCH_MAX", s.STT_BATCH_MAX))
+        s.STT_BATCH_WINDOW_MS = float(os.getenv("STT_BATCH_WINDOW_MS", s.STT_BATCH_WINDOW_MS))
+        s.STT_SPECULATIVE = _env_bool("STT_SPECULATIVE", s.STT_SPECULATIVE)
+        s.STT_SEGMENT_PAUSE_MS = int(os.getenv("STT_SEGMENT_PAUSE_MS", s.STT_SEGMENT_PAUSE_MS))
+        s.STT_SEGMENT_MAX_SEC = float(os.getenv("STT_SEGMENT_MAX_SEC", s.STT_SEGMENT_MAX_SEC))
+
+        # VAD
+        s.VAD_ENABLED = _env_bool("VAD_ENABLED", s.VAD_ENABLED)
+        s.VAD_AGGRESSIVENESS = int(os.getenv("VAD_AGGRESSIVENESS", s.VAD_AGGRESSIVENESS))
+        s.VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", s.VAD_FRAME_MS))
+        s.VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", s.VAD_PADDING_MS))
+        s.VAD_ENDPOINT_MS = int(os.getenv("VAD_ENDPOINT_MS", s.VAD_ENDPOINT_MS))
+        s.VAD_AUTO_REPLY = _env_bool("VAD_AUTO_REPLY", s.VAD_AUTO_REPLY)
 
         # TTS
         s.TTS_ENGINE = os.getenv("TTS_ENGINE", s.TTS_ENGINE)
         s.VOICE_RATE = int(os.getenv("VOICE_RATE", s.VOICE_RATE))
         s.VOICE_VOLUME = float(os.getenv("VOICE_VOLUME", s.VOICE_VOLUME))
+        s.VOICE_ID = os.getenv("VOICE_ID", s.VOICE_ID)
+        s.TTS_CACHE_ENABLED = _env_bool("TTS_CACHE_ENABLED", s.TTS_CACHE_ENABLED)
+        s.TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", s.TTS_CACHE_DIR)
+        s.TTS_CACHE_MEMORY_MB = float(os.getenv("TTS_CACHE_MEMORY_MB", s.TTS_CACHE_MEMORY_MB))
+        s.TTS_CACHE_DISK_MB = float(os.getenv("TTS_CACHE_DISK_MB", s.TTS_CACHE_DISK_MB))
+        s.TTS_PRESYNTHESIZE = _env_bool("TTS_PRESYNTHESIZE", s.TTS_PRESYNTHESIZE)
+        s.TTS_WORKERS = int(os.getenv("TTS_WORKERS", s.TTS_WORKERS))
+        s.TTS_WORKER_MODE = os.getenv("TTS_WORKER_MODE", s.TTS_WORKER_MODE).lower()
+        s.AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", s.AUDIO_FORMAT).lower()
+        s.AUDIO_OPUS_BITRATE = int(os.getenv("AUDIO_OPUS_BITRATE", s.AUDIO_OPUS_BITRATE))
+
+        # Turn pipeline
+        s.TURN_WORKERS = int(os.getenv("TURN_WORKERS", s.TURN_WORKERS))
+        s.TURN_MAX_PENDING_AUDIO = int(os.getenv("TURN_MAX_PENDING_AUDIO", s.TURN_MAX_PENDING_AUDIO))
+
+        # Headless API server
+        s.SERVER_HOST = os.getenv("SERVER_HOST", s.SERVER_HOST)
+        s.SERVER_PORT = int(os.getenv("SERVER_PORT", s.SERVER_PORT))
+        s.SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", s.SERVER_WORKERS))
+        s.SERVER_STT_CONCURRENCY = int(os.getenv("SERVER_STT_CONCURRENCY", s.SERVER_STT_CONCURRENCY))
+        s.SERVER_LLM_CONCURRENCY = int(os.getenv("SERVER_LLM_CONCURRENCY", s.SERVER_LLM_CONCURRENCY))
+        s.SERVER_TTS_CONCURRENCY = int(os.getenv("SERVER_TTS_CONCURRENCY", s.SERVER_TTS_CONCURRENCY))
+        s.SERVER_MAX_QUEUE = int(os.getenv("SERVER_MAX_QUEUE", s.SERVER_MAX_QUEUE))
 
         # General
         s.LANGUAGE = os.getenv("LANGUAGE", s.LANGUAGE)
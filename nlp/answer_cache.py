@@ -0,0 +1,160 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config.settings import Settings
+from telemetry.metrics import REGISTRY
+
+_FILLERS = {"um", "umm", "uh", "uhh", "er", "erm", "hmm", "please"}
+_NON_WORD_RE = re.compile(r"[^a-z0-9' ]+")
+
+
+def normalize_question(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower().replace("’", "'")
+    words = _NON_WORD_RE.sub(" ", text).split()
+    return " ".join(w.strip("'") for w in words if w not in _FILLERS)
+
+
+def prompt_version(system_prompt: str) -> str:
+    return hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def answer_key(question: str, settings: Settings, system_prompt: str) -> str:
+    parts = [
+        normalize_question(question),
+        settings.LLM_PROVIDER.upper(),
+        settings.MISTRAL_MODEL,
+        settings.LANGUAGE,
+        str(settings.CHILD_MIN_AGE),
+        str(settings.CHILD_MAX_AGE),
+        prompt_version(system_prompt),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """Two-tier (memory LRU + SQLite) cache of tutor answers with TTL and size eviction."""
+
+    def __init__(self, path: str, ttl_sec: float = 7 * 86400, max_entries: int = 5000,
+                 memory_entries: int = 256):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._touched: Dict[str, float] = {}  # memory hits not yet written to the accessed column
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, answer TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS answers_accessed ON answers(accessed)")
+        self._db.commit()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_sec > 0 and now - created > self.ttl_sec
+
+    def _remember(self, key: str, answer: str, created: float):
+        self._mem[key] = (answer, created)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_entries:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None and not self._expired(item[1], now):
+                self._mem.move_to_end(key)
+                self.hits_memory += 1
+                self._touched[key] = now
+                if len(self._touched) >= 64:
+                    self._flush_touches()
+                    self._db.commit()
+                return item[0]
+            self._mem.pop(key, None)
+
+            row = self._db.execute("SELECT answer, created FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is not None and not self._expired(row[1], now):
+                self._db.execute("UPDATE answers SET accessed = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self._remember(key, row[0], row[1])
+                self.hits_disk += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, answer: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, answer, now)
+            self._touched.pop(key, None)
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, answer, now, now),
+            )
+            self._puts += 1
+            if self._puts % 50 == 0:
+                self._flush_touches()
+                self._evict(now)
+            self._db.commit()
+
+    def _flush_touches(self):
+        if self._touched:
+            self._db.executemany("UPDATE answers SET accessed = ? WHERE key = ?",
+                                 [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self, now: float):
+        if self.ttl_sec > 0:
+            self._db.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl_sec,))
+        self._db.execute(
+            "DELETE FROM answers WHERE key IN ("
+            "SELECT key FROM answers ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+        }
+
+
+_caches: Dict[str, AnswerCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_answer_cache(settings: Settings) -> Optional[AnswerCache]:
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        cache = _caches.get(settings.ANSWER_CACHE_PATH)
+        if cache is None:
+            cache = AnswerCache(
+                settings.ANSWER_CACHE_PATH,
+                ttl_sec=settings.ANSWER_CACHE_TTL_SEC,
+                max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+                memory_entries=settings.ANSWER_CACHE_MEMORY_ENTRIES,
+            )
+            _caches[settings.ANSWER_CACHE_PATH] = cache
+            REGISTRY.register_collector(
+                lambda c=cache: {f"answer_cache_{k}": v for k, v in c.stats().items()}
+            )
+        return cache
@@ -0,0 +1,92 @@
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from .sentences import iter_sentences
+
+Turn = Tuple[str, str]  # (user, assistant)
+
+# Words that only make sense with earlier turns ("what about it?", "yes", "tell me more")
+_FOLLOW_UP_RE = re.compile(
+    r"\b(it|its|that|this|those|these|they|them|their|he|she|him|her|his|one|more|another|again|"
+    r"else|also|too|same|yes|yeah|no|nope|ok|okay|why not|what about|how about|and)\b"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English; close enough to budget with
+    return (len(text) + 3) // 4
+
+
+def is_standalone(question: str) -> bool:
+    """True when a question can be answered without the conversation so far."""
+    text = question.lower().strip()
+    return len(text.split()) >= 3 and not _FOLLOW_UP_RE.search(text)
+
+
+def _first_sentence(text: str) -> str:
+    for sentence in iter_sentences([text], min_chars=0):
+        return sentence.strip()
+    return text.strip()
+
+
+class ConversationMemory:
+    """Bounded dialogue context for one session.
+
+    The last ``recent_turns`` exchanges are kept verbatim; older ones are
+    folded into a short extractive summary that is trimmed from the front,
+    so the prompt stays under ``max_tokens`` however long the session runs.
+    """
+
+    def __init__(self, max_tokens: int = 800, recent_turns: int = 3, summary_tokens: int = 200):
+        self.max_tokens = max_tokens
+        self.recent_turns = max(0, recent_turns)
+        self.summary_tokens = summary_tokens
+        self.turns: List[Turn] = []
+        self._summary: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def summary(self) -> str:
+        return " ".join(self._summary)
+
+    def __len__(self) -> int:
+        return len(self.turns) + len(self._summary)
+
+    def clear(self):
+        with self._lock:
+            self.turns = []
+            self._summary = []
+
+    def add_turn(self, user: str, assistant: str):
+        with self._lock:
+            self.turns.append((user.strip(), assistant.strip()))
+            while self.turns and (len(self.turns) > self.recent_turns or self._tokens() > self.max_tokens):
+                self._fold(*self.turns.pop(0))
+
+    def _tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(estimate_tokens(u) + estimate_tokens(a) for u, a in self.turns)
+
+    def _fold(self, user: str, assistant: str):
+        # Incremental: one line per folded turn, oldest lines dropped past the budget
+        self._summary.append(f"Child asked: {user} Tutor said: {_first_sentence(assistant)}")
+        while len(self._summary) > 1 and estimate_tokens(self.summary) > self.summary_tokens:
+            self._summary.pop(0)
+
+    def messages(self, system: str, user: str) -> List[Dict[str, str]]:
+        # The system prompt comes first and never changes, so provider prompt caching can reuse it
+        with self._lock:
+            out = [{"role": "system", "content": system}]
+            if self._summary:
+                out.append({"role": "system", "content": "Earlier in this conversation: " + self.summary})
+            for u, a in self.turns:
+                out.append({"role": "user", "content": u})
+                out.append({"role": "assistant", "content": a})
+        out.append({"role": "user", "content": user})
+        return out
+
+    def prompt(self, system: str, user: str) -> str:
+        # Same layout as messages(), flattened for completion-style endpoints
+        names = {"system": "System", "user": "User", "assistant": "Assistant"}
+        lines = [f"{names[m['role']]}: {m['content']}" for m in self.messages(system, user)]
+        return "\n".join(lines) + "\nAssistant:"
@@ -0,0 +1,228 @@
+import gzip
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import Settings, project_path
+from telemetry.metrics import REGISTRY, timed
+from .answer_cache import normalize_question
+from .prompt_templates import few_shots
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the is are was were be been am do does did of to in on at for and or but it its this that these those "
+    "i me my you your we our they them he she his her what whats how why when where who which can could would "
+    "should will have has please tell about explain mean means".split()
+)
+# A query word from here that the matched question lacks changes what is being asked
+# ("what is not a noun", "how does it make food"), so it vetoes the match
+_VETO_WORDS = frozenset(
+    "not no never nothing none isnt arent wasnt dont doesnt didnt cant cannot wont "
+    "it they them this that these those he she him".split()
+)
+
+
+def _stem(token: str) -> str:
+    # Just enough folding that "plants"/"plant" and "seasons"/"season" meet
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _words(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKC", text).lower().replace("’", "'").replace("'", "")
+    return _TOKEN_RE.findall(text)
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _words(text) if t not in _STOPWORDS]
+
+
+@dataclass
+class FAQMatch:
+    question: str
+    answer: str
+    score: float
+    confidence: float   # 0..1, idf-weighted overlap between query and matched question
+
+
+class FAQIndex:
+    """In-memory inverted index over FAQ questions with BM25 ranking."""
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]], k1: float = 1.2, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.docs: List[Tuple[str, str]] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_len: List[int] = []
+        self.exact: Dict[str, int] = {}
+        for question, answer in pairs:
+            self._add(question, answer)
+        self._finish()
+
+    def _add(self, question: str, answer: str):
+        doc_id = len(self.docs)
+        self.docs.append((question, answer))
+        terms = Counter(tokenize(question))
+        for term, tf in terms.items():
+            self.postings[term].append((doc_id, tf))
+        self.doc_len.append(sum(terms.values()))
+        self.exact.setdefault(normalize_question(question), doc_id)
+
+    def _finish(self):
+        n = len(self.docs)
+        self.avgdl = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+        # idf mass per question, for the confidence score
+        self.doc_weight = [0.0] * n
+        for term, plist in self.postings.items():
+            for doc_id, _ in plist:
+                self.doc_weight[doc_id] += self.idf[term]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def search(self, query: str, k: int = 1) -> List[FAQMatch]:
+        exact = self.exact.get(normalize_question(query))
+        if exact is not None:
+            q, a = self.docs[exact]
+            return [FAQMatch(q, a, float("inf"), 1.0)]
+
+        terms = set(tokenize(query))
+        vetoes = _VETO_WORDS.intersection(_words(query))
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, float] = defaultdict(float)
+        for term in terms:
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in plist:
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avgdl)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+                matched[doc_id] += idf
+        if not scores:
+            return []
+
+        # Unknown query words count against the match as if they were rare
+        max_idf = math.log(1 + (len(self.docs) + 0.5) / 0.5)
+        query_weight = sum(self.idf.get(t, max_idf) for t in terms)
+        out = []
+        for doc_id in sorted(scores, key=scores.get, reverse=True)[:k]:
+            recall = matched[doc_id] / query_weight if query_weight else 0.0
+            precision = matched[doc_id] / self.doc_weight[doc_id] if self.doc_weight[doc_id] else 0.0
+            confidence = 2 * recall * precision / (recall + precision) if recall + precision else 0.0
+            q, a = self.docs[doc_id]
+            if not vetoes.issubset(_words(q)):
+                confidence = 0.0
+            out.append(FAQMatch(q, a, scores[doc_id], confidence))
+        return out
+
+    def best(self, query: str, min_confidence: float) -> Optional[FAQMatch]:
+        hits = self.search(query, k=1)
+        if hits and hits[0].confidence >= min_confidence:
+            return hits[0]
+        return None
+
+    def save(self, path: str):
+        # Compact prebuilt form: postings as flat [doc, tf, doc, tf, ...] lists
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self.docs,
+            "doc_len": self.doc_len,
+            "postings": {t: [x for pair in p for x in pair] for t, p in self.postings.items()},
+        }
+        tmp = path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FAQIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported FAQ index version {data.get('version')}")
+        index = cls([], k1=data["k1"], b=data["b"])
+        index.docs = [tuple(d) for d in data["docs"]]
+        index.doc_len = data["doc_len"]
+        index.postings = defaultdict(list, {
+            t: list(zip(flat[::2], flat[1::2])) for t, flat in data["postings"].items()
+        })
+        index.exact = {}
+        for doc_id, (q, _) in enumerate(index.docs):
+            index.exact.setdefault(normalize_question(q), doc_id)
+        index._finish()
+        return index
+
+
+def load_faq_pairs(path: str) -> List[Tuple[str, str]]:
+    # [{"q": "...", "a": "...", "alt": ["other phrasing", ...]}, ...]
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    pairs = []
+    for e in entries:
+        answer = e.get("a") or e.get("answer")
+        for q in [e.get("q") or e.get("question")] + list(e.get("alt", [])):
+            if q and answer:
+                pairs.append((q, answer))
+    return pairs
+
+
+def build_faq_index(faq_path: str, index_path: str = "") -> FAQIndex:
+    """Loads the prebuilt index when it is newer than the FAQ file, else builds (and saves) it."""
+    if index_path and os.path.exists(index_path):
+        stale = os.path.exists(faq_path) and os.path.getmtime(faq_path) > os.path.getmtime(index_path)
+        if not stale:
+            try:
+                return FAQIndex.load(index_path)
+            except Exception as e:
+                print("FAQ index load error, rebuilding:", e)
+    pairs = list(few_shots())
+    if os.path.exists(faq_path):
+        pairs += load_faq_pairs(faq_path)
+    index = FAQIndex(pairs)
+    if index_path:
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print("FAQ index save error:", e)
+    return index
+
+
+_indexes: Dict[Tuple[str, str], FAQIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_faq_index(settings: Settings) -> Optional[FAQIndex]:
+    if not settings.FAQ_ENABLED:
+        return None
+    key = (settings.FAQ_PATH, settings.FAQ_INDEX_PATH)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = build_faq_index(project_path(settings.FAQ_PATH), settings.FAQ_INDEX_PATH)
+            _indexes[key] = index
+        return index
+
+
+@timed("faq_lookup")
+def faq_answer(settings: Settings, question: str, min_confidence: float) -> Optional[str]:
+    if settings.LANGUAGE.split("-")[0].lower() != "en":
+        return None  # the FAQ and its stemmer are English-only
+    index = get_faq_index(settings)
+    match = index.best(question, min_confidence) if index is not None else None
+    REGISTRY.inc("faq_hits" if match else "faq_misses")
+    return match.answer if match else None
@@ -0,0 +1,66 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import Settings
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# One pooled session per (host, policy), shared by every Streamlit session/thread.
+# Their cookie jars accept nothing (auth goes in per-request headers), so no session's
+# state can leak into another's requests.
+_sessions: Dict[Tuple, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _retry_policy(settings: Settings) -> Retry:
+    return Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        connect=settings.HTTP_MAX_RETRIES,
+        read=0,  # a read failure may mean the completion was generated; don't pay twice
+        status=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_SEC,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _host_root(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def get_session(url: str, settings: Settings) -> requests.Session:
+    root = _host_root(url)
+    key = (root, settings.HTTP_POOL_SIZE, settings.HTTP_MAX_RETRIES, settings.HTTP_BACKOFF_SEC)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.HTTP_POOL_SIZE,
+                pool_block=True,
+                max_retries=_retry_policy(settings),
+            )
+            session.mount(root, adapter)
+            _sessions[key] = session
+        return session
+
+
+def request_timeout(settings: Settings) -> Tuple[float, float]:
+    return (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+
+
+def http_post(settings: Settings, url: str, **kwargs) -> requests.Response:
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = request_timeout(settings)
+    return get_session(url, settings).post(url, **kwargs)
@@ -1,14 +1,50 @@
-from typing import Optional, List, Tuple
-import requests
+from typing import Iterator, Optional, List, Tuple
+import json
 from config.settings import Settings
+from .http_client import http_post
 from .prompt_templates import kid_tutor_system_prompt, few_shots
+from .sentences import iter_sentences
+from .answer_cache import answer_key, get_answer_cache
+from .faq_index import faq_answer
+from .safety import get_safety_filter
+from .conversation import ConversationMemory, is_standalone
+from .router import ProviderRouter, Route
+from telemetry.metrics import REGISTRY, timed
+
+# Fixed replies, kept here so TTS can pre-synthesize them (see canned_replies)
+SAFE_REDIRECT = "I’m here to help with safe learning topics. Let’s choose a school subject like math, reading, or science."
+MISTRAL_UNAVAILABLE = "I couldn’t reach the AI service (Mistral). Please check your API key, model name, and internet connection."
+OLLAMA_UNAVAILABLE = "Local model is unavailable."
+NO_PROVIDER = "No AI provider is configured."
+FALLBACK_NOUN = "A noun names a person, place, or thing. For example: teacher, park, or pencil. Can you give one?"
+FALLBACK_ADJECTIVE = "An adjective describes a noun, like red, small, or happy. Can you describe your favorite toy?"
+FALLBACK_VERB = "A verb is an action word, like run, jump, or read. What action can you think of?"
+FALLBACK_DEFAULT = "Good question! Tell me a bit more, or give an example, so I can help better."
+
+
+def canned_replies() -> List[str]:
+    fixed = [
+        SAFE_REDIRECT, MISTRAL_UNAVAILABLE, OLLAMA_UNAVAILABLE, NO_PROVIDER,
+        FALLBACK_NOUN, FALLBACK_ADJECTIVE, FALLBACK_VERB, FALLBACK_DEFAULT,
+    ]
+    return fixed + [a for _, a in few_shots()]
 
 class LLMService:
-    def __init__(self, settings: Settings, strict_api: bool = False):
+    def __init__(self, settings: Settings, strict_api: bool = False, memory: Optional[ConversationMemory] = None):
         self.settings = settings
         self.strict_api = strict_api
+        self.memory = memory
+        self.router = ProviderRouter(settings)
 
-    def _mistral_chat(self, system: str, user: str) -> Optional[str]:
+    def _messages(self, system: str, user: str):
+        if self.memory is not None:
+            return self.memory.messages(system, user)
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+
+    def _mistral_request(self, system: str, user: str):
         url = f"{self.settings.MISTRAL_API_BASE}/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.settings.MISTRAL_API_KEY}",
@@ -16,16 +52,18 @@ class LLMService:
         }
         payload = {
             "model": self.settings.MISTRAL_MODEL,
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
+            "messages": self._messages(system, user),
             "temperature": 0.6,
             "max_tokens": 220,
             "top_p": 0.9,
         }
+        return url, headers, payload
+
+    @timed("llm_mistral_chat")
+    def _mistral_chat(self, system: str, user: str, timeout=None) -> Optional[str]:
+        url, headers, payload = self._mistral_request(system, user)
         try:
-            r = requests.post(url, json=payload, headers=headers, timeout=60)
+            r = http_post(self.settings, url, json=payload, headers=headers, timeout=timeout)
             if not r.ok:
                 print("Mistral API error", r.status_code, r.text)
                 return None
@@ -40,17 +78,49 @@ class LLMService:
             print("Mistral API exception", e)
             return None
 
-    def _ollama_complete(self, system: str, user: str) -> Optional[str]:
+    @timed("llm_mistral_stream")
+    def _mistral_stream(self, system: str, user: str, timeout=None) -> Iterator[str]:
+        # Server-sent events: one "data: {json}" line per delta, ending with "data: [DONE]"
+        url, headers, payload = self._mistral_request(system, user)
+        payload["stream"] = True
         try:
-            url = f"{self.settings.OLLAMA_HOST}/api/generate"
+            with http_post(self.settings, url, json=payload, headers=headers, stream=True, timeout=timeout) as r:
+                if not r.ok:
+                    print("Mistral API error", r.status_code, r.text)
+                    return
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        return True
+                    choices = json.loads(data).get("choices", [])
+                    if choices:
+                        delta = choices[0].get("delta", {}).get("content") or ""
+                        if delta:
+                            yield delta
+        except Exception as e:
+            print("Mistral API exception", e)
+
+    def _ollama_request(self, system: str, user: str, stream: bool):
+        url = f"{self.settings.OLLAMA_HOST}/api/generate"
+        if self.memory is not None:
+            prompt = self.memory.prompt(system, user)
+        else:
             prompt = f"System: {system}\nUser: {user}\nAssistant:"
-            payload = {
-                "model": self.settings.MISTRAL_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {"temperature": 0.6, "num_predict": 220}
-            }
-            r = requests.post(url, json=payload, timeout=60)
+        payload = {
+            "model": self.settings.MISTRAL_MODEL,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {"temperature": 0.6, "num_predict": 220}
+        }
+        return url, payload
+
+    @timed("llm_ollama_complete")
+    def _ollama_complete(self, system: str, user: str, timeout=None) -> Optional[str]:
+        try:
+            url, payload = self._ollama_request(system, user, stream=False)
+            r = http_post(self.settings, url, json=payload, timeout=timeout)
             if r.ok:
                 data = r.json()
                 return data.get("response", "").strip()
@@ -59,32 +129,56 @@ class LLMService:
             print("Ollama exception", e)
             return None
 
+    @timed("llm_ollama_stream")
+    def _ollama_stream(self, system: str, user: str, timeout=None) -> Iterator[str]:
+        # Newline-delimited JSON: {"response": "...", "done": false} per chunk
+        try:
+            url, payload = self._ollama_request(system, user, stream=True)
+            with http_post(self.settings, url, json=payload, stream=True, timeout=timeout) as r:
+                if not r.ok:
+                    return
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return True
+        except Exception as e:
+            print("Ollama exception", e)
+
     def _fallback_answer(self, user: str) -> str:
+        faq = faq_answer(self.settings, user, self.settings.FAQ_FALLBACK_CONFIDENCE)
+        if faq:
+            return faq
         user_lc = user.lower().strip()
         pairs: List[Tuple[str, str]] = few_shots()
         for q, a in pairs:
             if q.lower().rstrip("?") in user_lc:
                 return a
         if "noun" in user_lc:
-            return "A noun names a person, place, or thing. For example: teacher, park, or pencil. Can you give one?"
+            return FALLBACK_NOUN
         if "adjective" in user_lc:
-            return "An adjective describes a noun, like red, small, or happy. Can you describe your favorite toy?"
+            return FALLBACK_ADJECTIVE
         if "verb" in user_lc:
-            return "A verb is an action word, like run, jump, or read. What action can you think of?"
-        return "Good question! Tell me a bit more, or give an example, so I can help better."
+            return FALLBACK_VERB
+        return FALLBACK_DEFAULT
 
     def _safe_prompt(self, user_text: str) -> str:
-        banned = ["gun", "drug", "sex", "suicide", "violence"]
-        if any(w in user_text.lower() for w in banned):
-            return "I’m here to help with safe learning topics. Let’s choose a school subject like math, reading, or science."
+        if not get_safety_filter(self.settings).is_safe(user_text):
+            REGISTRY.inc("safety_input_blocked")
+            return SAFE_REDIRECT
         return ""
 
-    def generate(self, user_text: str) -> str:
-        redirect = self._safe_prompt(user_text)
-        if redirect:
-            return redirect
+    def _safe_reply(self, text: str) -> bool:
+        if self.settings.SAFETY_SCAN_OUTPUT and not get_safety_filter(self.settings).is_safe(text):
+            REGISTRY.inc("safety_output_blocked")
+            return False
+        return True
 
-        system = (
+    def _system_prompt(self) -> str:
+        return (
             kid_tutor_system_prompt(
                 lang=self.settings.LANGUAGE,
                 min_age=self.settings.CHILD_MIN_AGE,
@@ -94,21 +188,148 @@ class LLMService:
               "Do not include emojis, emoticons, markdown, lists, or any special symbols."
         )
 
+    def _answer_cache(self, user_text: str, system: str):
+        # Only real provider answers are cached; redirects, errors and fallbacks are free anyway.
+        # A follow-up ("why is it red?") depends on the conversation, so only standalone questions qualify.
+        if self.memory and not is_standalone(user_text):
+            return None, None
+        provider = self.settings.LLM_PROVIDER.upper()
+        remote = (provider == "MISTRAL_API" and self.settings.MISTRAL_API_KEY) or provider == "OLLAMA"
+        cache = get_answer_cache(self.settings) if remote else None
+        if cache is None:
+            return None, None
+        return cache, answer_key(user_text, self.settings, system)
+
+    def _store_answer(self, cache, key: str, answer: str):
+        # The cache is shared by every session; a reply written with this child's history in
+        # the prompt may refer back to it, so only replies from an empty memory are stored
+        if cache is not None and not self.memory:
+            cache.put(key, answer)
+
+    def _relay(self, stream: Iterator[str], parts: List[str]):
+        # Re-yields deltas while collecting them; returns the stream's completion flag.
+        # Output is screened a sentence at a time; if it turns unsafe the unreleased sentence is
+        # dropped, the redirect follows the sentences already sent, and nothing is cached.
+        scanner = get_safety_filter(self.settings).scanner(hold_sentences=True) if self.settings.SAFETY_SCAN_OUTPUT else None
+        complete = None
+        while complete is None:
+            try:
+                delta = next(stream)
+            except StopIteration as stop:
+                complete = bool(stop.value)
+                delta = scanner.finish() if scanner is not None else ""
+            else:
+                delta = scanner.feed(delta) if scanner is not None else delta
+            if scanner is not None and scanner.unsafe is not None:
+                stream.close()
+                REGISTRY.inc("safety_output_blocked")
+                # Released text always ends on a sentence boundary (and its whitespace)
+                parts.append(SAFE_REDIRECT)
+                yield SAFE_REDIRECT
+                return False
+            if delta:
+                parts.append(delta)
+                yield delta
+        return complete
+
+    def _hedge(self, primary: str, stream: bool) -> Optional[Route]:
+        # Secondary provider raced against a slow primary; never the primary itself
+        hedge = self.settings.LLM_HEDGE_PROVIDER.upper()
+        if hedge == primary or not hedge:
+            return None
+        if hedge == "MISTRAL_API" and self.settings.MISTRAL_API_KEY:
+            return ("mistral", self._mistral_stream if stream else self._mistral_chat)
+        if hedge == "OLLAMA":
+            return ("ollama", self._ollama_stream if stream else self._ollama_complete)
+        return None
+
+    def _faq_first(self, user_text: str) -> Optional[str]:
+        if not self.settings.FAQ_BEFORE_PROVIDER:
+            return None
+        return faq_answer(self.settings, user_text, self.settings.FAQ_MIN_CONFIDENCE)
+
+    def generate(self, user_text: str) -> str:
+        direct = self._safe_prompt(user_text) or self._faq_first(user_text)
+        if direct:
+            return direct
+
+        system = self._system_prompt()
+        cache, key = self._answer_cache(user_text, system)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached:
+                return cached
+
         provider = self.settings.LLM_PROVIDER.upper()
         if provider == "MISTRAL_API" and self.settings.MISTRAL_API_KEY:
-            out = self._mistral_chat(system, user_text)
+            out = self.router.complete(("mistral", self._mistral_chat), system, user_text, self._hedge(provider, False))
+            if out and not self._safe_reply(out):
+                return SAFE_REDIRECT
             if out:
+                self._store_answer(cache, key, out)
                 return out
             if self.strict_api:
-                return "I couldn’t reach the AI service (Mistral). Please check your API key, model name, and internet connection."
+                return MISTRAL_UNAVAILABLE
 
         if provider == "OLLAMA":
-            out = self._ollama_complete(system, user_text)
+            out = self.router.complete(("ollama", self._ollama_complete), system, user_text, self._hedge(provider, False))
+            if out and not self._safe_reply(out):
+                return SAFE_REDIRECT
             if out:
+                self._store_answer(cache, key, out)
                 return out
             if self.strict_api:
-                return "Local model is unavailable."
+                return OLLAMA_UNAVAILABLE
 
         if self.strict_api:
-            return "No AI provider is configured."
+            return NO_PROVIDER
         return self._fallback_answer(user_text)
+
+    def stream_text(self, user_text: str) -> Iterator[str]:
+        # Same provider order and fallbacks as generate(), but yields text deltas as they arrive
+        direct = self._safe_prompt(user_text) or self._faq_first(user_text)
+        if direct:
+            yield direct
+            return
+
+        system = self._system_prompt()
+        cache, key = self._answer_cache(user_text, system)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached:
+                yield cached
+                return
+
+        provider = self.settings.LLM_PROVIDER.upper()
+        if provider == "MISTRAL_API" and self.settings.MISTRAL_API_KEY:
+            parts: List[str] = []
+            complete = yield from self._relay(
+                self.router.stream(("mistral", self._mistral_stream), system, user_text, self._hedge(provider, True)), parts)
+            if parts:
+                if complete:
+                    self._store_answer(cache, key, "".join(parts).strip())
+                return
+            if self.strict_api:
+                yield MISTRAL_UNAVAILABLE
+                return
+
+        if provider == "OLLAMA":
+            parts = []
+            complete = yield from self._relay(
+                self.router.stream(("ollama", self._ollama_stream), system, user_text, self._hedge(provider, True)), parts)
+            if parts:
+                if complete:
+                    self._store_answer(cache, key, "".join(parts).strip())
+                return
+            if self.strict_api:
+                yield OLLAMA_UNAVAILABLE
+                return
+
+        if self.strict_api:
+            yield NO_PROVIDER
+            return
+        yield self._fallback_answer(user_text)
+
+    def generate_stream(self, user_text: str) -> Iterator[str]:
+        # Complete sentences, ready to hand to TTS while the rest is still being generated
+        return iter_sentences(self.stream_text(user_text))
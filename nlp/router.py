@@ -0,0 +1,256 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from config.settings import Settings
+from telemetry.metrics import REGISTRY, Histogram
+
+MIN_SAMPLES = 5         # observations before deadlines adapt to measured latency
+COMPLETE = "complete"       # full non-streamed reply
+FIRST_TOKEN = "first_token"  # first streamed delta
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# (name, provider call); calls take (system, user, timeout=...) and return None on failure
+Route = Tuple[str, Callable]
+
+
+class ProviderHealth:
+    """Latency/error stats and a circuit breaker for one provider.
+
+    After ``failures`` consecutive failures the circuit opens and calls are
+    refused outright for ``cooldown_sec``; then a single probe is let
+    through, which closes the circuit again if it succeeds.
+    """
+
+    def __init__(self, name: str, failures: int = 3, cooldown_sec: float = 30.0, window: int = 100):
+        self.name = name
+        self.failures = failures
+        self.cooldown_sec = cooldown_sec
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._outcomes = deque(maxlen=window)
+        self._latency: Dict[str, Histogram] = {COMPLETE: Histogram(window), FIRST_TOKEN: Histogram(window)}
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_sec:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool, seconds: Optional[float] = None, kind: str = COMPLETE):
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                if seconds is not None:
+                    self._latency[kind].observe(seconds)
+                self.consecutive_failures = 0
+                self.state = CLOSED
+            else:
+                self.consecutive_failures += 1
+                if self.state == HALF_OPEN or self.consecutive_failures >= self.failures:
+                    if self.state != OPEN:
+                        REGISTRY.inc(f"llm_{self.name}_circuit_opened")
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+            self._probing = False
+
+    def p95(self, kind: str = COMPLETE) -> Optional[float]:
+        with self._lock:
+            hist = self._latency[kind]
+            if hist.count < MIN_SAMPLES:
+                return None
+            return hist.quantiles()[0.95]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return (self._outcomes.count(False) / len(self._outcomes)) if self._outcomes else 0.0
+
+    def deadline(self, settings: Settings, kind: str = COMPLETE) -> float:
+        # A few times the usual p95, so slow-but-alive providers still get through
+        p95 = self.p95(kind)
+        if p95 is None:
+            return settings.LLM_DEADLINE_MAX_SEC
+        return min(settings.LLM_DEADLINE_MAX_SEC, max(settings.LLM_DEADLINE_MIN_SEC, p95 * settings.LLM_DEADLINE_FACTOR))
+
+    def hedge_delay(self, settings: Settings, kind: str = COMPLETE) -> float:
+        p95 = self.p95(kind)
+        return p95 if p95 is not None else settings.LLM_DEADLINE_MIN_SEC
+
+    def stats(self) -> Dict[str, float]:
+        p95 = self.p95()
+        first = self.p95(FIRST_TOKEN)
+        return {
+            f"llm_{self.name}_circuit_open": float(self.state != CLOSED),
+            f"llm_{self.name}_error_rate": self.error_rate(),
+            f"llm_{self.name}_p95_seconds": p95 or 0.0,
+            f"llm_{self.name}_first_token_p95_seconds": first or 0.0,
+        }
+
+
+_health: Dict[Tuple[str, str], ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_provider_health(name: str, settings: Settings) -> ProviderHealth:
+    # Per endpoint, so a dead local Ollama doesn't trip the breaker for another host
+    key = (name, settings.OLLAMA_HOST if name == "ollama" else settings.MISTRAL_API_BASE)
+    with _health_lock:
+        health = _health.get(key)
+        if health is None:
+            health = ProviderHealth(name, settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN_SEC)
+            _health[key] = health
+            REGISTRY.register_collector(health.stats)
+        return health
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _health_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+        return _executor
+
+
+def _first_delta(stream: Iterator[str]) -> Optional[str]:
+    # None when the stream ends (or fails) without any text
+    try:
+        for delta in stream:
+            if delta:
+                return delta
+    except Exception as e:
+        print("LLM stream exception", e)
+    return None
+
+
+class ProviderRouter:
+    """Runs provider calls under per-provider deadlines and circuit breakers.
+
+    With a secondary route, a call that hasn't answered within the primary's
+    usual p95 is hedged: the secondary is started too and whichever answers
+    first wins. A primary that fails before then hands over to the secondary.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    def _timeout(self, deadline: float) -> Tuple[float, float]:
+        return (min(self.settings.HTTP_CONNECT_TIMEOUT, deadline), deadline)
+
+    def _call(self, route: Route, system: str, user: str) -> Optional[str]:
+        name, fn = route
+        health = get_provider_health(name, self.settings)
+        t0 = time.perf_counter()
+        out = fn(system, user, timeout=self._timeout(health.deadline(self.settings)))
+        health.record(bool(out), time.perf_counter() - t0)
+        return out or None
+
+    def complete(self, primary: Route, system: str, user: str, secondary: Optional[Route] = None) -> Optional[str]:
+        if not get_provider_health(primary[0], self.settings).allow():
+            REGISTRY.inc(f"llm_{primary[0]}_short_circuited")
+            if secondary is not None and get_provider_health(secondary[0], self.settings).allow():
+                return self._call(secondary, system, user)
+            return None
+        if secondary is None:
+            return self._call(primary, system, user)
+
+        health = get_provider_health(primary[0], self.settings)
+        backup = get_provider_health(secondary[0], self.settings)
+        executor = _get_executor()
+        pending = {executor.submit(self._call, primary, system, user)}
+        done, _ = wait(pending, timeout=health.hedge_delay(self.settings))
+        hedged = not done and backup.allow()
+        if hedged:
+            REGISTRY.inc("llm_hedged")
+            pending.add(executor.submit(self._call, secondary, system, user))
+        give_up = time.monotonic() + health.deadline(self.settings)
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, give_up - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                return None
+            for fut in done:
+                out = fut.result()
+                if out:
+                    return out
+            if not hedged and backup.allow():
+                # The primary failed before the hedge delay; the secondary still gets its turn
+                hedged = True
+                REGISTRY.inc("llm_failed_over")
+                pending.add(executor.submit(self._call, secondary, system, user))
+                give_up = max(give_up, time.monotonic() + backup.deadline(self.settings))
+        return None
+
+    def stream(self, primary: Route, system: str, user: str, secondary: Optional[Route] = None) -> Iterator[str]:
+        # Yields the winning provider's deltas; returns its completion flag like the raw streams
+        first, hedge = primary, secondary
+        if not get_provider_health(primary[0], self.settings).allow():
+            REGISTRY.inc(f"llm_{primary[0]}_short_circuited")
+            first, hedge = secondary, None
+            if first is None or not get_provider_health(first[0], self.settings).allow():
+                return False
+
+        started: Dict[Future, Tuple[str, Iterator[str], float]] = {}
+        executor = _get_executor()
+
+        def start(route: Route):
+            name, fn = route
+            health = get_provider_health(name, self.settings)
+            stream = fn(system, user, timeout=self._timeout(health.deadline(self.settings, FIRST_TOKEN)))
+            t0 = time.perf_counter()
+            fut = executor.submit(_first_delta, stream)
+            started[fut] = (name, stream, t0)
+            return fut
+
+        def settle(fut: Future):
+            # Every started stream is recorded and closed, including the losers once they return
+            name, stream, t0 = started[fut]
+            delta = fut.result()
+            get_provider_health(name, self.settings).record(delta is not None, time.perf_counter() - t0, FIRST_TOKEN)
+            if fut is not winner:
+                stream.close()
+
+        winner = None
+        pending = {start(first)}
+        if hedge is not None:
+            delay = get_provider_health(first[0], self.settings).hedge_delay(self.settings, FIRST_TOKEN)
+            done, _ = wait(pending, timeout=delay)
+            if not done and get_provider_health(hedge[0], self.settings).allow():
+                REGISTRY.inc("llm_hedged")
+                pending.add(start(hedge))
+                hedge = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if winner is None and fut.result() is not None:
+                    winner = fut
+                settle(fut)
+            if winner is None and not pending and hedge is not None \
+                    and get_provider_health(hedge[0], self.settings).allow():
+                # The first stream ended without text before the hedge delay; fail over
+                REGISTRY.inc("llm_failed_over")
+                pending.add(start(hedge))
+                hedge = None
+        for fut in pending:
+            fut.add_done_callback(settle)
+        if winner is None:
+            return False
+
+        name, stream, _ = started[winner]
+        try:
+            yield winner.result()
+            return (yield from stream)
+        finally:
+            stream.close()
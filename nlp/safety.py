@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import Settings, project_path
+from .sentences import BOUNDARY_RE
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold().replace("’", "'")
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    # One alternation per shared prefix keeps the regex linear in the lexicon, not in the text
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        end = "" in node
+        branches = [_char(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            body = "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+def _char(ch: str) -> str:
+    return r"\s+" if ch == " " else re.escape(ch)
+
+
+def load_lexicon(path: str) -> List[str]:
+    # One term or phrase per line; "#" starts a comment, "!" marks an allowed phrase
+    terms = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            term = " ".join(normalize_text(line.split("#", 1)[0]).split())
+            if term:
+                terms.append(term)
+    return terms
+
+
+def _compile(terms: List[str]):
+    pattern = _trie_pattern(terms)
+    return re.compile(r"(?<!\w)(?:" + pattern + r")(?!\w)") if pattern else None
+
+
+class SafetyFilter:
+    """Whole-word/phrase matcher over a lexicon, compiled into a single regex.
+
+    Entries starting with "!" are allowed phrases ("shooting star"): their
+    text is masked out before the blocked terms are matched.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        terms = {" ".join(normalize_text(t).split()) for t in terms if t.strip()}
+        allow = sorted({t[1:].strip() for t in terms if t.startswith("!")} - {""})
+        deny = sorted(t for t in terms if not t.startswith("!"))
+        self.size = len(deny)
+        self.max_len = max((len(t) for t in deny + allow), default=0)
+        self._re = _compile(deny)
+        self._allow_re = _compile(allow)
+
+    def _mask(self, text: str) -> str:
+        # Same length, and "_" is a word character, so nothing inside an allowed phrase can match
+        if self._allow_re is None:
+            return text
+        return self._allow_re.sub(lambda m: "_" * len(m.group(0)), text)
+
+    def find(self, text: str) -> Optional[str]:
+        if self._re is None:
+            return None
+        m = self._re.search(self._mask(normalize_text(text)))
+        return m.group(0) if m else None
+
+    def is_safe(self, text: str) -> bool:
+        return self.find(text) is None
+
+    def scanner(self, hold_sentences: bool = False) -> "StreamScanner":
+        return StreamScanner(self, hold_sentences)
+
+
+class StreamScanner:
+    """Scans streamed text chunk by chunk.
+
+    ``feed`` returns the text that is safe to pass on. The last ``max_len``
+    characters are held back, since they could still turn into a match (or
+    stop being one) when the next chunk arrives; nothing released ever
+    contains a lexicon term. With ``hold_sentences`` text is released a whole
+    sentence at a time instead, so a reply that turns unsafe is never cut off
+    mid-sentence.
+    """
+
+    def __init__(self, safety: SafetyFilter, hold_sentences: bool = False):
+        self.safety = safety
+        self.hold_sentences = hold_sentences
+        self.unsafe: Optional[str] = None
+        self._buf = ""      # original text, not yet released
+        self._context = ""  # tail of the released text, for look-behind and allowed phrases
+
+    def _scan(self, final: bool) -> bool:
+        if self.safety._re is None:
+            return False
+        released = len(normalize_text(self._context))
+        text = self.safety._mask(normalize_text(self._context + self._buf))
+        for m in self.safety._re.finditer(text):
+            # A match touching the end may still extend into a longer word
+            if m.end() > released and (final or m.end() < len(text)):
+                self.unsafe = m.group(0)
+                return True
+        return False
+
+    def feed(self, chunk: str) -> str:
+        if self.unsafe is not None:
+            return ""
+        self._buf += chunk
+        if self._scan(final=False):
+            return ""
+        if self.hold_sentences:
+            # No term spans a sentence end, so everything before the last one has been fully scanned
+            ends = [m.end() for m in BOUNDARY_RE.finditer(self._buf)]
+            cut = ends[-1] if ends else 0
+        else:
+            cut = max(0, len(self._buf) - self.safety.max_len)
+        out, self._buf = self._buf[:cut], self._buf[cut:]
+        if out:
+            self._context = (self._context + out)[-(self.safety.max_len + 1):]
+        return out
+
+    def finish(self) -> str:
+        if self.unsafe is not None or self._scan(final=True):
+            return ""
+        out, self._buf = self._buf, ""
+        return out
+
+
+_filters: Dict[Tuple[str, str], SafetyFilter] = {}
+_filters_lock = threading.Lock()
+
+
+def get_safety_filter(settings: Settings) -> SafetyFilter:
+    # English list always applies; the session language's list is added on top
+    key = (settings.SAFETY_LEXICON_DIR, settings.LANGUAGE)
+    with _filters_lock:
+        f = _filters.get(key)
+        if f is None:
+            directory = project_path(settings.SAFETY_LEXICON_DIR)
+            base = os.path.join(directory, "en.txt")
+            terms = load_lexicon(base) if os.path.exists(base) else []
+            if not terms:
+                # Fail closed: an empty filter would let everything through
+                print("Safety lexicon missing or empty:", base)
+                raise RuntimeError(f"safety lexicon {base} could not be loaded")
+            lang = settings.LANGUAGE.split("-")[0].lower()
+            path = os.path.join(directory, f"{lang}.txt")
+            if lang != "en" and os.path.exists(path):
+                terms += load_lexicon(path)
+            f = SafetyFilter(terms)
+            _filters[key] = f
+        return f
@@ -0,0 +1,41 @@
+import re
+from typing import Iterable, Iterator, List
+
+# End of sentence: . ! or ? (optionally followed by quotes/brackets) and then whitespace
+BOUNDARY_RE = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+class SentenceChunker:
+    """Turns a stream of text deltas into complete sentences.
+
+    Sentences shorter than ``min_chars`` are held back and merged with the
+    next one so TTS is not started on fragments like "Yes!".
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buf = ""
+
+    def feed(self, delta: str) -> List[str]:
+        self._buf += delta
+        out = []
+        start = 0
+        for m in BOUNDARY_RE.finditer(self._buf):
+            candidate = self._buf[start:m.end()].strip()
+            if len(candidate) >= self.min_chars:
+                out.append(candidate)
+                start = m.end()
+        self._buf = self._buf[start:]
+        return out
+
+    def flush(self) -> List[str]:
+        rest = self._buf.strip()
+        self._buf = ""
+        return [rest] if rest else []
+
+
+def iter_sentences(deltas: Iterable[str], min_chars: int = 20) -> Iterator[str]:
+    chunker = SentenceChunker(min_chars)
+    for delta in deltas:
+        yield from chunker.feed(delta)
+    yield from chunker.flush()
@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from config.settings import Settings
+from nlp.conversation import ConversationMemory
+from nlp.mistral_service import LLMService, MISTRAL_UNAVAILABLE, NO_PROVIDER, OLLAMA_UNAVAILABLE
+from nlp.sentences import SentenceChunker
+from tts.tts_service import TTSService
+from telemetry.metrics import REGISTRY
+
+# Event kinds, in the order a turn produces them
+TRANSCRIPT = "transcript"   # data: final user text
+TOKEN = "token"             # data: text delta from the LLM
+SENTENCE = "sentence"       # data: complete sentence handed to TTS
+AUDIO = "audio"             # data: (sentence, wav bytes), in sentence order
+DONE = "done"               # data: full reply text
+ERROR = "error"             # data: message
+CANCELLED = "cancelled"
+
+_FINAL_KINDS = (DONE, ERROR, CANCELLED)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(settings: Settings) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.TURN_WORKERS, thread_name_prefix="turn")
+        return _executor
+
+
+@dataclass
+class TurnEvent:
+    kind: str
+    data: Any = None
+
+
+class TurnCancelled(Exception):
+    pass
+
+
+class TurnHandle:
+    def __init__(self, max_events: int = 256):
+        self._events: "queue.Queue[TurnEvent]" = queue.Queue(maxsize=max_events)
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def emit(self, kind: str, data: Any = None):
+        # Blocks when the consumer falls behind, but never past a cancellation
+        event = TurnEvent(kind, data)
+        while True:
+            if self.cancelled and kind not in _FINAL_KINDS:
+                raise TurnCancelled()
+            try:
+                self._events.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                if kind in _FINAL_KINDS and self.cancelled:
+                    return
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[TurnEvent]:
+        while True:
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                return
+            yield event
+            if event.kind in _FINAL_KINDS:
+                return
+
+
+class TurnPipeline:
+    """Runs STT -> LLM -> TTS for one conversation, overlapping the stages.
+
+    Generation starts as soon as the transcript is final, each sentence goes
+    to TTS while the rest is still streaming, and starting a new turn cancels
+    whatever the previous one was still doing.
+    """
+
+    def __init__(self, settings: Settings, strict_api: bool = True):
+        self.settings = settings
+        self.strict_api = strict_api
+        self._current: Optional[TurnHandle] = None
+        self._lock = threading.Lock()
+        self.memory: Optional[ConversationMemory] = None
+        if settings.CONTEXT_MAX_TOKENS > 0:
+            self.memory = ConversationMemory(
+                max_tokens=settings.CONTEXT_MAX_TOKENS,
+                recent_turns=settings.CONTEXT_RECENT_TURNS,
+                summary_tokens=settings.CONTEXT_SUMMARY_TOKENS,
+            )
+
+    def start(self, user_text: Optional[str] = None,
+              transcribe: Optional[Callable[[], str]] = None) -> TurnHandle:
+        handle = TurnHandle()
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            self._current = handle
+        _get_executor(self.settings).submit(self._run, handle, user_text, transcribe)
+        return handle
+
+    def cancel(self):
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+
+    def clear_context(self):
+        if self.memory is not None:
+            self.memory.clear()
+
+    def _run(self, handle: TurnHandle, user_text: Optional[str], transcribe: Optional[Callable[[], str]]):
+        pending = deque()
+        t0 = time.perf_counter()
+        try:
+            text = (transcribe() if transcribe is not None else user_text or "").strip()
+            if not text:
+                handle.emit(ERROR, "Could not transcribe. Please try again closer to the mic.")
+                return
+            handle.emit(TRANSCRIPT, text)
+            self._respond(handle, text, pending, t0)
+        except TurnCancelled:
+            for _, fut in pending:
+                fut.cancel()
+            handle.emit(CANCELLED)
+        except Exception as e:
+            print("Turn pipeline error:", e)
+            handle.emit(ERROR, str(e))
+
+    def _respond(self, handle: TurnHandle, text: str, pending: deque, t0: float):
+        llm = LLMService(self.settings, strict_api=self.strict_api, memory=self.memory)
+        tts = TTSService(self.settings)
+        chunker = SentenceChunker()
+        max_pending = max(1, self.settings.TURN_MAX_PENDING_AUDIO)
+        reply = []
+        first_audio = True
+
+        def speak(sentence: str):
+            handle.emit(SENTENCE, sentence)
+            # Backpressure: don't queue unbounded synthesis work ahead of playback
+            while len(pending) >= max_pending:
+                flush(block=True)
+            pending.append((sentence, tts.synthesize_async(sentence)))
+
+        def flush(block: bool = False):
+            nonlocal first_audio
+            while pending and (block or pending[0][1].done()):
+                sentence, fut = pending.popleft()
+                while True:
+                    if handle.cancelled:
+                        fut.cancel()
+                        raise TurnCancelled()
+                    try:
+                        wav = fut.result(timeout=0.1)
+                        break
+                    except FutureTimeout:
+                        continue
+                    except Exception as e:
+                        # one failed clip shouldn't drop the rest of the reply
+                        print("TTS error:", e)
+                        wav = None
+                        break
+                if wav:
+                    if first_audio:
+                        # what the user actually waits for: end of speech to first audible reply
+                        REGISTRY.observe("turn_first_audio_seconds", time.perf_counter() - t0)
+                        first_audio = False
+                    handle.emit(AUDIO, (sentence, wav))
+                block = False
+
+        stream = llm.stream_text(text)
+        try:
+            for delta in stream:
+                if handle.cancelled:
+                    raise TurnCancelled()
+                reply.append(delta)
+                handle.emit(TOKEN, delta)
+                for sentence in chunker.feed(delta):
+                    speak(sentence)
+                flush()
+        finally:
+            stream.close()
+        for sentence in chunker.flush():
+            speak(sentence)
+        while pending:
+            flush(block=True)
+        REGISTRY.observe("turn_seconds", time.perf_counter() - t0)
+        answer = "".join(reply).strip()
+        # Cancelled turns never get here; provider errors aren't worth remembering
+        if self.memory is not None and answer and answer not in (MISTRAL_UNAVAILABLE, OLLAMA_UNAVAILABLE, NO_PROVIDER):
+            self.memory.add_turn(text, answer)
+        handle.emit(DONE, answer)
@@ -0,0 +1,53 @@
+"""Headless voice API: STT, LLM and TTS over HTTP and WebSocket, without Streamlit.
+
+    python -m server                         # SERVER_HOST:SERVER_PORT, one process
+    python -m server --port 8765 --workers 4 # four processes sharing the port
+
+Endpoints: POST /v1/stt, /v1/chat, /v1/tts; WebSocket /v1/turn; GET /healthz, /metrics.
+"""
+import argparse
+import asyncio
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from tornado import httpserver, netutil, process
+
+from config.settings import Settings
+
+
+async def serve(settings: Settings, sockets):
+    from .app import make_app
+
+    # Blocking STT/LLM/TTS calls run here
+    app = make_app(settings)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(app.voice.executor_threads, thread_name_prefix="server"))
+    server = httpserver.HTTPServer(app, max_body_size=32 * 1024 * 1024)
+    server.add_sockets(sockets)
+    await asyncio.Event().wait()
+
+
+def main(argv=None) -> int:
+    settings = Settings.load()
+    p = argparse.ArgumentParser(prog="python -m server", description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default=settings.SERVER_HOST)
+    p.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    p.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                   help="processes accepting on the same port; 0 = one per CPU")
+    args = p.parse_args(argv)
+
+    # SO_REUSEPORT also lets separately launched servers share the port behind one address
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    sockets = netutil.bind_sockets(args.port, args.host, reuse_port=reuse_port)
+    if args.workers != 1:
+        # Forks before any model is loaded; each process warms its own engines on first use
+        process.fork_processes(args.workers or None)
+    print(f"voice server worker {process.task_id() or 0} listening on {args.host}:{args.port}", flush=True)
+    asyncio.run(serve(settings, sockets))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
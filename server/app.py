@@ -0,0 +1,362 @@
+import asyncio
+import dataclasses
+import functools
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+import numpy as np
+from tornado import web, websocket
+
+from config.settings import Settings
+from nlp.mistral_service import LLMService
+from pipeline.turn_pipeline import AUDIO, TurnPipeline
+from stt.buffers import GrowableBuffer
+from stt.resample import StreamingResampler
+from stt.speculative import SpeculativeTranscriber
+from stt.stt_service import STTService
+from stt.utils import TARGET_SR, frame_to_mono
+from stt.vad import VoiceActivityDetector, extract_speech
+from telemetry.metrics import REGISTRY
+from tts.opus import encode_for_playback
+from tts.tts_service import TTSService
+
+_END = object()
+
+
+class StageBusy(Exception):
+    pass
+
+
+class Stage:
+    """Caps concurrent work for one stage (stt, llm, tts).
+
+    Up to ``limit`` callers run at once and up to ``max_queue`` wait; anyone
+    beyond that is turned away with 503 so a load balancer can retry elsewhere.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max_queue
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(self.limit)
+
+    async def __aenter__(self):
+        if self._sem.locked() and self.waiting >= self.max_queue:
+            REGISTRY.inc(f"server_{self.name}_rejected")
+            raise StageBusy(self.name)
+        self.waiting += 1
+        t0 = time.perf_counter()
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        REGISTRY.observe(f"server_{self.name}_queue_seconds", time.perf_counter() - t0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._sem.release()
+
+
+async def run_blocking(fn: Callable, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+async def iterate_blocking(it: Iterator) -> AsyncIterator:
+    # Drives a blocking iterator from the executor, one item at a time
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await loop.run_in_executor(None, next, it, _END)
+        if item is _END:
+            return
+        yield item
+
+
+class AudioInput:
+    """One utterance arriving as WebSocket frames (16-bit PCM or Opus packets).
+
+    Frames are resampled to 16 kHz on arrival, labelled by the VAD, and
+    finished segments are transcribed while the rest is still streaming in.
+    """
+
+    def __init__(self, settings: Settings, fmt: str = "pcm16", sample_rate: int = TARGET_SR,
+                 language: Optional[str] = None):
+        self.settings = settings
+        self.language = language or settings.LANGUAGE
+        self.decoder = None
+        if fmt == "opus":
+            import av
+            self.decoder = av.CodecContext.create("libopus", "r")
+            sample_rate = 48000
+        elif fmt != "pcm16":
+            raise ValueError(f"unsupported audio format {fmt!r}")
+        self.resampler = StreamingResampler(sample_rate, TARGET_SR)
+        self.frames = GrowableBuffer(np.float32, initial_capacity=TARGET_SR * 30)
+        self.vad = None
+        if settings.VAD_ENABLED:
+            self.vad = VoiceActivityDetector(TARGET_SR, aggressiveness=settings.VAD_AGGRESSIVENESS,
+                                             frame_ms=settings.VAD_FRAME_MS, endpoint_ms=settings.VAD_ENDPOINT_MS)
+        self.speculative = None
+        if settings.STT_SPECULATIVE:
+            self.speculative = SpeculativeTranscriber(
+                STTService(settings), language=self.language, pause_ms=settings.STT_SEGMENT_PAUSE_MS,
+                max_segment_sec=settings.STT_SEGMENT_MAX_SEC, padding_ms=settings.VAD_PADDING_MS,
+            )
+
+    def feed(self, data: bytes):
+        if self.decoder is not None:
+            import av
+            chunks = [frame_to_mono(f) for f in self.decoder.decode(av.Packet(data))]
+        else:
+            chunks = [np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0]
+        for mono in chunks:
+            audio = self.resampler.process(mono)
+            self.frames.append(audio)
+            if self.vad is not None:
+                self.vad.process((np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+        if self.speculative is not None:
+            self.speculative.update(self.frames.view(), self.vad)
+
+    @property
+    def end_of_utterance(self) -> bool:
+        return self.vad is not None and self.vad.end_of_utterance
+
+    def partial_text(self) -> str:
+        return self.speculative.ready_text() if self.speculative is not None else ""
+
+    def finish(self) -> str:
+        audio = self.frames.view()
+        if self.speculative is not None:
+            return self.speculative.finish(audio, self.vad)
+        if self.vad is not None and self.vad.has_speech:
+            audio = extract_speech(audio, self.vad.speech_regions(self.settings.VAD_PADDING_MS, len(audio)))
+        return STTService(self.settings).transcribe_pcm(audio, TARGET_SR, language=self.language)
+
+
+class VoiceServer:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.stages: Dict[str, Stage] = {
+            "stt": Stage("stt", settings.SERVER_STT_CONCURRENCY, settings.SERVER_MAX_QUEUE),
+            "llm": Stage("llm", settings.SERVER_LLM_CONCURRENCY, settings.SERVER_MAX_QUEUE),
+            "tts": Stage("tts", settings.SERVER_TTS_CONCURRENCY, settings.SERVER_MAX_QUEUE),
+            # A WebSocket turn runs on one TurnPipeline worker; admitting more would only queue out of sight
+            "turn": Stage("turn", min(settings.SERVER_LLM_CONCURRENCY, settings.TURN_WORKERS),
+                          settings.SERVER_MAX_QUEUE),
+        }
+
+    @property
+    def executor_threads(self) -> int:
+        # Every admitted request or turn holds one thread; audio frames are fed outside any stage
+        return sum(s.limit for s in self.stages.values()) + 8
+
+
+class BaseHandler(web.RequestHandler):
+    @property
+    def voice(self) -> VoiceServer:
+        return self.application.voice
+
+    def json_body(self) -> dict:
+        try:
+            return json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise web.HTTPError(400, reason="invalid JSON")
+
+    def stage(self, name: str) -> Stage:
+        return self.voice.stages[name]
+
+    def log_exception(self, typ, value, tb):
+        if not isinstance(value, StageBusy):
+            super().log_exception(typ, value, tb)
+
+    def write_error(self, status_code: int, **kwargs):
+        exc = kwargs.get("exc_info", (None, None))[1]
+        if isinstance(exc, StageBusy):
+            self.set_status(503)
+            self.set_header("Retry-After", "1")
+            self.finish({"error": f"{exc} stage is busy"})
+            return
+        self.finish({"error": self._reason})
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write({"ok": True, "stages": {n: s.waiting for n, s in self.voice.stages.items()}})
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.write(REGISTRY.to_prometheus())
+
+
+class STTHandler(BaseHandler):
+    # POST an audio file (WAV, FLAC, ...), or raw 16-bit PCM with ?format=pcm16&rate=16000
+    async def post(self):
+        settings = self.voice.settings
+        language = self.get_query_argument("language", settings.LANGUAGE)
+        stt = STTService(settings)
+        pcm16 = self.get_query_argument("format", "file") == "pcm16"
+        if pcm16 and len(self.request.body) % 2:
+            raise web.HTTPError(400, reason="pcm16 body must be a whole number of samples")
+        async with self.stage("stt"):
+            if pcm16:
+                rate = int(self.get_query_argument("rate", str(TARGET_SR)))
+                pcm = np.frombuffer(self.request.body, dtype="<i2")
+                text = await run_blocking(stt.transcribe_pcm, pcm, rate, language=language)
+            else:
+                text = await run_blocking(stt.transcribe, self.request.body, language=language)
+        self.write({"text": text})
+
+
+class ChatHandler(BaseHandler):
+    # {"text": "...", "stream": true} streams newline-delimited {"delta": ...} objects
+    async def post(self):
+        body = self.json_body()
+        text = (body.get("text") or "").strip()
+        if not text:
+            raise web.HTTPError(400, reason="text is required")
+        llm = LLMService(self.voice.settings, strict_api=True)
+        async with self.stage("llm"):
+            if not body.get("stream"):
+                self.write({"text": await run_blocking(llm.generate, text)})
+                return
+            self.set_header("Content-Type", "application/x-ndjson")
+            stream = llm.stream_text(text)
+            parts = []
+            try:
+                async for delta in iterate_blocking(stream):
+                    parts.append(delta)
+                    self.write(json.dumps({"delta": delta}) + "\n")
+                    await self.flush()
+            finally:
+                stream.close()
+            self.write(json.dumps({"done": True, "text": "".join(parts).strip()}) + "\n")
+
+
+class TTSHandler(BaseHandler):
+    # {"text": "...", "format": "opus" | "wav"} -> audio bytes
+    async def post(self):
+        body = self.json_body()
+        text = (body.get("text") or "").strip()
+        if not text:
+            raise web.HTTPError(400, reason="text is required")
+        settings = self.voice.settings
+        fmt = body.get("format", settings.AUDIO_FORMAT)
+        async with self.stage("tts"):
+            wav = await run_blocking(TTSService(settings).synthesize, text)
+            data, mime = await run_blocking(encode_for_playback, wav, dataclasses.replace(settings, AUDIO_FORMAT=fmt))
+        self.set_header("Content-Type", mime)
+        self.write(data)
+
+
+class TurnSocket(websocket.WebSocketHandler):
+    """A voice conversation over one WebSocket, with its own conversation memory.
+
+    Client -> server: {"type": "start", "format": "pcm16"|"opus", "sample_rate": 16000},
+    then binary audio frames, then {"type": "end"}; or {"type": "text", "text": "..."};
+    {"type": "cancel"} stops the current reply.
+    Server -> client: {"type": "partial"|"transcript"|"token"|"sentence"|"done"|"error"|"cancelled", ...},
+    and for each spoken sentence {"type": "audio", "mime": ..., "sentence": ...} followed by one binary frame.
+    """
+
+    def open(self):
+        self.voice: VoiceServer = self.application.voice
+        self.pipeline = TurnPipeline(self.voice.settings, strict_api=True)
+        self.audio: Optional[AudioInput] = None
+        self.partial = ""
+        self.turn: Optional[asyncio.Task] = None
+
+    def check_origin(self, origin: str) -> bool:
+        return True  # headless API; put auth in front of it, not origin checks
+
+    async def on_message(self, message):
+        if isinstance(message, bytes):
+            if self.audio is None:
+                return  # no "start" yet, or the utterance already ended
+            await run_blocking(self.audio.feed, message)
+            partial = self.audio.partial_text()
+            if partial != self.partial:
+                self.partial = partial
+                self._send({"type": "partial", "text": partial})
+            if self.voice.settings.VAD_AUTO_REPLY and self.audio.end_of_utterance:
+                self._start_turn(audio=self.audio)
+            return
+
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return self._send({"type": "error", "text": "invalid JSON"})
+        kind = msg.get("type")
+        if kind == "start":
+            try:
+                self.audio = AudioInput(self.voice.settings, msg.get("format", "pcm16"),
+                                        int(msg.get("sample_rate", TARGET_SR)), msg.get("language"))
+            except ValueError as e:
+                return self._send({"type": "error", "text": str(e)})
+            self.partial = ""
+        elif kind == "end" and self.audio is not None:
+            self._start_turn(audio=self.audio)
+        elif kind == "text" and (msg.get("text") or "").strip():
+            self._start_turn(text=msg["text"].strip())
+        elif kind == "cancel":
+            self.pipeline.cancel()
+
+    def _start_turn(self, text: Optional[str] = None, audio: Optional[AudioInput] = None):
+        # A new turn replaces the one in progress, like barge-in in the UI
+        self.audio = None
+        self.pipeline.cancel()
+        if self.turn is not None:
+            self.turn.cancel()  # else a turn still transcribing would start after, and cancel, this one
+        self.turn = asyncio.ensure_future(self._turn(text, audio))
+
+    async def _turn(self, text: Optional[str], audio: Optional[AudioInput]):
+        stages = self.voice.stages
+        try:
+            if audio is not None:
+                async with stages["stt"]:
+                    text = await run_blocking(audio.finish)
+                if not text:
+                    return self._send({"type": "error", "text": "Could not transcribe. Please try again."})
+            # The pipeline synthesizes on the TTS pool; the tts stage bounds the encoding done here
+            async with stages["turn"]:
+                handle = self.pipeline.start(user_text=text)
+                async for event in iterate_blocking(handle.events()):
+                    if event.kind == AUDIO:
+                        sentence, wav = event.data
+                        async with stages["tts"]:
+                            data, mime = await run_blocking(encode_for_playback, wav, self.voice.settings)
+                        self._send({"type": "audio", "mime": mime, "sentence": sentence})
+                        self._send(data, binary=True)
+                    else:
+                        self._send({"type": event.kind, "text": event.data})
+        except StageBusy as e:
+            self._send({"type": "error", "text": f"{e} stage is busy, try again"})
+        except Exception as e:
+            print("Server turn error:", e)
+            self._send({"type": "error", "text": str(e)})
+
+    def _send(self, message, binary: bool = False):
+        try:
+            self.write_message(message if binary else json.dumps(message), binary=binary)
+        except websocket.WebSocketClosedError:
+            self.pipeline.cancel()
+
+    def on_close(self):
+        self.pipeline.cancel()
+        if self.turn is not None:
+            self.turn.cancel()  # a turn still transcribing would otherwise go on to the LLM and TTS
+
+
+def make_app(settings: Settings) -> web.Application:
+    app = web.Application([
+        (r"/healthz", HealthHandler),
+        (r"/metrics", MetricsHandler),
+        (r"/v1/stt", STTHandler),
+        (r"/v1/chat", ChatHandler),
+        (r"/v1/tts", TTSHandler),
+        (r"/v1/turn", TurnSocket),
+    ], websocket_max_message_size=4 * 1024 * 1024)
+    app.voice = VoiceServer(settings)
+    return app
@@ -0,0 +1,99 @@
+import threading
+from typing import Tuple
+
+import numpy as np
+
+
+class GrowableBuffer:
+    """Contiguous sample store for a whole utterance with amortized O(1) appends.
+
+    ``view`` returns a zero-copy slice. Growth reallocates, but slices handed
+    out earlier keep pointing at the old (still valid) array.
+    """
+
+    def __init__(self, dtype=np.int16, initial_capacity: int = 48000 * 10):
+        self.dtype = np.dtype(dtype)
+        self._initial_capacity = max(1, initial_capacity)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        # Fresh storage so views from the previous recording are never overwritten
+        with self._lock:
+            self._data = np.empty(self._initial_capacity, dtype=self.dtype)
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, samples: np.ndarray):
+        n = len(samples)
+        if n == 0:
+            return
+        with self._lock:
+            end = self._size + n
+            if end > len(self._data):
+                grown = np.empty(max(end, 2 * len(self._data)), dtype=self.dtype)
+                grown[:self._size] = self._data[:self._size]
+                self._data = grown
+            self._data[self._size:end] = samples
+            self._size = end
+
+    def view(self, start: int = 0, end: int = None) -> np.ndarray:
+        with self._lock:
+            end = self._size if end is None else min(end, self._size)
+            return self._data[start:end]
+
+
+class RingBuffer:
+    """Fixed-capacity rolling window backed by a mirrored numpy array.
+
+    Every sample is written twice (at i and i + capacity), so any window of up
+    to ``capacity`` samples is contiguous and ``latest``/``since`` never copy.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        self.capacity = max(1, capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(2 * self.capacity, dtype=self.dtype)
+        self._lock = threading.Lock()
+        self._pos = 0
+        self.total = 0  # samples ever appended
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._pos = 0
+            self.total = 0
+
+    def append(self, samples: np.ndarray):
+        n = len(samples)
+        if n == 0:
+            return
+        cap = self.capacity
+        with self._lock:
+            self.total += n
+            if n > cap:
+                samples = samples[-cap:]
+                n = cap
+            first = min(n, cap - self._pos)
+            for off in (0, cap):
+                self._data[off + self._pos:off + self._pos + first] = samples[:first]
+                self._data[off:off + n - first] = samples[first:]
+            self._pos = (self._pos + n) % cap
+
+    def latest(self, n: int = None) -> np.ndarray:
+        with self._lock:
+            avail = min(self.total, self.capacity)
+            n = avail if n is None else min(n, avail)
+            end = self._pos + self.capacity
+            return self._data[end - n:end]
+
+    def since(self, mark: int) -> Tuple[np.ndarray, int]:
+        # Samples appended after ``mark`` (a previous ``total``); older ones may have been overwritten
+        with self._lock:
+            n = max(0, min(self.total - mark, self.capacity))
+            end = self._pos + self.capacity
+            return self._data[end - n:end], self.total
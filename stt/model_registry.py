@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from config.settings import Settings
+from telemetry.metrics import timed
+
+
+@timed("whisper_model_load")
+def _load_whisper_model(key: Tuple[str, str, str, int]):
+    from faster_whisper import WhisperModel
+    model_size, compute_type, device, cpu_threads = key
+    return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+class ModelRegistry:
+    """Process-wide LRU of loaded models, shared by every session and rerun."""
+
+    def __init__(self, loader: Callable[[Hashable], object], max_models: int = 1):
+        self._loader = loader
+        self.max_models = max(1, max_models)
+        self._models: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, key: Hashable):
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            # one loader per key; concurrent callers wait on the same load
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+            try:
+                model = self._loader(key)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            with self._lock:
+                # Published before the load lock is dropped, so no caller can start a second load
+                self._models[key] = model
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+                self._loading.pop(key, None)
+            return model
+
+    def is_loaded(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+_whisper_registry = ModelRegistry(_load_whisper_model)
+_warmups = {}
+_warmups_lock = threading.Lock()
+
+
+def whisper_key(settings: Settings) -> Tuple[str, str, str, int]:
+    return (
+        settings.WHISPER_MODEL_SIZE,
+        settings.WHISPER_COMPUTE_TYPE,
+        settings.WHISPER_DEVICE,
+        settings.WHISPER_CPU_THREADS,
+    )
+
+
+def get_whisper_model(settings: Settings):
+    _whisper_registry.max_models = max(1, settings.WHISPER_MAX_MODELS)
+    return _whisper_registry.get(whisper_key(settings))
+
+
+def warm_up_whisper(settings: Settings) -> threading.Thread:
+    # Safe to call on every rerun: at most one warm-up thread per model key.
+    key = whisper_key(settings)
+    with _warmups_lock:
+        t = _warmups.get(key)
+        if t is not None and (t.is_alive() or _whisper_registry.is_loaded(key)):
+            return t
+
+        def _run():
+            try:
+                get_whisper_model(settings)
+            except Exception as e:
+                print("Whisper warm-up error:", e)
+
+        t = threading.Thread(target=_run, name="whisper-warmup", daemon=True)
+        _warmups[key] = t
+        t.start()
+        return t
@@ -0,0 +1,193 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import Settings
+from telemetry.metrics import REGISTRY
+from .model_registry import whisper_key
+from .scheduler import PRIORITY_FINAL, STTJob, decode_text, decode_words
+from .utils import TARGET_SR
+
+_model = None
+_load_error: Optional[str] = None
+
+
+def load_worker_model(key: Tuple[str, str, str, int]):
+    from faster_whisper import WhisperModel
+    model_size, compute_type, device, cpu_threads = key
+    return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=1)
+
+
+def _init_worker(loader: Callable, key: tuple):
+    global _model, _load_error
+    try:
+        _model = loader(key)
+    except Exception as e:
+        print("STT worker init error:", e)
+        _load_error = f"{type(e).__name__}: {e}"
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _decode_job(shm_name: str, n_samples: int, language: Optional[str], words: bool,
+                initial_prompt: Optional[str]):
+    # Runs in the worker: decode straight from the parent's shared buffer, no pickled audio
+    if _model is None:
+        raise RuntimeError(f"STT worker has no model ({_load_error})")
+    shm = shared_memory.SharedMemory(name=shm_name)
+    audio = np.ndarray((n_samples,), dtype=np.float32, buffer=shm.buf)
+    try:
+        t0 = time.perf_counter()
+        if words:
+            result = decode_words(_model, audio, language, initial_prompt)
+        else:
+            result = decode_text(_model, audio, language)
+        return result, time.perf_counter() - t0
+    finally:
+        audio = None  # the view must go before the mapping can close
+        shm.close()
+
+
+class STTProcessPool:
+    """N worker processes, each with its own Whisper model and thread budget.
+
+    Audio is handed over in shared memory; jobs wait in a priority queue in
+    the parent and only go to the executor when a worker is free, so finals
+    still overtake queued partials. If a worker dies (e.g. killed for memory)
+    the executor is replaced, so only the jobs in flight at the time fail.
+    """
+
+    def __init__(self, key: tuple, workers: int = 2, threads_per_worker: int = 0,
+                 loader: Callable = load_worker_model):
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        model_size, compute_type, device, _ = key
+        self._initargs = (loader, (model_size, compute_type, device, self.threads_per_worker))
+        self._executor = self._new_executor()
+        self._executor_lock = threading.Lock()
+        self._heap: List[STTJob] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._free = threading.Semaphore(self.workers)
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch, name="stt-dispatch", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray, language: Optional[str] = "en", priority: int = PRIORITY_FINAL,
+               words: bool = False, initial_prompt: Optional[str] = None) -> Future:
+        job = STTJob(priority, next(self._seq), audio, language, words, initial_prompt)
+        with self._cond:
+            heapq.heappush(self._heap, job)
+            self._cond.notify()
+        return job.future
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._initargs,
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is broken and not self._closed:
+                print("STT worker died; starting a new worker pool")
+                REGISTRY.inc("stt_pool_restarts")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                self.warm_up()
+            return self._executor
+
+    def warm_up(self):
+        # Executors spawn workers lazily; one ping per worker loads every model up front
+        for _ in range(self.workers):
+            self._executor.submit(_ping)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self):
+        while True:
+            self._free.acquire()
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job = heapq.heappop(self._heap)
+            if not job.future.set_running_or_notify_cancel():
+                self._free.release()
+                continue
+            try:
+                self._start(job)
+            except Exception as e:
+                self._free.release()
+                job.future.set_exception(e)
+
+    def _start(self, job: STTJob):
+        audio = np.ascontiguousarray(job.audio, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(4, audio.nbytes))
+        np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+        REGISTRY.observe("stt_queue_wait_seconds", time.perf_counter() - job.enqueued)
+        args = (_decode_job, shm.name, audio.size, job.language, job.words, job.initial_prompt)
+        executor = self._executor
+        try:
+            try:
+                inner = executor.submit(*args)
+            except BrokenProcessPool:
+                # Broke since the last job finished; nothing of this job ran yet, so retry on a fresh pool
+                executor = self._restart(executor)
+                inner = executor.submit(*args)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+        def _done(f: Future):
+            self._free.release()
+            shm.close()
+            shm.unlink()
+            try:
+                result, decode_sec = f.result()
+            except BaseException as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._restart(executor)
+                job.future.set_exception(e)
+                return
+            if audio.size:
+                REGISTRY.observe("whisper_rtf", decode_sec / (audio.size / TARGET_SR))
+            job.future.set_result(result)
+
+        inner.add_done_callback(_done)
+
+
+_pools: Dict[tuple, STTProcessPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_stt_pool(settings: Settings) -> Optional[STTProcessPool]:
+    if settings.STT_BACKEND.lower() != "process":
+        return None
+    key = (whisper_key(settings), settings.STT_WORKERS, settings.STT_THREADS_PER_WORKER)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = STTProcessPool(whisper_key(settings), settings.STT_WORKERS, settings.STT_THREADS_PER_WORKER)
+            pool.warm_up()
+            _pools[key] = pool
+        return pool
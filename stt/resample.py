@@ -0,0 +1,67 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+
+@lru_cache(maxsize=16)
+def _polyphase_taps(up: int, down: int) -> np.ndarray:
+    # Same low-pass design as scipy.signal.resample_poly, split into `up` phases.
+    # Row p holds h[p + k*up] for k = K-1..0 so it can be dotted with an input window.
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    k = -(-len(h) // up)
+    h = np.concatenate([h, np.zeros(k * up - len(h))])
+    taps = h.reshape(k, up).T[:, ::-1].astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+class StreamingResampler:
+    """Polyphase resampler that keeps filter history across chunk boundaries.
+
+    Feeding a signal chunk by chunk gives the same output as resampling it in
+    one go (delayed by the filter's half length), so each frame is touched once.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int = 16000):
+        g = math.gcd(src_rate, dst_rate)
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.up = dst_rate // g
+        self.down = src_rate // g
+        self._taps = _polyphase_taps(self.up, self.down) if self.up != self.down else None
+        self._k = self._taps.shape[1] if self._taps is not None else 1
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(self._k - 1, dtype=np.float32)
+        self._in_count = 0
+        self._out_count = 0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        if self.up == self.down:
+            return x
+        if x.size == 0:
+            return x
+        ext = np.concatenate([self._history, x])
+        total_in = self._in_count + x.size
+        # outputs whose newest input sample has now arrived
+        n_end = (total_in * self.up - 1) // self.down + 1
+        n = np.arange(self._out_count, n_end)
+        m = n * self.down
+        windows = sliding_window_view(ext, self._k)
+        y = np.einsum(
+            "nk,nk->n",
+            self._taps[m % self.up],
+            windows[m // self.up - self._in_count],
+        ).astype(np.float32, copy=False)
+
+        self._history = ext[-(self._k - 1):] if self._k > 1 else ext[:0]
+        self._in_count += x.size
+        self._out_count = n_end
+        return y
@@ -0,0 +1,231 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import Settings
+from telemetry.metrics import REGISTRY
+from .model_registry import get_whisper_model, whisper_key
+from .utils import TARGET_SR
+
+# Lower runs first: a finished utterance is waiting on the reply, captions can lag
+PRIORITY_FINAL = 0
+PRIORITY_PARTIAL = 1
+
+MAX_BATCH_SAMPLES = 30 * TARGET_SR  # one Whisper window; longer audio needs the seeking decoder
+
+
+def _record_rtf(audio_samples: int, t0: float):
+    # Real-time factor: decode wall time per second of audio (< 1 is faster than real time)
+    audio_sec = audio_samples / TARGET_SR
+    if audio_sec > 0:
+        REGISTRY.observe("whisper_rtf", (time.perf_counter() - t0) / audio_sec)
+
+
+def decode_text(model, mono: np.ndarray, language: Optional[str]) -> str:
+    t0 = time.perf_counter()
+    segments, info = model.transcribe(mono, language=language, beam_size=1)
+    text = "".join([seg.text for seg in segments]).strip()
+    _record_rtf(mono.size, t0)
+    return text
+
+
+def decode_words(model, mono: np.ndarray, language: Optional[str],
+                 initial_prompt: Optional[str] = None) -> List[Tuple[float, float, str]]:
+    t0 = time.perf_counter()
+    segments, info = model.transcribe(
+        mono,
+        language=language,
+        beam_size=1,
+        word_timestamps=True,
+        initial_prompt=initial_prompt,
+        condition_on_previous_text=False,
+    )
+    words = [(w.start, w.end, w.word) for seg in segments for w in (seg.words or [])]
+    _record_rtf(mono.size, t0)
+    return words
+
+
+def decode_text_batch(model, audios: List[np.ndarray], language: str, no_speech_threshold: float = 0.6,
+                      log_prob_threshold: float = -1.0, compression_ratio_threshold: float = 2.4) -> List[str]:
+    """One encoder pass and one batched greedy decode for several <=30 s clips.
+
+    faster-whisper 1.0.3 has no batched pipeline, so this drives the
+    CTranslate2 model directly with the same prompt ``transcribe`` would
+    build for a plain-text, no-timestamp decode, and applies the same
+    silence rule. Clips that would need ``transcribe``'s temperature
+    fallback (low log-prob or a repetition loop) are decoded again through
+    ``decode_text``, so batching never changes a transcript.
+    """
+    import ctranslate2
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import get_compression_ratio
+
+    t0 = time.perf_counter()
+    n_frames = model.feature_extractor.nb_max_frames
+    features = np.stack([
+        pad_or_trim(model.feature_extractor(a)[:, :n_frames], n_frames) for a in audios
+    ]).astype(np.float32)
+    encoder_output = model.model.encode(ctranslate2.StorageView.from_array(np.ascontiguousarray(features)))
+    tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language)
+    prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+    results = model.model.generate(
+        encoder_output,
+        [prompt] * len(audios),
+        beam_size=1,
+        max_length=model.max_length,
+        return_scores=True,
+        return_no_speech_prob=True,
+        suppress_blank=True,
+        suppress_tokens=[-1],
+    )
+    texts: List[Optional[str]] = []
+    for r in results:
+        tokens = r.sequences_ids[0]
+        # Same recovery of the average log-prob as transcribe() (length_penalty 1)
+        avg_logprob = r.scores[0] * len(tokens) / (len(tokens) + 1)
+        text = tokenizer.decode(tokens).strip()
+        if r.no_speech_prob > no_speech_threshold and avg_logprob < log_prob_threshold:
+            texts.append("")
+        elif avg_logprob < log_prob_threshold or get_compression_ratio(text) > compression_ratio_threshold:
+            texts.append(None)
+        else:
+            texts.append(text)
+    _record_rtf(sum(a.size for a in audios), t0)
+    for i, text in enumerate(texts):
+        if text is None:
+            REGISTRY.inc("stt_batch_redecodes")
+            texts[i] = decode_text(model, audios[i], language)
+    return texts
+
+
+@dataclass(order=True)
+class STTJob:
+    priority: int
+    seq: int
+    audio: np.ndarray = field(compare=False)
+    language: Optional[str] = field(compare=False)
+    words: bool = field(compare=False, default=False)
+    initial_prompt: Optional[str] = field(compare=False, default=None)
+    future: Future = field(compare=False, default_factory=Future)
+    enqueued: float = field(compare=False, default_factory=time.perf_counter)
+
+    @property
+    def batchable(self) -> bool:
+        return (not self.words and self.language is not None and self.initial_prompt is None
+                and 0 < self.audio.size <= MAX_BATCH_SAMPLES)
+
+
+class STTScheduler:
+    """Single queue in front of one Whisper model, shared by every session.
+
+    Jobs are taken in priority order; plain-text jobs of the same language
+    that arrive within ``window_ms`` of each other (or pile up while the
+    model is busy) are decoded as one batch. A lone job goes through the
+    regular ``transcribe`` path, so single-user results are unchanged.
+    """
+
+    def __init__(self, model_getter: Callable[[], object], max_batch: int = 8, window_ms: float = 15.0,
+                 batch_fn: Callable = decode_text_batch, text_fn: Callable = decode_text,
+                 words_fn: Callable = decode_words):
+        self._get_model = model_getter
+        self.max_batch = max(1, max_batch)
+        self.window = window_ms / 1000.0
+        self._batch_fn, self._text_fn, self._words_fn = batch_fn, text_fn, words_fn
+        self._heap: List[STTJob] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="stt-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray, language: Optional[str] = "en", priority: int = PRIORITY_FINAL,
+               words: bool = False, initial_prompt: Optional[str] = None) -> Future:
+        job = STTJob(priority, next(self._seq), audio, language, words, initial_prompt)
+        with self._cond:
+            heapq.heappush(self._heap, job)
+            self._cond.notify()
+        return job.future
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _take(self) -> List[STTJob]:
+        with self._cond:
+            while not self._heap:
+                self._cond.wait()
+            # Hold the oldest job for at most one window so others can join its batch
+            deadline = min(j.enqueued for j in self._heap) + self.window
+            while len(self._heap) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            first = heapq.heappop(self._heap)
+            jobs = [first]
+            if first.batchable:
+                rest = []
+                while self._heap and len(jobs) < self.max_batch:
+                    job = heapq.heappop(self._heap)
+                    (jobs if job.batchable and job.language == first.language else rest).append(job)
+                for job in rest:
+                    heapq.heappush(self._heap, job)
+            return jobs
+
+    def _loop(self):
+        while True:
+            jobs = [j for j in self._take() if j.future.set_running_or_notify_cancel()]
+            if not jobs:
+                continue
+            now = time.perf_counter()
+            for j in jobs:
+                REGISTRY.observe("stt_queue_wait_seconds", now - j.enqueued)
+            REGISTRY.observe("stt_batch_size", len(jobs))
+            try:
+                model = self._get_model()
+            except Exception as e:
+                for j in jobs:
+                    j.future.set_exception(e)
+                continue
+            if len(jobs) > 1:
+                try:
+                    texts = self._batch_fn(model, [j.audio for j in jobs], jobs[0].language)
+                    for j, text in zip(jobs, texts):
+                        j.future.set_result(text)
+                    continue
+                except Exception as e:
+                    print("Batched STT error, decoding one by one:", e)
+            for j in jobs:
+                try:
+                    if j.words:
+                        j.future.set_result(self._words_fn(model, j.audio, j.language, j.initial_prompt))
+                    else:
+                        j.future.set_result(self._text_fn(model, j.audio, j.language))
+                except Exception as e:
+                    j.future.set_exception(e)
+
+
+_schedulers: Dict[tuple, STTScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_stt_scheduler(settings: Settings) -> Optional[STTScheduler]:
+    if not settings.STT_BATCHING:
+        return None
+    key = whisper_key(settings)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = STTScheduler(
+                lambda: get_whisper_model(settings),
+                max_batch=settings.STT_BATCH_MAX,
+                window_ms=settings.STT_BATCH_WINDOW_MS,
+            )
+            _schedulers[key] = scheduler
+        return scheduler
@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+import numpy as np
+
+from telemetry.metrics import REGISTRY
+from .utils import TARGET_SR
+from .vad import extract_speech
+
+
+class SpeculativeTranscriber:
+    """Transcribes a recording segment by segment while it is still going.
+
+    A segment is closed at a pause of ``pause_ms`` in the VAD labels, or
+    after ``max_segment_sec`` of continuous audio, and handed to STT right
+    away. ``finish`` only has to decode the audio after the last cut, so the
+    wait for the final transcript doesn't grow with the recording.
+    """
+
+    def __init__(self, stt, language: Optional[str] = "en", pause_ms: int = 500,
+                 max_segment_sec: float = 15.0, padding_ms: int = 300):
+        self.stt = stt
+        self.language = language
+        self.pause_samples = TARGET_SR * pause_ms // 1000
+        self.max_samples = int(max_segment_sec * TARGET_SR)
+        self.padding_ms = padding_ms
+        self.cut = 0  # audio before this sample has been submitted
+        self._futures: List[Future] = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def segments(self) -> int:
+        return len(self._futures)
+
+    def ready_text(self) -> str:
+        # Leading segments that have finished decoding; never blocks
+        with self._lock:
+            futures = list(self._futures)
+        parts = []
+        for fut in futures:
+            if not fut.done() or fut.exception() is not None:
+                break
+            if fut.result():
+                parts.append(fut.result().strip())
+        return " ".join(parts)
+
+    def update(self, audio: np.ndarray, vad=None):
+        # audio: the whole recording so far (16 kHz mono); vad labels the same samples
+        with self._lock:
+            if self._closed:
+                return
+            end = len(audio)
+            cut = None
+            if vad is not None and vad.regions:
+                speech_end = vad.regions[-1][1]
+                if speech_end > self.cut and vad.silence_run * vad.frame_len >= self.pause_samples:
+                    cut = min(end, speech_end + self.pause_samples // 2)
+            if cut is None and end - self.cut >= self.max_samples:
+                cut = end
+            if cut is not None:
+                self._submit(audio, cut, vad, final=False)
+
+    def _speech(self, audio: np.ndarray, end: int, vad) -> np.ndarray:
+        if vad is None:
+            return audio[self.cut:end]
+        regions = [
+            (max(s, self.cut) - self.cut, min(e, end) - self.cut)
+            for s, e in vad.speech_regions(self.padding_ms, total_samples=end)
+            if e > self.cut and s < end
+        ]
+        return extract_speech(audio[self.cut:end], regions)
+
+    def _submit(self, audio: np.ndarray, end: int, vad, final: bool):
+        segment = self._speech(audio, end, vad)
+        self.cut = end
+        if segment.size:
+            self._futures.append(self.stt.transcribe_async(segment, language=self.language, partial=not final))
+            REGISTRY.inc("stt_final_segments" if final else "stt_speculative_segments")
+
+    def finish(self, audio: np.ndarray, vad=None) -> str:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._submit(audio, len(audio), vad, final=True)
+            futures = list(self._futures)
+        parts = []
+        for fut in futures:
+            try:
+                text = fut.result()
+            except Exception as e:
+                print("STT segment error:", e)
+                continue
+            if text:
+                parts.append(text.strip())
+        return " ".join(parts)
@@ -0,0 +1,102 @@
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .utils import pcm_to_mono_16k
+
+Word = Tuple[float, float, str]  # (start_sec, end_sec, text), absolute within the utterance
+
+_NORM_RE = re.compile(r"[^\w']+")
+
+
+def _norm(word: str) -> str:
+    return _NORM_RE.sub("", word.lower())
+
+
+def _agreed_prefix(prev: List[Word], cur: List[Word]) -> int:
+    n = 0
+    for a, b in zip(prev, cur):
+        if _norm(a[2]) != _norm(b[2]):
+            break
+        n += 1
+    return n
+
+
+class IncrementalTranscriber:
+    """Live-caption transcriber that only re-decodes the uncommitted tail.
+
+    Words that two consecutive hypotheses agree on are committed and their
+    audio is dropped, so each step decodes at most ``max_tail_sec`` of audio.
+    The committed text is fed back as the decoder prompt to keep context.
+    """
+
+    def __init__(self, stt, language: Optional[str] = "en", max_tail_sec: float = 4.0):
+        self.stt = stt
+        self.language = language
+        self.sample_rate = 16000
+        self.max_tail_sec = max_tail_sec
+        self.committed: List[Word] = []
+        self._pending: List[Word] = []
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._tail_start = 0.0
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(w[2] for w in self.committed).strip()
+
+    @property
+    def text(self) -> str:
+        return "".join(w[2] for w in self.committed + self._pending).strip()
+
+    def feed(self, audio: np.ndarray):
+        if audio.size:
+            self._tail = np.concatenate([self._tail, audio.astype(np.float32, copy=False)])
+
+    def feed_pcm(self, pcm: np.ndarray, sample_rate: int):
+        self.feed(pcm_to_mono_16k(pcm, sample_rate))
+
+    def _decode_tail(self, partial: bool = True) -> List[Word]:
+        if self._tail.size == 0:
+            return []
+        prompt = self.committed_text[-200:] or None
+        words = self.stt.transcribe_words(self._tail, language=self.language, initial_prompt=prompt,
+                                          partial=partial)
+        return [(self._tail_start + s, self._tail_start + e, t) for s, e, t in words]
+
+    def _commit(self, words: List[Word]):
+        if not words:
+            return
+        self.committed.extend(words)
+        cut = int(round((words[-1][1] - self._tail_start) * self.sample_rate))
+        cut = max(0, min(cut, self._tail.size))
+        self._tail = self._tail[cut:]
+        self._tail_start += cut / self.sample_rate
+
+    def step(self) -> str:
+        hyp = self._decode_tail()
+        n = _agreed_prefix(self._pending, hyp)
+        self._commit(hyp[:n])
+        rest = hyp[n:]
+
+        tail_sec = self._tail.size / self.sample_rate
+        if tail_sec > self.max_tail_sec:
+            # Force progress on long unstable stretches so per-step cost stays bounded
+            keep_from = self._tail_start + tail_sec - self.max_tail_sec / 2
+            forced = [w for w in rest if w[1] <= keep_from]
+            if not forced:
+                # Words straddling the cut are committed whole rather than dropped with the audio
+                forced = [w for w in rest if w[0] < keep_from]
+            self._commit(forced)
+            rest = rest[len(forced):]
+            if not forced:
+                drop = int((tail_sec - self.max_tail_sec / 2) * self.sample_rate)
+                self._tail = self._tail[drop:]
+                self._tail_start += drop / self.sample_rate
+        self._pending = rest
+        return self.text
+
+    def finalize(self) -> str:
+        self._commit(self._decode_tail(partial=False))
+        self._pending = []
+        return self.committed_text
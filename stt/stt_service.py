@@ -1,30 +1,79 @@
-from typing import Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
 from config.settings import Settings
-from .utils import load_audio_to_mono_16k
+from .utils import load_audio_to_mono_16k, pcm_to_mono_16k
+from .model_registry import get_whisper_model
+from .process_pool import get_stt_pool
+from .scheduler import PRIORITY_FINAL, PRIORITY_PARTIAL, decode_text, decode_words, get_stt_scheduler
+from telemetry.metrics import timed
 
-# Whisper (local inference)
-from faster_whisper import WhisperModel
+_inline: Optional[ThreadPoolExecutor] = None
+_inline_lock = threading.Lock()
+
+
+def _inline_executor() -> ThreadPoolExecutor:
+    # Background decodes when there is no scheduler or pool to queue them on
+    global _inline
+    with _inline_lock:
+        if _inline is None:
+            _inline = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        return _inline
 
 
 class STTService:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.engine = settings.STT_ENGINE.upper()
-        self._whisper_model = None
 
     def _load_whisper(self):
-        if self._whisper_model is None:
-            model_size = self.settings.WHISPER_MODEL_SIZE  # tiny/base/small
-            self._whisper_model = WhisperModel(model_size, compute_type="int8")
-        return self._whisper_model
+        # Shared across sessions and reruns (see stt.model_registry)
+        return get_whisper_model(self.settings)
 
+    def _backend(self):
+        # Worker processes, else the in-process batching queue, else None (decode inline)
+        return get_stt_pool(self.settings) or get_stt_scheduler(self.settings)
 
+
+    @timed("stt_transcribe")
     def transcribe(self, file_bytes: bytes, language: Optional[str] = "en") -> str:
         mono, sr = load_audio_to_mono_16k(file_bytes)
+        return self._transcribe_mono(mono, language)
+
+    @timed("stt_transcribe_pcm")
+    def transcribe_pcm(self, audio: np.ndarray, sample_rate: int, language: Optional[str] = "en") -> str:
+        # Raw int16/float32 samples straight from the capture buffers, no WAV container
+        return self._transcribe_mono(pcm_to_mono_16k(audio, sample_rate), language)
+
+    def _transcribe_mono(self, mono: np.ndarray, language: Optional[str]) -> str:
+        if mono.size == 0:
+            return ""
         if self.engine == "WHISPER":
-            model = self._load_whisper()
-            segments, info = model.transcribe(mono, language=language, beam_size=1)
-            text = "".join([seg.text for seg in segments]).strip()
-            return text
+            backend = self._backend()
+            if backend is not None:
+                return backend.submit(mono, language, PRIORITY_FINAL).result()
+            return decode_text(self._load_whisper(), mono, language)
         else:
             return ""
+
+    def transcribe_async(self, mono_16k: np.ndarray, language: Optional[str] = "en",
+                         partial: bool = False) -> Future:
+        # Future of the text; partial=True lets finished utterances go first
+        backend = self._backend() if self.engine == "WHISPER" else None
+        if backend is not None:
+            return backend.submit(mono_16k, language, PRIORITY_PARTIAL if partial else PRIORITY_FINAL)
+        return _inline_executor().submit(self._transcribe_mono, mono_16k, language)
+
+    def transcribe_words(self, mono_16k: np.ndarray, language: Optional[str] = "en",
+                         initial_prompt: Optional[str] = None,
+                         partial: bool = False) -> List[Tuple[float, float, str]]:
+        # partial=True marks live-caption work, which yields to final transcripts
+        if self.engine != "WHISPER":
+            return []
+        backend = self._backend()
+        if backend is not None:
+            priority = PRIORITY_PARTIAL if partial else PRIORITY_FINAL
+            return backend.submit(mono_16k, language, priority, words=True,
+                                  initial_prompt=initial_prompt).result()
+        return decode_words(self._load_whisper(), mono_16k, language, initial_prompt)
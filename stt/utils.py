@@ -2,13 +2,43 @@ import io
 import numpy as np
 import soundfile as sf
 from scipy.signal import resample_poly
+from telemetry.metrics import timed
 
+TARGET_SR = 16000
+
+
+def pcm_to_mono_16k(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    # int16 or float32 samples, shape (n,) or (n, channels) -> 16 kHz mono float32
+    audio = np.asarray(audio)
+    if audio.ndim == 2:
+        mono = audio.mean(axis=1, dtype=np.float32)
+    else:
+        mono = audio.astype(np.float32, copy=False)
+    if audio.dtype == np.int16:
+        mono *= 1.0 / 32768.0  # always a fresh float32 array here
+    if sample_rate != TARGET_SR:
+        mono = resample_poly(mono, TARGET_SR, sample_rate).astype(np.float32, copy=False)
+    return mono
+
+
+def frame_to_mono(frame) -> np.ndarray:
+    # av.AudioFrame (WebRTC capture or decoded Opus) -> mono float32 at the frame's own rate
+    pcm = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if frame.format.is_planar:
+        mono = pcm.mean(axis=0, dtype=np.float32) if pcm.ndim == 2 else pcm.astype(np.float32)
+    else:
+        # packed formats interleave channels in a single row
+        mono = pcm.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    if pcm.dtype == np.int16:
+        mono *= 1.0 / 32768.0
+    return mono
+
+
+@timed("stt_load_audio")
 def load_audio_to_mono_16k(file_bytes: bytes):
     data, sr = sf.read(io.BytesIO(file_bytes), dtype="float32", always_2d=True)
-    mono = data.mean(axis=1)
-    if sr != 16000:
-        mono = resample_poly(mono, 16000, sr)
-    return mono.astype(np.float32), 16000
+    return pcm_to_mono_16k(data, sr), TARGET_SR
 
 def to_int16_pcm(mono_float: np.ndarray):
     mono_clipped = np.clip(mono_float, -1.0, 1.0)
@@ -0,0 +1,89 @@
+from typing import List, Tuple
+
+import numpy as np
+import webrtcvad
+
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+
+Region = Tuple[int, int]  # [start, end) in samples
+
+
+class VoiceActivityDetector:
+    """Labels int16 PCM frames as speech/non-speech as they arrive.
+
+    Keeps the speech regions seen so far and flags ``end_of_utterance`` once
+    enough speech has been heard and it is followed by ``endpoint_ms`` of silence.
+    """
+
+    def __init__(self, sample_rate: int, aggressiveness: int = 2, frame_ms: int = 30,
+                 endpoint_ms: int = 800, min_speech_ms: int = 250):
+        if sample_rate not in VAD_SAMPLE_RATES:
+            raise ValueError(f"webrtcvad does not support {sample_rate} Hz")
+        if frame_ms not in (10, 20, 30):
+            raise ValueError("frame_ms must be 10, 20 or 30")
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = sample_rate * frame_ms // 1000
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self._endpoint_frames = max(1, endpoint_ms // frame_ms)
+        self._min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self._rest = b""
+        self.reset()
+
+    def reset(self):
+        self._rest = b""
+        self.samples_seen = 0
+        self.regions: List[Region] = []
+        self.speech_frames = 0
+        self.silence_run = 0
+        self.end_of_utterance = False
+
+    @property
+    def has_speech(self) -> bool:
+        return self.speech_frames >= self._min_speech_frames
+
+    def process(self, pcm: bytes) -> List[bool]:
+        data = self._rest + pcm
+        step = self.frame_len * 2
+        n_frames = len(data) // step
+        labels = []
+        for i in range(n_frames):
+            frame = data[i * step:(i + 1) * step]
+            start = self.samples_seen
+            self.samples_seen += self.frame_len
+            speech = self._vad.is_speech(frame, self.sample_rate)
+            labels.append(speech)
+            if speech:
+                self.speech_frames += 1
+                self.silence_run = 0
+                if self.regions and self.regions[-1][1] == start:
+                    self.regions[-1] = (self.regions[-1][0], self.samples_seen)
+                else:
+                    self.regions.append((start, self.samples_seen))
+            else:
+                self.silence_run += 1
+                if self.has_speech and self.silence_run >= self._endpoint_frames:
+                    self.end_of_utterance = True
+        self._rest = data[n_frames * step:]
+        return labels
+
+    def speech_regions(self, padding_ms: int = 300, total_samples: int = None) -> List[Region]:
+        pad = self.sample_rate * padding_ms // 1000
+        end_limit = self.samples_seen if total_samples is None else total_samples
+        merged: List[Region] = []
+        for s, e in self.regions:
+            s, e = max(0, s - pad), min(end_limit, e + pad)
+            if merged and s <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+            else:
+                merged.append((s, e))
+        return merged
+
+
+def extract_speech(samples: np.ndarray, regions: List[Region]) -> np.ndarray:
+    if not regions:
+        return samples[:0]
+    if len(regions) == 1:
+        s, e = regions[0]
+        return samples[s:e]
+    return np.concatenate([samples[s:e] for s, e in regions])
@@ -0,0 +1,156 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Rolling window of observations; quantiles are computed over the last ``window`` values."""
+
+    def __init__(self, window: int = 1024):
+        self._values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self) -> Dict[float, float]:
+        values = list(self._values)
+        if not values:
+            return {q: 0.0 for q in QUANTILES}
+        qs = np.quantile(np.asarray(values, dtype=np.float64), QUANTILES)
+        return dict(zip(QUANTILES, (float(v) for v in qs)))
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._hists: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            hist = self._hists.get(name)
+            if hist is None:
+                hist = self._hists[name] = Histogram(self.window)
+            hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + amount
+
+    def register_collector(self, fn: Callable[[], Dict[str, float]]):
+        # Called at export time for gauges owned elsewhere (cache hit rates, ...)
+        with self._lock:
+            self._collectors.append(fn)
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hists = {
+                name: {"count": h.count, "sum": h.total, **{f"p{int(q * 100)}": v for q, v in h.quantiles().items()}}
+                for name, h in self._hists.items()
+            }
+            counters = dict(self._counters)
+            collectors = list(self._collectors)
+        gauges = {}
+        for fn in collectors:
+            try:
+                gauges.update(fn())
+            except Exception as e:
+                print("metrics collector error:", e)
+        return {"histograms": hists, "counters": counters, "gauges": gauges}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "voicetutor_") -> str:
+        snap = self.snapshot()
+        lines = []
+        for name, h in sorted(snap["histograms"].items()):
+            metric = prefix + name
+            lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {h[f"p{int(q * 100)}"]:.6g}')
+            lines.append(f"{metric}_sum {h['sum']:.6g}")
+            lines.append(f"{metric}_count {h['count']}")
+        for name, v in sorted(snap["counters"].items()):
+            lines.append(f"# TYPE {prefix}{name}_total counter")
+            lines.append(f"{prefix}{name}_total {v:.6g}")
+        for name, v in sorted(snap["gauges"].items()):
+            lines.append(f"# TYPE {prefix}{name} gauge")
+            lines.append(f"{prefix}{name} {float(v):.6g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def span(name: str):
+    # Records wall time as <name>_seconds; exceptions also bump <name>_errors
+    t0 = time.perf_counter()
+    try:
+        yield
+    except GeneratorExit:
+        raise  # a consumer stopping early is not a failure
+    except BaseException:
+        REGISTRY.inc(f"{name}_errors")
+        raise
+    finally:
+        REGISTRY.observe(f"{name}_seconds", time.perf_counter() - t0)
+
+
+def timed(name: str):
+    """Decorator form of ``span``. For generators it also records time to first item."""
+
+    def decorate(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                t0 = time.perf_counter()
+                with span(name):
+                    result = yield from _first_item_timer(fn(*args, **kwargs), name, t0)
+                return result
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def _first_item_timer(gen, name: str, t0: float):
+    first = True
+    try:
+        while True:
+            try:
+                item = next(gen)
+            except StopIteration as stop:
+                return stop.value
+            if first:
+                REGISTRY.observe(f"{name}_first_item_seconds", time.perf_counter() - t0)
+                first = False
+            yield item
+    finally:
+        gen.close()  # release the wrapped generator's resources (e.g. HTTP streams) promptly
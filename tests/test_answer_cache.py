@@ -0,0 +1,30 @@
+from nlp.answer_cache import AnswerCache, normalize_question
+
+
+def test_normalize_question():
+    assert normalize_question("Um, what is a NOUN?") == normalize_question("what is a noun")
+
+
+def test_answer_cache_tiers(tmp_path):
+    path = str(tmp_path / "answers.sqlite3")
+    cache = AnswerCache(path, memory_entries=1)
+    assert cache.get("k1") is None
+    cache.put("k1", "A noun names a thing.")
+    cache.put("k2", "Blue light scatters.")
+    # k1 was pushed out of memory but is still on disk
+    assert cache.get("k1") == "A noun names a thing."
+    assert cache.get("k1") == "A noun names a thing."
+    assert cache.stats()["hits_disk"] == 1
+    assert cache.stats()["hits_memory"] == 1
+    assert AnswerCache(path).get("k2") == "Blue light scatters."
+
+
+def test_memory_hits_keep_entries_from_eviction(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"), max_entries=2)
+    cache.put("popular", "Plants make food from light.")
+    cache.put("old", "Four sides.")
+    assert cache.get("popular") == "Plants make food from light."  # served from memory
+    for _ in range(48):  # the 50th put runs eviction
+        cache.put("new", "Blue light scatters.")
+    disk = AnswerCache(str(tmp_path / "answers.sqlite3"), memory_entries=0)
+    assert disk.get("popular") is not None and disk.get("old") is None
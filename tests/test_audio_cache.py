@@ -0,0 +1,20 @@
+from config.settings import Settings
+from tts.audio_cache import AudioCache, audio_key
+
+
+def test_audio_key_depends_on_voice_settings():
+    s = Settings()
+    k1 = audio_key("Hello!", s)
+    s.VOICE_RATE += 10
+    assert audio_key("Hello!", s) != k1
+
+
+def test_audio_cache_memory_and_disk_eviction(tmp_path):
+    cache = AudioCache(str(tmp_path), memory_bytes=1500, disk_bytes=2500)
+    for i in range(4):
+        cache.put(f"k{i}", bytes([i]) * 1000)
+    # memory keeps one clip, disk stays under its byte budget
+    assert cache.get("k3") == bytes([3]) * 1000
+    assert cache.stats()["hits_memory"] == 1
+    assert len(list(tmp_path.glob("*.wav"))) == 2
+    assert cache.get("k0") is None
@@ -0,0 +1,34 @@
+import numpy as np
+from bench.clips import synth_speech, synthetic_clips
+from bench.results import Result, compare, measure_overhead
+
+
+def test_synthetic_clips_are_deterministic():
+    assert np.array_equal(synth_speech(1.0, 16000, seed=3), synth_speech(1.0, 16000, seed=3))
+    a = synthetic_clips(durations=(1,), sample_rates=(8000,), channels=(2,))
+    b = synthetic_clips(durations=(1,), sample_rates=(8000,), channels=(2,))
+    assert a[0].wav_bytes == b[0].wav_bytes
+
+
+def test_compare_flags_slowdowns_in_either_direction():
+    baseline = [Result("lat", 10.0, "ms"), Result("tput", 100.0, "x", "higher"), Result("gone", 1.0, "ms")]
+    current = [Result("lat", 12.0, "ms"), Result("tput", 110.0, "x", "higher"), Result("new", 1.0, "ms")]
+    rows = {cur.name: (change, regressed) for cur, _, change, regressed in compare(current, baseline, 0.15)}
+    assert set(rows) == {"lat", "tput"}
+    assert rows["lat"][1] and abs(rows["lat"][0] + 0.2) < 1e-9
+    assert not rows["tput"][1] and rows["tput"][0] > 0
+
+
+def test_measure_overhead_pairs_the_calls():
+    import time
+    overhead = measure_overhead(lambda: None, lambda: time.sleep(0.002), repeat=5)
+    assert 0.0015 < overhead < 0.05
+
+
+def test_startup_import_times():
+    from bench.startup import by_package, import_times
+
+    times, error = import_times("json")
+    assert not error and times["json"][1] >= times["json"][0] > 0
+    assert by_package(times)[0][1] > 0
+    assert import_times("no_such_module_xyz")[1].startswith("ModuleNotFoundError")
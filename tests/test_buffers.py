@@ -0,0 +1,24 @@
+import numpy as np
+from stt.buffers import GrowableBuffer, RingBuffer
+
+
+def test_ring_buffer_windows_are_contiguous_views():
+    ring = RingBuffer(5, np.int16)
+    mark = 0
+    ring.append(np.arange(3, dtype=np.int16))
+    new, mark = ring.since(mark)
+    assert new.tolist() == [0, 1, 2]
+    ring.append(np.arange(3, 7, dtype=np.int16))
+    assert ring.latest().tolist() == [2, 3, 4, 5, 6]
+    assert ring.latest(3).base is not None  # view, not a copy
+    new, mark = ring.since(mark)
+    assert new.tolist() == [3, 4, 5, 6]
+
+
+def test_growable_buffer_keeps_whole_recording():
+    buf = GrowableBuffer(np.int16, initial_capacity=4)
+    for i in range(5):
+        buf.append(np.full(3, i, dtype=np.int16))
+    assert len(buf) == 15
+    assert buf.view(12).tolist() == [4, 4, 4]
+    assert buf.view().sum() == 3 * sum(range(5))
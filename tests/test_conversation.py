@@ -0,0 +1,40 @@
+from bench.stub_server import StubConfig, StubLLMServer
+from config.settings import Settings
+from nlp.answer_cache import answer_key, get_answer_cache
+from nlp.conversation import ConversationMemory, estimate_tokens, is_standalone
+from nlp.mistral_service import LLMService
+
+
+def test_memory_stays_within_budget_and_keeps_system_prefix():
+    mem = ConversationMemory(max_tokens=120, recent_turns=2, summary_tokens=40)
+    sizes = []
+    for i in range(30):
+        mem.add_turn(f"Question number {i} about plants?", f"Answer {i}. Plants use light to make food.")
+        msgs = mem.messages("SYSTEM", "next")
+        sizes.append(sum(estimate_tokens(m["content"]) for m in msgs))
+        assert msgs[0] == {"role": "system", "content": "SYSTEM"}
+    assert len(mem.turns) == 2 and mem.turns[-1][0] == "Question number 29 about plants?"
+    assert "Question number 27" in mem.summary and "Question number 0 " not in mem.summary
+    assert max(sizes) <= 120 + estimate_tokens("SYSTEM next") + 10
+    assert sizes[-1] == sizes[-5]
+
+
+def test_follow_ups_are_not_standalone():
+    assert is_standalone("Why do plants need sunlight?")
+    assert not is_standalone("Why is it green?")
+    assert not is_standalone("yes")
+    assert not is_standalone("what about verbs")
+
+
+def test_replies_with_history_stay_out_of_the_shared_cache(tmp_path):
+    with StubLLMServer(StubConfig(reply="Plants make food from light.")) as stub:
+        s = Settings(LLM_PROVIDER="MISTRAL_API", MISTRAL_API_KEY="k", MISTRAL_API_BASE=stub.url,
+                     FAQ_ENABLED=False, ANSWER_CACHE_PATH=str(tmp_path / "answers.sqlite3"))
+        mem = ConversationMemory(max_tokens=500)
+        mem.add_turn("My name is Ana.", "Hi Ana!")
+        LLMService(s, strict_api=True, memory=mem).generate("Why do plants need sunlight?")
+        cache = get_answer_cache(s)
+        key = answer_key("Why do plants need sunlight?", s, LLMService(s)._system_prompt())
+        assert cache.get(key) is None
+        LLMService(s, strict_api=True, memory=ConversationMemory(max_tokens=500)).generate("Why do plants need sunlight?")
+        assert cache.get(key) == "Plants make food from light."
@@ -0,0 +1,49 @@
+import nlp.faq_index as faq_index
+from config.settings import Settings
+from nlp.faq_index import FAQIndex, faq_answer
+from nlp.mistral_service import LLMService
+
+PAIRS = [
+    ("What is a noun?", "A noun names a thing."),
+    ("Why do plants need sunlight?", "Plants make food from light."),
+    ("How many sides does a square have?", "Four."),
+]
+
+
+def test_faq_index_ranks_and_thresholds(tmp_path):
+    index = FAQIndex(PAIRS)
+    assert index.best("what's a noun", 0.8).answer == "A noun names a thing."
+    assert index.best("do plants need the sunlight", 0.8).question == "Why do plants need sunlight?"
+    assert index.best("how many legs does a spider have", 0.5) is None
+
+    path = str(tmp_path / "faq.json.gz")
+    index.save(path)
+    loaded = FAQIndex.load(path)
+    assert loaded.search("plants sunlight")[0].confidence == index.search("plants sunlight")[0].confidence
+
+
+def test_faq_rejects_near_misses():
+    s = Settings(FAQ_INDEX_PATH="")
+    for question in ["why is the sun hot", "what is not a noun", "what is the moon",
+                     "what is not an even number", "how does it make food", "why isn't the sky blue"]:
+        assert faq_answer(s, question, s.FAQ_FALLBACK_CONFIDENCE) is None, question
+    assert faq_answer(s, "how do plants grow", s.FAQ_MIN_CONFIDENCE) is None
+    assert faq_answer(s, "what is a noun", s.FAQ_MIN_CONFIDENCE) is not None
+
+
+def test_faq_loads_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(faq_index, "_indexes", {})
+    monkeypatch.chdir(tmp_path)
+    s = Settings(FAQ_INDEX_PATH="")
+    assert faq_answer(s, "what is photosynthesis", s.FAQ_MIN_CONFIDENCE) is not None
+
+
+def test_faq_is_skipped_for_other_languages():
+    s = Settings(FAQ_INDEX_PATH="", LANGUAGE="es")
+    assert faq_answer(s, "what is a noun", s.FAQ_MIN_CONFIDENCE) is None
+
+
+def test_generate_answers_from_faq_before_provider():
+    s = Settings(LLM_PROVIDER="MISTRAL_API", MISTRAL_API_KEY="k", MISTRAL_API_BASE="http://127.0.0.1:9",
+                 ANSWER_CACHE_ENABLED=False, FAQ_INDEX_PATH="")
+    assert "noun" in LLMService(s, strict_api=True).generate("What is a noun").lower()
@@ -0,0 +1,40 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import Settings
+from nlp.http_client import get_session, http_post
+
+
+class _Flaky(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        _Flaky.calls += 1
+        status = 503 if _Flaky.calls == 1 else 200
+        body = json.dumps({"ok": status == 200}).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "lb=node-1; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pooled_session_reused_and_retries_5xx():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Flaky)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        s = Settings()
+        s.HTTP_BACKOFF_SEC = 0.0
+        url = f"http://127.0.0.1:{srv.server_port}/api/generate"
+        assert get_session(url, s) is get_session(url.replace("generate", "other"), s)
+        r = http_post(s, url, json={"q": 1})
+        assert r.ok and r.json()["ok"]
+        assert _Flaky.calls == 2
+        assert len(get_session(url, s).cookies) == 0
+    finally:
+        srv.shutdown()
@@ -0,0 +1,19 @@
+from config.settings import Settings
+from nlp.mistral_service import LLMService
+from nlp.sentences import iter_sentences
+
+
+def test_sentences_from_deltas():
+    deltas = ["A noun names a per", "son, place, or thing. Yes! ", "Can you", " give one?"]
+    assert list(iter_sentences(deltas)) == [
+        "A noun names a person, place, or thing.",
+        "Yes! Can you give one?",
+    ]
+
+
+def test_generate_stream_fallback():
+    s = Settings()
+    s.LLM_PROVIDER = "FALLBACK"
+    sentences = list(LLMService(s).generate_stream("What is a noun?"))
+    assert len(sentences) >= 2
+    assert "noun" in sentences[0].lower()
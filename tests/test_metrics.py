@@ -0,0 +1,40 @@
+from telemetry.metrics import MetricsRegistry, REGISTRY, timed
+
+
+def test_histogram_quantiles_and_exports():
+    reg = MetricsRegistry(window=100)
+    for i in range(1, 101):
+        reg.observe("stage_seconds", i / 1000)
+    reg.inc("stage_errors")
+    reg.register_collector(lambda: {"cache_hit_rate": 0.5})
+    snap = reg.snapshot()
+    h = snap["histograms"]["stage_seconds"]
+    assert h["count"] == 100
+    assert abs(h["p50"] - 0.0505) < 1e-6
+    assert h["p99"] > h["p95"] > h["p50"]
+    prom = reg.to_prometheus(prefix="t_")
+    assert 't_stage_seconds{quantile="0.95"}' in prom
+    assert "t_stage_errors_total 1" in prom
+    assert "t_cache_hit_rate 0.5" in prom
+
+
+def test_timed_generator_records_first_item_and_closes_inner():
+    closed = []
+
+    @timed("test_gen")
+    def gen():
+        try:
+            yield "a"
+            yield "b"
+            return True
+        finally:
+            closed.append(True)
+
+    g = gen()
+    assert next(g) == "a"
+    g.close()
+    assert closed == [True]
+    hists = REGISTRY.snapshot()["histograms"]
+    assert hists["test_gen_first_item_seconds"]["count"] >= 1
+    assert hists["test_gen_seconds"]["count"] >= 1
+    assert "test_gen_errors" not in REGISTRY.snapshot()["counters"]
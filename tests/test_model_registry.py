@@ -0,0 +1,16 @@
+from stt.model_registry import ModelRegistry
+
+
+def test_registry_shares_and_evicts():
+    loads = []
+
+    def loader(key):
+        loads.append(key)
+        return object()
+
+    reg = ModelRegistry(loader, max_models=1)
+    a = reg.get(("base", "int8", "cpu", 0))
+    assert reg.get(("base", "int8", "cpu", 0)) is a
+    reg.get(("tiny", "int8", "cpu", 0))
+    assert not reg.is_loaded(("base", "int8", "cpu", 0))
+    assert len(loads) == 2
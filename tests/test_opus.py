@@ -0,0 +1,35 @@
+import io
+import wave
+
+import av
+import numpy as np
+
+from config.settings import Settings
+from tts.opus import encode_for_playback
+
+
+def _wav(seconds=2.0, sr=22050):
+    t = np.arange(int(sr * seconds)) / sr
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes((np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+def test_opus_is_smaller_and_keeps_duration():
+    wav = _wav()
+    data, mime = encode_for_playback(wav, Settings(AUDIO_FORMAT="opus", AUDIO_OPUS_BITRATE=24000))
+    assert mime == "audio/ogg" and data[:4] == b"OggS" and len(data) < len(wav) / 5
+    with av.open(io.BytesIO(data)) as c:
+        stream = c.streams.audio[0]
+        samples = sum(f.samples for f in c.decode(stream))
+    assert abs(samples / stream.rate - 2.0) < 0.05
+
+
+def test_wav_fallback():
+    wav = _wav(0.5)
+    assert encode_for_playback(wav, Settings(AUDIO_FORMAT="wav")) == (wav, "audio/wav")
+    assert encode_for_playback(b"not a wav", Settings(AUDIO_FORMAT="opus")) == (b"not a wav", "audio/wav")
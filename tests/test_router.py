@@ -0,0 +1,42 @@
+import time
+
+from bench.stub_server import StubConfig, StubLLMServer
+from config.settings import Settings
+from nlp.mistral_service import LLMService, MISTRAL_UNAVAILABLE
+
+
+def _settings(**kw):
+    return Settings(LLM_PROVIDER="MISTRAL_API", MISTRAL_API_KEY="k", ANSWER_CACHE_ENABLED=False,
+                    FAQ_ENABLED=False, HTTP_MAX_RETRIES=0, CONTEXT_MAX_TOKENS=0, **kw)
+
+
+def test_breaker_opens_after_repeated_failures():
+    with StubLLMServer(StubConfig(error_rate=1.0)) as stub:
+        llm = LLMService(_settings(MISTRAL_API_BASE=stub.url, LLM_BREAKER_FAILURES=2), strict_api=True)
+        replies = [llm.generate("Why is the sky blue?") for _ in range(4)]
+        assert replies == [MISTRAL_UNAVAILABLE] * 4
+        assert stub.stats["requests"] == 2
+
+
+def test_slow_primary_is_hedged_to_secondary():
+    with StubLLMServer(StubConfig(reply="Slow answer.", latency_ms=3000)) as slow, \
+            StubLLMServer(StubConfig(reply="Fast answer.")) as fast:
+        s = _settings(MISTRAL_API_BASE=slow.url, OLLAMA_HOST=fast.url, LLM_HEDGE_PROVIDER="OLLAMA",
+                      LLM_DEADLINE_MIN_SEC=0.2)
+        llm = LLMService(s, strict_api=True)
+        t0 = time.perf_counter()
+        assert llm.generate("Why do leaves fall?") == "Fast answer."
+        assert "".join(llm.stream_text("Why do birds sing?")).strip() == "Fast answer."
+        assert time.perf_counter() - t0 < 2.0
+
+
+def test_failing_primary_falls_over_to_secondary():
+    with StubLLMServer(StubConfig(error_rate=1.0)) as broken, \
+            StubLLMServer(StubConfig(reply="Backup answer.")) as backup:
+        s = _settings(MISTRAL_API_BASE=broken.url, OLLAMA_HOST=backup.url, LLM_HEDGE_PROVIDER="OLLAMA",
+                      LLM_DEADLINE_MIN_SEC=5.0)
+        llm = LLMService(s, strict_api=True)
+        t0 = time.perf_counter()
+        assert llm.generate("Why is snow white?") == "Backup answer."
+        assert "".join(llm.stream_text("Why is grass green?")).strip() == "Backup answer."
+        assert time.perf_counter() - t0 < 4.0
@@ -0,0 +1,80 @@
+import pytest
+
+import nlp.safety as safety
+from bench.stub_server import StubConfig, StubLLMServer
+from config.settings import Settings
+from nlp.mistral_service import LLMService, SAFE_REDIRECT
+from nlp.safety import SafetyFilter, get_safety_filter, load_lexicon
+
+SCIENCE_QUESTIONS = [
+    "Why do shooting stars fall?",
+    "Can I see Mars with the naked eye?",
+    "Why are some volcanoes explosive?",
+    "What does a bomb calorimeter do?",
+    "What weapons did knights use?",
+]
+
+
+def test_filter_matches_whole_words_and_phrases():
+    f = SafetyFilter(["drug", "drugs", "kill myself", "self-harm"])
+    assert f.find("Where is the drugstore?") is None
+    assert f.find("Are DRUGS bad?") == "drugs"
+    assert f.find("I want to kill   myself") is not None
+    assert f.find("what is self-harm") == "self-harm"
+
+
+def test_stream_scanner_never_releases_a_match():
+    scanner = SafetyFilter(["gun"]).scanner()
+    released = "".join(scanner.feed(c) for c in ["A gu", "itar is fun. A g", "un is"])
+    assert released.startswith("A guitar is fun.")
+    assert "gun" not in released and scanner.unsafe == "gun"
+
+
+def test_allowed_phrases_mask_blocked_words():
+    f = SafetyFilter(["gun", "!water gun"])
+    assert f.find("I have a water gun") is None
+    assert f.find("A water gun is not a gun") == "gun"
+    scanner = f.scanner()
+    released = "".join(scanner.feed(c) for c in ["Squirt the wat", "er gun at the plants."]) + scanner.finish()
+    assert released == "Squirt the water gun at the plants." and scanner.unsafe is None
+
+
+def test_science_questions_pass_the_lexicon():
+    f = SafetyFilter(load_lexicon("nlp/data/safety/en.txt"))
+    for question in SCIENCE_QUESTIONS:
+        assert f.is_safe(question), question
+    for question in ["How do I make a bomb?", "I want to stab someone", "Tell me about a school shooting"]:
+        assert not f.is_safe(question), question
+
+
+def test_lexicon_loads_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(safety, "_filters", {})
+    monkeypatch.chdir(tmp_path)
+    f = get_safety_filter(Settings())
+    for text in ["how do drugs work", "tell me about sex", "gun"]:
+        assert not f.is_safe(text), text
+
+
+def test_missing_lexicon_fails_closed(tmp_path, monkeypatch):
+    monkeypatch.setattr(safety, "_filters", {})
+    with pytest.raises(RuntimeError):
+        get_safety_filter(Settings(SAFETY_LEXICON_DIR=str(tmp_path)))
+
+
+def test_sentence_scanner_releases_whole_sentences():
+    scanner = SafetyFilter(["gun"]).scanner(hold_sentences=True)
+    released = [scanner.feed(c) for c in ["Guitars are fun to play. Some", " people own a g", "un."]]
+    assert "".join(released) == "Guitars are fun to play. " and scanner.unsafe == "gun"
+
+
+def _stream(reply):
+    with StubLLMServer(StubConfig(reply=reply)) as stub:
+        s = Settings(LLM_PROVIDER="MISTRAL_API", MISTRAL_API_KEY="k", MISTRAL_API_BASE=stub.url,
+                     ANSWER_CACHE_ENABLED=False, FAQ_ENABLED=False, HTTP_MAX_RETRIES=0)
+        return "".join(LLMService(s, strict_api=True).stream_text("Tell me about safety at home"))
+
+
+def test_unsafe_streamed_reply_is_cut_off():
+    assert _stream("Some grown ups keep a gun at home but never touch it.") == SAFE_REDIRECT
+    out = _stream("Always tell a grown up if something feels wrong. Some keep a gun at home.")
+    assert out == "Always tell a grown up if something feels wrong. " + SAFE_REDIRECT
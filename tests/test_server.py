@@ -0,0 +1,82 @@
+import asyncio
+import json
+from concurrent.futures import Future
+
+import pytest
+from tornado import httpclient, httpserver, netutil, websocket
+
+import pipeline.turn_pipeline as tp
+from bench.stub_server import StubConfig, StubLLMServer
+from config.settings import Settings
+from server.app import Stage, StageBusy, make_app
+
+REPLY = "Plants make food from light. That helps them grow."
+
+
+class FakeTTS:
+    def __init__(self, settings):
+        pass
+
+    def synthesize_async(self, text):
+        f = Future()
+        f.set_result(b"wav:" + text.encode())
+        return f
+
+
+def test_stage_turns_callers_away_past_the_queue():
+    async def run():
+        stage = Stage("x", limit=1, max_queue=0)
+        async with stage:
+            with pytest.raises(StageBusy):
+                async with stage:
+                    pass
+    asyncio.run(run())
+
+
+def test_turn_stage_fits_the_pipeline_workers():
+    voice = make_app(Settings(TURN_WORKERS=4, SERVER_LLM_CONCURRENCY=16)).voice
+    assert voice.stages["turn"].limit == 4
+    assert voice.executor_threads > sum(s.limit for s in voice.stages.values())
+
+
+async def _exercise(settings: Settings):
+    sockets = netutil.bind_sockets(0, "127.0.0.1")
+    base = f"127.0.0.1:{sockets[0].getsockname()[1]}"
+    server = httpserver.HTTPServer(make_app(settings))
+    server.add_sockets(sockets)
+    client = httpclient.AsyncHTTPClient()
+    try:
+        r = await client.fetch(f"http://{base}/v1/chat", method="POST", body=json.dumps({"text": "Why do plants grow?"}))
+        assert json.loads(r.body)["text"] == REPLY
+
+        r = await client.fetch(f"http://{base}/v1/chat", method="POST",
+                               body=json.dumps({"text": "Why do plants grow?", "stream": True}))
+        lines = [json.loads(line) for line in r.body.decode().splitlines()]
+        assert len(lines) > 2 and lines[-1] == {"done": True, "text": REPLY}
+
+        r = await client.fetch(f"http://{base}/v1/stt?format=pcm16", method="POST", body=b"\x00\x01\x02",
+                               raise_error=False)
+        assert r.code == 400
+
+        ws = await websocket.websocket_connect(f"ws://{base}/v1/turn")
+        await ws.write_message(json.dumps({"type": "text", "text": "Why do plants grow?"}))
+        kinds, clips = [], []
+        while not kinds or kinds[-1] not in ("done", "error"):
+            msg = await ws.read_message()
+            if isinstance(msg, bytes):
+                clips.append(msg)
+            else:
+                kinds.append(json.loads(msg)["type"])
+        ws.close()
+        assert kinds[0] == "transcript" and kinds[-1] == "done"
+        assert len(clips) == kinds.count("audio") == kinds.count("sentence") == 2
+    finally:
+        server.stop()
+
+
+def test_chat_and_turn_socket(monkeypatch):
+    monkeypatch.setattr(tp, "TTSService", FakeTTS)
+    with StubLLMServer(StubConfig(reply=REPLY)) as stub:
+        s = Settings(LLM_PROVIDER="MISTRAL_API", MISTRAL_API_KEY="k", MISTRAL_API_BASE=stub.url,
+                     ANSWER_CACHE_ENABLED=False, FAQ_ENABLED=False, AUDIO_FORMAT="wav")
+        asyncio.run(_exercise(s))
@@ -0,0 +1,43 @@
+from concurrent.futures import Future
+
+import numpy as np
+
+from stt.speculative import SpeculativeTranscriber
+from stt.vad import VoiceActivityDetector
+
+
+def _voiced(sr, seconds):
+    t = np.arange(int(sr * seconds)) / sr
+    sig = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate([150, 300, 450, 600, 750, 900, 1200]))
+    return (sig / np.abs(sig).max() * 12000).astype(np.int16)
+
+
+class FakeSTT:
+    def __init__(self):
+        self.decoded = []
+
+    def transcribe_async(self, mono_16k, language="en", partial=False):
+        self.decoded.append((len(mono_16k), partial))
+        fut = Future()
+        fut.set_result(f"part{len(self.decoded)}")
+        return fut
+
+
+def test_finished_segments_are_decoded_while_recording():
+    sr = 16000
+    pause = np.zeros(int(sr * 0.8), np.int16)
+    pcm = np.concatenate([_voiced(sr, 1.0), pause] * 3 + [_voiced(sr, 1.0)])
+    vad = VoiceActivityDetector(sr, aggressiveness=1)
+    stt = FakeSTT()
+    spec = SpeculativeTranscriber(stt, pause_ms=500, padding_ms=100)
+    for i in range(0, len(pcm), 960):
+        vad.process(pcm[i:i + 960].tobytes())
+        spec.update(pcm[:i + 960].astype(np.float32) / 32768, vad)
+
+    assert spec.segments == 3 and all(partial for _, partial in stt.decoded)
+    assert spec.ready_text() == "part1 part2 part3"
+    text = spec.finish(pcm.astype(np.float32) / 32768, vad)
+    assert text == "part1 part2 part3 part4"
+    # the final step only decodes the last segment, not the whole recording
+    samples, partial = stt.decoded[-1]
+    assert not partial and samples < 1.5 * sr
@@ -0,0 +1,39 @@
+import numpy as np
+from stt.streaming import IncrementalTranscriber
+
+
+class FakeSTT:
+    def __init__(self, hyps):
+        self.hyps = list(hyps)
+        self.decoded = []
+
+    def transcribe_words(self, mono_16k, language="en", initial_prompt=None, partial=False):
+        self.decoded.append(len(mono_16k))
+        return self.hyps.pop(0)
+
+
+def test_incremental_commits_agreed_prefix():
+    stt = FakeSTT([
+        [(0.0, 0.4, " What"), (0.4, 0.6, " is")],
+        [(0.0, 0.4, " What"), (0.4, 0.6, " is"), (0.6, 0.9, " a")],
+        [(0.0, 0.3, " a"), (0.3, 0.8, " noun?")],
+    ])
+    tr = IncrementalTranscriber(stt)
+    tr.feed(np.zeros(16000, dtype=np.float32))
+    tr.step()
+    assert tr.committed_text == ""
+    tr.feed(np.zeros(16000, dtype=np.float32))
+    assert tr.step() == "What is a"
+    assert tr.committed_text == "What is"
+    assert tr.finalize() == "What is a noun?"
+    # committed audio is dropped, so only the tail is decoded again
+    assert stt.decoded[-1] == 32000 - int(0.6 * 16000)
+
+
+def test_forced_progress_keeps_words_straddling_the_cut():
+    # 6 s of tail with max_tail_sec=4: the cut is at 4 s, inside the long word
+    stt = FakeSTT([[(0.5, 5.0, " Hellooooo"), (5.2, 5.8, " friend")]])
+    tr = IncrementalTranscriber(stt, max_tail_sec=4.0)
+    tr.feed(np.zeros(6 * 16000, dtype=np.float32))
+    assert tr.step() == "Hellooooo friend"
+    assert tr.committed_text == "Hellooooo"
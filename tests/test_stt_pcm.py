@@ -0,0 +1,17 @@
+import numpy as np
+from stt.utils import pcm_to_mono_16k
+
+
+def test_pcm_to_mono_16k_from_int16_48k():
+    sr = 48000
+    t = np.arange(sr) / sr
+    pcm = (0.5 * 32767 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    mono = pcm_to_mono_16k(pcm, sr)
+    assert mono.dtype == np.float32
+    assert len(mono) == 16000
+    assert 0.45 < np.abs(mono).max() < 0.55
+
+
+def test_pcm_to_mono_16k_float_passthrough_is_zero_copy():
+    audio = np.zeros(1600, dtype=np.float32)
+    assert pcm_to_mono_16k(audio, 16000) is audio
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+from stt.process_pool import STTProcessPool
+
+
+class _Seg:
+    def __init__(self, text):
+        self.text = text
+        self.words = []
+
+
+class _FakeModel:
+    def transcribe(self, audio, **kwargs):
+        if audio.size and audio[0] < 0:
+            os._exit(1)  # a worker killed mid-decode
+        # echo what the worker saw through shared memory
+        return [_Seg(f"{audio.size}:{audio[:3].tolist()}")], None
+
+
+def _fake_loader(key):
+    return _FakeModel()
+
+
+def _failing_loader(key):
+    raise OSError(f"model {key[0]} not found")
+
+
+def test_process_pool_decodes_from_shared_memory():
+    pool = STTProcessPool(("tiny", "int8", "cpu", 0), workers=2, threads_per_worker=1, loader=_fake_loader)
+    try:
+        audio = np.array([0.5, -0.25, 0.125, 0.0], dtype=np.float32)
+        futures = [pool.submit(audio * (i + 1), "en") for i in range(3)]
+        results = [f.result(timeout=60) for f in futures]
+        assert results[0] == "4:[0.5, -0.25, 0.125]"
+        assert results[2] == "4:[1.5, -0.75, 0.375]"
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_reports_the_model_load_error():
+    pool = STTProcessPool(("tiny", "int8", "cpu", 0), workers=1, threads_per_worker=1, loader=_failing_loader)
+    try:
+        with pytest.raises(RuntimeError, match="OSError: model tiny not found"):
+            pool.submit(np.zeros(4, dtype=np.float32), "en").result(timeout=60)
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_recovers_from_a_dead_worker():
+    pool = STTProcessPool(("tiny", "int8", "cpu", 0), workers=1, threads_per_worker=1, loader=_fake_loader)
+    try:
+        with pytest.raises(Exception):
+            pool.submit(np.full(4, -1.0, dtype=np.float32), "en").result(timeout=60)
+        assert pool.submit(np.full(4, 0.5, dtype=np.float32), "en").result(timeout=60) == "4:[0.5, 0.5, 0.5]"
+    finally:
+        pool.shutdown()
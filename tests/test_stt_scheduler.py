@@ -0,0 +1,89 @@
+import numpy as np
+from stt.scheduler import PRIORITY_PARTIAL, STTScheduler, decode_text_batch
+
+
+def test_scheduler_batches_by_language_and_serves_finals_first():
+    calls = []
+
+    def batch_fn(model, audios, language):
+        calls.append(("batch", language, len(audios)))
+        return [f"{language}{a.size}" for a in audios]
+
+    def text_fn(model, audio, language):
+        calls.append(("text", language))
+        return f"{language}{audio.size}"
+
+    def words_fn(model, audio, language, prompt):
+        calls.append(("words", language))
+        return [(0.0, 0.5, " hi")]
+
+    sched = STTScheduler(lambda: object(), max_batch=8, window_ms=200,
+                         batch_fn=batch_fn, text_fn=text_fn, words_fn=words_fn)
+    clip = lambda n: np.zeros(n, dtype=np.float32)
+    partial = sched.submit(clip(5), "en", PRIORITY_PARTIAL, words=True)
+    a = sched.submit(clip(1), "en")
+    b = sched.submit(clip(2), "en")
+    c = sched.submit(clip(3), "de")
+    d = sched.submit(clip(4), "en")
+
+    assert [f.result(timeout=5) for f in (a, b, c, d)] == ["en1", "en2", "de3", "en4"]
+    assert partial.result(timeout=5) == [(0.0, 0.5, " hi")]
+    assert calls == [("batch", "en", 3), ("text", "de"), ("words", "en")]
+
+
+class _Result:
+    def __init__(self, tokens, score, no_speech_prob):
+        self.sequences_ids, self.scores, self.no_speech_prob = [tokens], [score], no_speech_prob
+
+
+class _Seg:
+    text = " slow path"
+
+
+class _FakeWhisper:
+    max_length = 448
+
+    def __init__(self, results):
+        self.results = results
+        self.feature_extractor = self
+        self.nb_max_frames = 10
+        self.model = self
+        self.is_multilingual = True
+        self.hf_tokenizer = None
+
+    def __call__(self, audio):
+        return np.zeros((80, 10), dtype=np.float32)
+
+    def encode(self, features):
+        return features
+
+    def get_prompt(self, tokenizer, previous, without_timestamps):
+        return [0]
+
+    def generate(self, encoder_output, prompts, **kwargs):
+        assert kwargs["return_scores"]
+        return self.results
+
+    def transcribe(self, audio, **kwargs):
+        return [_Seg()], None
+
+
+class _FakeTokenizer:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def decode(self, tokens):
+        return " ".join(["hello"] * len(tokens)) if tokens[0] == 0 else f"word{len(tokens)}"
+
+
+def test_batch_decode_applies_transcribe_rules(monkeypatch):
+    import faster_whisper.tokenizer
+    monkeypatch.setattr(faster_whisper.tokenizer, "Tokenizer", _FakeTokenizer)
+    model = _FakeWhisper([
+        _Result([1, 2, 3], -2.0, 0.9),   # silence: no-speech and a low log-prob
+        _Result([1, 2, 3], -0.3, 0.7),   # quiet speech: confident text is kept
+        _Result([1, 2, 3], -1.5, 0.1),   # low log-prob: transcribe would fall back
+        _Result([0] * 60, -0.2, 0.1),    # repetition loop
+    ])
+    audios = [np.zeros(16000, dtype=np.float32)] * 4
+    assert decode_text_batch(model, audios, "en") == ["", "word3", "slow path", "slow path"]
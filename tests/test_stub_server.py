@@ -0,0 +1,23 @@
+from config.settings import Settings
+from bench.stub_server import StubConfig, StubLLMServer
+from nlp.mistral_service import LLMService, MISTRAL_UNAVAILABLE
+
+
+def _settings(url, provider="MISTRAL_API"):
+    return Settings(LLM_PROVIDER=provider, MISTRAL_API_KEY="k", MISTRAL_API_BASE=url, OLLAMA_HOST=url,
+                    ANSWER_CACHE_ENABLED=False, FAQ_ENABLED=False, HTTP_MAX_RETRIES=0)
+
+
+def test_stub_streams_both_providers():
+    with StubLLMServer(StubConfig(reply="one two three", tokens_per_sec=500)) as stub:
+        for provider in ("MISTRAL_API", "OLLAMA"):
+            llm = LLMService(_settings(stub.url, provider), strict_api=True)
+            assert "".join(llm.stream_text("What is rain?")).strip() == "one two three"
+            assert llm.generate("What is rain?") == "one two three"
+
+
+def test_stub_injects_errors():
+    with StubLLMServer(StubConfig(error_rate=1.0)) as stub:
+        llm = LLMService(_settings(stub.url), strict_api=True)
+        assert llm.generate("What is rain?") == MISTRAL_UNAVAILABLE
+        assert stub.stats["errors"] == 1
@@ -0,0 +1,30 @@
+import io
+import wave
+
+import numpy as np
+
+from config.settings import Settings
+from tts.tts_service import TTSService
+from tts.worker_pool import TTSWorkerPool
+
+
+def _fake_job(text, rate, volume, voice_id=""):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(22050)
+        wf.writeframes(np.full(len(text) * 10, 1000, dtype=np.int16).tobytes())
+    return buf.getvalue()
+
+
+def test_pool_futures_and_stitching():
+    pool = TTSWorkerPool(workers=2, mode="thread", job_fn=_fake_job)
+    s = Settings()
+    sentences = ["A noun names a person or a thing.", "Can you give me one example?"]
+    clips = [f.result(timeout=5) for f in [pool.submit(t, s) for t in sentences]]
+    pool.shutdown()
+    stitched = TTSService(s)._stitch(clips)
+    with wave.open(io.BytesIO(stitched), "rb") as wf:
+        assert wf.getframerate() == 22050
+        assert wf.getnframes() == sum(len(t) * 10 for t in sentences)
@@ -0,0 +1,39 @@
+from concurrent.futures import Future
+
+import pipeline.turn_pipeline as tp
+from config.settings import Settings
+
+
+class FakeTTS:
+    def __init__(self, settings):
+        pass
+
+    def synthesize_async(self, text):
+        f = Future()
+        f.set_result(b"wav:" + text.encode())
+        return f
+
+
+def test_turn_events_in_order(monkeypatch):
+    monkeypatch.setattr(tp, "TTSService", FakeTTS)
+    s = Settings()
+    s.LLM_PROVIDER = "FALLBACK"
+    handle = tp.TurnPipeline(s, strict_api=False).start(transcribe=lambda: "What is a noun?")
+    events = list(handle.events(timeout=5))
+    kinds = [e.kind for e in events]
+    assert kinds[0] == tp.TRANSCRIPT and kinds[-1] == tp.DONE
+    audio = [e.data for e in events if e.kind == tp.AUDIO]
+    sentences = [e.data for e in events if e.kind == tp.SENTENCE]
+    assert [a[0] for a in audio] == sentences
+    assert "noun" in events[-1].data.lower()
+
+
+def test_new_turn_cancels_previous(monkeypatch):
+    monkeypatch.setattr(tp, "TTSService", FakeTTS)
+    s = Settings()
+    s.LLM_PROVIDER = "FALLBACK"
+    pipe = tp.TurnPipeline(s, strict_api=False)
+    first = pipe.start(user_text="What is a verb?")
+    second = pipe.start(user_text="What is a noun?")
+    assert first.cancelled
+    assert [e.kind for e in second.events(timeout=5)][-1] == tp.DONE
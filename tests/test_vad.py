@@ -0,0 +1,22 @@
+import numpy as np
+from stt.vad import VoiceActivityDetector, extract_speech
+
+
+def _voiced(sr, seconds):
+    t = np.arange(int(sr * seconds)) / sr
+    sig = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate([150, 300, 450, 600, 750, 900, 1200]))
+    sig *= 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    return (sig / np.abs(sig).max() * 12000).astype(np.int16)
+
+
+def test_vad_endpoint_and_trim():
+    sr = 16000
+    pcm = np.concatenate([np.zeros(sr // 2, np.int16), _voiced(sr, 1.0), np.zeros(sr, np.int16)])
+    vad = VoiceActivityDetector(sr, aggressiveness=1, endpoint_ms=600)
+    # arrives in odd-sized chunks, like webrtc frames
+    for i in range(0, len(pcm), 1000):
+        vad.process(pcm[i:i + 1000].tobytes())
+    assert vad.has_speech
+    assert vad.end_of_utterance
+    speech = extract_speech(pcm, vad.speech_regions(padding_ms=100))
+    assert sr * 0.8 < len(speech) < len(pcm) - sr
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config.settings import Settings
+from telemetry.metrics import REGISTRY
+
+
+def audio_key(text: str, settings: Settings) -> str:
+    parts = [
+        text.strip(),
+        settings.TTS_ENGINE.upper(),
+        str(settings.VOICE_RATE),
+        f"{settings.VOICE_VOLUME:.3f}",
+        settings.VOICE_ID,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Content-addressed cache of synthesized audio: memory LRU + files on disk.
+
+    Both tiers are bounded in bytes; the disk tier evicts least recently used
+    files (by mtime, refreshed on every hit).
+    """
+
+    def __init__(self, directory: str, memory_bytes: int = 32 << 20, disk_bytes: int = 256 << 20):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_size = 0
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._disk_size = sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".wav"))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.memory_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_size -= len(old)
+        self._mem[key] = data
+        self._mem_size += len(data)
+        while self._mem_size > self.memory_bytes:
+            _, evicted = self._mem.popitem(last=False)
+            self._mem_size -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                self.hits_memory += 1
+                return data
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(key, data)
+            self.hits_disk += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._remember(key, data)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("TTS cache write error:", e)
+            return
+        with self._lock:
+            self._disk_size += len(data)
+            if self._disk_size > self.disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".wav")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        size = sum(e.stat().st_size for e in entries)
+        target = int(self.disk_bytes * 0.9)
+        for e in entries:
+            if size <= target:
+                break
+            try:
+                size -= e.stat().st_size
+                os.unlink(e.path)
+            except OSError:
+                pass
+        self._disk_size = size
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+        }
+
+
+_caches: Dict[str, AudioCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_audio_cache(settings: Settings) -> Optional[AudioCache]:
+    if not settings.TTS_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        cache = _caches.get(settings.TTS_CACHE_DIR)
+        if cache is None:
+            cache = AudioCache(
+                settings.TTS_CACHE_DIR,
+                memory_bytes=int(settings.TTS_CACHE_MEMORY_MB * (1 << 20)),
+                disk_bytes=int(settings.TTS_CACHE_DISK_MB * (1 << 20)),
+            )
+            _caches[settings.TTS_CACHE_DIR] = cache
+            REGISTRY.register_collector(
+                lambda c=cache: {f"tts_cache_{k}": v for k, v in c.stats().items()}
+            )
+        return cache
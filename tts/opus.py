@@ -0,0 +1,80 @@
+import io
+import wave
+from typing import Tuple
+
+import numpy as np
+
+from config.settings import Settings
+from telemetry.metrics import timed
+
+OPUS_RATES = (48000, 24000, 16000, 12000, 8000)
+
+
+def _opus_rate(sr: int) -> int:
+    # Opus only runs at a few rates; pick the lowest one that keeps the clip's bandwidth
+    for rate in reversed(OPUS_RATES):
+        if rate >= sr:
+            return rate
+    return OPUS_RATES[0]
+
+
+def _read_wav(wav_bytes: bytes) -> Tuple[np.ndarray, int]:
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise wave.Error("only 16-bit PCM is supported")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        if wf.getnchannels() > 1:
+            pcm = pcm.reshape(-1, wf.getnchannels()).mean(axis=1).astype(np.int16)
+        return pcm, wf.getframerate()
+
+
+@timed("tts_opus_encode")
+def wav_to_ogg_opus(wav_bytes: bytes, bitrate: int = 24000) -> bytes:
+    """Re-encodes a 16-bit WAV clip as mono Ogg/Opus, entirely in memory."""
+    import av
+
+    pcm, sr = _read_wav(wav_bytes)
+    rate = _opus_rate(sr)
+    out = io.BytesIO()
+    with av.open(out, mode="w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=rate)
+        stream.bit_rate = bitrate
+        stream.layout = "mono"
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=rate)
+        fifo = av.AudioFifo()
+
+        frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = sr
+        for resampled in resampler.resample(frame) + resampler.resample(None):
+            fifo.write(resampled)
+        # libopus takes fixed-size frames; the last one is zero-padded
+        size = stream.codec_context.frame_size or 960
+        while fifo.samples:
+            chunk = fifo.read(size) if fifo.samples >= size else _pad(fifo.read(), size, rate)
+            for packet in stream.encode(chunk):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return out.getvalue()
+
+
+def _pad(frame, size: int, rate: int):
+    import av
+
+    data = frame.to_ndarray()
+    padded = np.zeros((1, size), dtype=data.dtype)
+    padded[:, :data.shape[1]] = data
+    out = av.AudioFrame.from_ndarray(padded, format="s16", layout="mono")
+    out.sample_rate = rate
+    out.pts = frame.pts
+    return out
+
+
+def encode_for_playback(wav_bytes: bytes, settings: Settings) -> Tuple[bytes, str]:
+    """(audio bytes, mime type) to send to the browser; plain WAV when Opus is off or fails."""
+    if settings.AUDIO_FORMAT.lower() == "opus":
+        try:
+            return wav_to_ogg_opus(wav_bytes, settings.AUDIO_OPUS_BITRATE), "audio/ogg"
+        except Exception as e:
+            print("Opus encode error, sending WAV:", e)
+    return wav_bytes, "audio/wav"
@@ -1,9 +1,23 @@
 import io
-import pyttsx3
+import os
 import numpy as np
+import threading
+import time
 import wave
 import tempfile
+from concurrent.futures import Future
+from typing import Iterable, Iterator, List, Optional
 from config.settings import Settings
+from nlp.sentences import iter_sentences
+from .audio_cache import audio_key, get_audio_cache
+from .worker_pool import get_tts_pool
+from telemetry.metrics import REGISTRY, timed
+
+
+def _done_future(value) -> Future:
+    f: Future = Future()
+    f.set_result(value)
+    return f
 
 
 class TTSService:
@@ -14,19 +28,72 @@ class TTSService:
 
     def _init_pyttsx3(self):
         if self._pyttsx3 is None:
+            import pyttsx3
             engine = pyttsx3.init()
             engine.setProperty("rate", self.settings.VOICE_RATE)
             engine.setProperty("volume", self.settings.VOICE_VOLUME)
+            if self.settings.VOICE_ID:
+                engine.setProperty("voice", self.settings.VOICE_ID)
             self._pyttsx3 = engine
         return self._pyttsx3
 
 
+    @timed("tts_synthesize")
     def synthesize(self, text: str) -> bytes:
-        if self.engine_name == "PYTTSX3":
-            return self._synthesize_pyttsx3(text)
-        return self._synthesize_pyttsx3(text)
+        return self.synthesize_async(text).result()
+
+    def synthesize_async(self, text: str) -> "Future[bytes]":
+        # Long replies are split into sentences that synthesize in parallel on the worker pool
+        sentences = list(iter_sentences([text]))
+        if len(sentences) <= 1 or get_tts_pool(self.settings) is None:
+            return self._synthesize_sentence_async(text)
+        parts = [self._synthesize_sentence_async(s) for s in sentences]
+        out: Future = Future()
+
+        def _gather():
+            try:
+                clips = [p.result() for p in parts]
+                try:
+                    out.set_result(self._stitch(clips))
+                except (wave.Error, EOFError):
+                    # engine output we can't decode (e.g. AIFF): render the text in one piece
+                    out.set_result(self._synthesize_sentence_async(text).result())
+            except Exception as e:
+                out.set_exception(e)
+
+        threading.Thread(target=_gather, name="tts-gather", daemon=True).start()
+        return out
+
+    def stream(self, text: str) -> Iterator[bytes]:
+        # One clip per sentence, in order, while later sentences are still rendering
+        parts = [self._synthesize_sentence_async(s) for s in iter_sentences([text])]
+        for p in parts:
+            yield p.result()
+
+    def _synthesize_sentence_async(self, text: str) -> "Future[bytes]":
+        cache = get_audio_cache(self.settings)
+        key = audio_key(text, self.settings) if cache is not None else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached:
+                return _done_future(cached)
+
+        pool = get_tts_pool(self.settings)
+        t0 = time.perf_counter()
+        if pool is None:
+            fut = _done_future(self._synthesize_pyttsx3(text))
+        else:
+            fut = pool.submit(text, self.settings)
+        fut.add_done_callback(lambda f: REGISTRY.observe("tts_sentence_seconds", time.perf_counter() - t0))
+        if cache is not None:
+            def _store(f: Future):
+                if not f.cancelled() and f.exception() is None and f.result():
+                    cache.put(key, f.result())
+            fut.add_done_callback(_store)
+        return fut
 
     def _synthesize_pyttsx3(self, text: str) -> bytes:
+        # Inline path (TTS_WORKERS=0): blocks the caller
         engine = self._init_pyttsx3()
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tf:
             tmp_path = tf.name
@@ -38,11 +105,23 @@ class TTSService:
             return data
         finally:
             try:
-                import os
                 os.unlink(tmp_path)
             except Exception:
                 pass
 
+    def _stitch(self, clips: List[bytes]) -> bytes:
+        pieces, sr = [], None
+        for clip in clips:
+            with wave.open(io.BytesIO(clip), "rb") as wf:
+                if wf.getsampwidth() != 2 or (sr is not None and wf.getframerate() != sr):
+                    raise wave.Error("clips do not share a 16-bit format")
+                sr = wf.getframerate()
+                pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                if wf.getnchannels() > 1:
+                    pcm = pcm.reshape(-1, wf.getnchannels()).mean(axis=1)
+            pieces.append(pcm.astype(np.float32) / 32767.0)
+        return self._float32_to_wav_bytes(np.concatenate(pieces), sr)
+
     def _float32_to_wav_bytes(self, mono: np.ndarray, sr: int) -> bytes:
         mono_i16 = np.clip(mono, -1.0, 1.0)
         mono_i16 = (mono_i16 * 32767).astype(np.int16)
@@ -53,3 +132,35 @@ class TTSService:
                 wf.setframerate(sr)
                 wf.writeframes(mono_i16.tobytes())
             return buf.getvalue()
+
+
+_presynth_started = False
+_presynth_lock = threading.Lock()
+
+
+def presynthesize(settings: Settings, texts: Iterable[str]) -> int:
+    # Split exactly like the streaming reply path so cached clips line up with what gets spoken
+    if get_audio_cache(settings) is None:
+        return 0
+    tts = TTSService(settings)
+    done = 0
+    for text in texts:
+        for sentence in iter_sentences([text]):
+            try:
+                tts.synthesize(sentence)
+                done += 1
+            except Exception as e:
+                print("TTS pre-synthesis error:", e)
+    return done
+
+
+def start_presynthesis(settings: Settings) -> Optional[threading.Thread]:
+    global _presynth_started
+    from nlp.mistral_service import canned_replies
+    with _presynth_lock:
+        if _presynth_started or not settings.TTS_CACHE_ENABLED:
+            return None
+        _presynth_started = True
+    t = threading.Thread(target=presynthesize, args=(settings, canned_replies()), name="tts-presynth", daemon=True)
+    t.start()
+    return t
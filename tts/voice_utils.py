@@ -1,15 +1,19 @@
-import os
-import tempfile
-import streamlit as st
+import io
+import wave
+from typing import List
 
-def save_and_play_audio(wav_bytes: bytes, label: str = "Reply"):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-        tmp.write(wav_bytes)
-        tmp.flush()
-        path = tmp.name
-    with open(path, "rb") as f:
-        st.audio(f.read(), format="audio/wav")
-    try:
-        os.unlink(path)
-    except Exception:
-        pass
+def wav_duration(wav_bytes: bytes) -> float:
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        return wf.getnframes() / float(wf.getframerate() or 1)
+
+def concat_wavs(clips: List[bytes]) -> bytes:
+    if len(clips) == 1:
+        return clips[0]
+    out = io.BytesIO()
+    with wave.open(out, "wb") as dst:
+        for i, clip in enumerate(clips):
+            with wave.open(io.BytesIO(clip), "rb") as src:
+                if i == 0:
+                    dst.setparams(src.getparams())
+                dst.writeframes(src.readframes(src.getnframes()))
+    return out.getvalue()
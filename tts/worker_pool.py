@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from config.settings import Settings
+
+_local = threading.local()
+
+
+def _scratch_dir() -> str:
+    # tmpfs keeps the engine's output file in memory where available
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _worker_engine():
+    engine = getattr(_local, "engine", None)
+    if engine is None:
+        import pyttsx3
+        # pyttsx3.init() hands every caller in a process the same engine; each worker needs its own
+        engine = pyttsx3.Engine()
+        _local.engine = engine
+        _local.path = os.path.join(_scratch_dir(), f"tts-{os.getpid()}-{threading.get_ident()}.wav")
+    return engine
+
+
+def _init_worker():
+    try:
+        _worker_engine()
+    except Exception as e:
+        print("TTS worker init error:", e)
+
+
+def synthesize_job(text: str, rate: int, volume: float, voice_id: str = "") -> bytes:
+    engine = _worker_engine()
+    engine.setProperty("rate", rate)
+    engine.setProperty("volume", volume)
+    if voice_id:
+        engine.setProperty("voice", voice_id)
+    # pyttsx3 can only render to a file; the path is reused by this worker for every job
+    engine.save_to_file(text, _local.path)
+    engine.runAndWait()
+    with open(_local.path, "rb") as f:
+        return f.read()
+
+
+class TTSWorkerPool:
+    """Long-lived pool of pre-initialized TTS engines behind a job queue.
+
+    ``mode="process"`` gives each worker its own process (engines such as
+    espeak are not thread-safe, and some platforms want the main thread);
+    ``mode="thread"`` is lighter when the engine allows it.
+    """
+
+    def __init__(self, workers: int = 2, mode: str = "process",
+                 job_fn: Callable[..., bytes] = synthesize_job):
+        self.workers = max(1, workers)
+        self.mode = mode
+        self._job_fn = job_fn
+        if mode == "process":
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="tts-worker",
+                initializer=_init_worker if job_fn is synthesize_job else None,
+            )
+
+    def submit(self, text: str, settings: Settings) -> "Future[bytes]":
+        return self._executor.submit(
+            self._job_fn, text, settings.VOICE_RATE, settings.VOICE_VOLUME, settings.VOICE_ID
+        )
+
+    def warm_up(self):
+        # Executors start workers lazily; one no-op job per worker brings the engines up
+        if self.mode == "process":
+            for _ in range(self.workers):
+                self._executor.submit(_init_worker)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[Tuple[int, str], TTSWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_tts_pool(settings: Settings) -> Optional[TTSWorkerPool]:
+    if settings.TTS_WORKERS <= 0:
+        return None
+    key = (settings.TTS_WORKERS, settings.TTS_WORKER_MODE)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = TTSWorkerPool(settings.TTS_WORKERS, settings.TTS_WORKER_MODE)
+            pool.warm_up()
+            _pools[key] = pool
+        return pool
@@ -1,8 +1,6 @@
 import streamlit as st
 import av
-import io
 import time
-import wave
 import os
 os.environ["AIORTC_ICE_TCP"] = "1" # enable TCP ICE candidates
 os.environ["AIORTC_SDP_DSCP"] = "0" # avoid DSCP marking issues on Windows
@@ -10,25 +8,107 @@ import numpy as np
 from streamlit_webrtc import webrtc_streamer, WebRtcMode, AudioProcessorBase, RTCConfiguration
 
 from stt.stt_service import STTService
-from nlp.mistral_service import LLMService
-from tts.tts_service import TTSService
-from tts.voice_utils import save_and_play_audio
+from stt.streaming import IncrementalTranscriber
+from stt.speculative import SpeculativeTranscriber
+from stt.buffers import GrowableBuffer, RingBuffer
+from stt.resample import StreamingResampler
+from stt.utils import TARGET_SR, frame_to_mono
+from stt.vad import VoiceActivityDetector, extract_speech
+from ui.turn_view import render_turn, session_pipeline
 from config.settings import Settings
 
 
 
 RTC_CONFIG = RTCConfiguration({"iceServers": []})
-PARTIAL_WINDOW_SEC = 4.0
+PARTIAL_WINDOW_SEC = 4.0  # max uncommitted audio re-decoded per caption tick
 PARTIAL_COOLDOWN_SEC = 1.5
+PARTIAL_BUFFER_SEC = 10.0  # not-yet-captioned audio kept in the ring buffer
 
 class StreamingState:
-    def __init__(self):
-        self.frames = []
-        self.sample_rate = 48000
-        self.partial_buf = []
+    # Buffers hold 16 kHz mono float32, resampled once per frame at ingest
+    def __init__(self, settings: Settings = None):
+        self.settings = settings
+        self.sample_rate = TARGET_SR
+        self.frames = GrowableBuffer(np.float32, initial_capacity=TARGET_SR * 30)
+        self.partial_buf = RingBuffer(int(PARTIAL_BUFFER_SEC * TARGET_SR), np.float32)
+        self.partial_mark = 0
+        self.resampler = None
         self.last_partial_time = 0.0
         self.partial_text = ""
         self.has_audio = False
+        self.transcriber = None
+        self.vad = None
+        self.recording = False
+        self.speculative = None
+
+    def reset(self):
+        self.frames.clear()
+        self.partial_buf.clear()
+        self.partial_mark = 0
+        self.partial_text = ""
+        self.last_partial_time = 0.0
+        self.has_audio = False
+        self.transcriber = None
+        self.vad = None
+        self.resampler = None
+        self.speculative = None
+
+    def append(self, mono: np.ndarray, src_rate: int):
+        if self.resampler is None or self.resampler.src_rate != src_rate:
+            self.resampler = StreamingResampler(src_rate, TARGET_SR)
+        audio = self.resampler.process(mono)
+        self.frames.append(audio)
+        self.partial_buf.append(audio)
+        self.label_speech(audio)
+        self.has_audio = True
+        self.speculate()
+
+    def speculate(self):
+        # Runs on the audio thread; only queues work, decoding happens elsewhere
+        s = self.settings
+        if s is None or not s.STT_SPECULATIVE or not self.recording:
+            return
+        if self.speculative is None:
+            self.speculative = SpeculativeTranscriber(
+                STTService(s),
+                language=s.LANGUAGE,
+                pause_ms=s.STT_SEGMENT_PAUSE_MS,
+                max_segment_sec=s.STT_SEGMENT_MAX_SEC,
+                padding_ms=s.VAD_PADDING_MS,
+            )
+        self.speculative.update(self.frames.view(), self.vad)
+
+    def label_speech(self, audio: np.ndarray):
+        s = self.settings
+        if s is None or not s.VAD_ENABLED:
+            return
+        if self.vad is None:
+            self.vad = VoiceActivityDetector(
+                TARGET_SR,
+                aggressiveness=s.VAD_AGGRESSIVENESS,
+                frame_ms=s.VAD_FRAME_MS,
+                endpoint_ms=s.VAD_ENDPOINT_MS,
+            )
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        self.vad.process(pcm.tobytes())
+
+    def drain_partial(self) -> np.ndarray:
+        # Zero-copy view of the audio captured since the previous drain
+        view, self.partial_mark = self.partial_buf.since(self.partial_mark)
+        return view
+
+    def speech_pcm(self) -> np.ndarray:
+        pcm = self.frames.view()
+        if self.vad is None or not self.vad.has_speech:
+            return pcm
+        regions = self.vad.speech_regions(self.settings.VAD_PADDING_MS, total_samples=len(pcm))
+        return extract_speech(pcm, regions)
+
+    def leading_silence_samples(self) -> int:
+        if self.vad is None or not self.vad.regions:
+            return 0
+        pad = self.vad.sample_rate * self.settings.VAD_PADDING_MS // 1000
+        return max(0, self.vad.regions[0][0] - pad)
 
 class AudioProcessor(AudioProcessorBase):
     def __init__(self, state: StreamingState) -> None:
@@ -36,49 +116,25 @@ class AudioProcessor(AudioProcessorBase):
 
     def recv_audio(self, frame: av.AudioFrame) -> av.AudioFrame:
         try:
-            pcm = frame.to_ndarray()
-            if pcm.ndim == 2:
-                pcm = pcm.mean(axis=0).astype(np.int16)
-            else:
-                pcm = pcm.astype(np.int16)
-            b = pcm.tobytes()
-            self.state.frames.append(b)
-            self.state.partial_buf.append(b)
-            self.state.sample_rate = frame.sample_rate or self.state.sample_rate
-            self.state.has_audio = True
+            self.state.append(frame_to_mono(frame), frame.sample_rate or 48000)
         except Exception as e:
             # lightweight debug
             print("recv_audio error:", e)
         return frame
 
-def _pcm_bytes_to_wav(pcm_bytes: bytes, sr: int, channels: int = 1) -> bytes:
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(2)
-        wf.setframerate(sr)
-        wf.writeframes(pcm_bytes)
-    return buf.getvalue()
-
-def _trim_to_window(state: StreamingState) -> bytes:
-    if not state.partial_buf:
-        return b""
-    blob = b"".join(state.partial_buf)
-    bytes_per_sec = state.sample_rate * 2
-    needed = int(PARTIAL_WINDOW_SEC * bytes_per_sec)
-    if len(blob) > needed:
-        blob = blob[-needed:]
-        acc = 0
-        new_chunks = []
-        for ch in reversed(state.partial_buf):
-            if acc >= needed:
-                break
-            new_chunks.insert(0, ch)
-            acc += len(ch)
-        state.partial_buf = new_chunks
-    return blob
-
-def _init_state():
+@st.experimental_fragment(run_every=PARTIAL_COOLDOWN_SEC)
+def _watch_endpoint(settings: Settings, state: StreamingState):
+    # Polls the VAD while recording and fires the turn when the child stops talking
+    if not (settings.VAD_AUTO_REPLY and st.session_state.get("is_recording")):
+        return
+    if state.vad is not None and state.vad.end_of_utterance:
+        st.session_state["is_recording"] = False
+        state.recording = False
+        st.session_state["auto_turn"] = True
+        st.session_state["last_debug"] = "endpoint"
+        st.rerun()
+
+def _init_state(settings: Settings):
     if "webrtc_connected" not in st.session_state:
         st.session_state["webrtc_connected"] = False
     if "processor_attached" not in st.session_state:
@@ -86,18 +142,21 @@ def _init_state():
     if "is_recording" not in st.session_state:
         st.session_state["is_recording"] = False
     if "stream_state" not in st.session_state:
-        st.session_state["stream_state"] = StreamingState()
+        st.session_state["stream_state"] = StreamingState(settings)
     if "selected_device_id" not in st.session_state:
         st.session_state["selected_device_id"] = None
     if "last_debug" not in st.session_state:
         st.session_state["last_debug"] = "init"
 
 def render_audio_ui(settings: Settings):
-    _init_state()
+    _init_state(settings)
     state: StreamingState = st.session_state["stream_state"]
+    state.settings = settings
 
     st.subheader("Voice (Live Transcription)")
     st.write("Select your microphone, then click Start Recording. Speak, then click Stop Recording. Finally, press Transcribe and Reply.")
+    if settings.VAD_ENABLED and settings.VAD_AUTO_REPLY:
+        st.caption("Tip: when you pause after speaking, Genie replies on its own.")
 
     # Device selection UI (text field for exact deviceId to maximize reliability)
     with st.expander("Select device", expanded=False):
@@ -142,14 +201,12 @@ def render_audio_ui(settings: Settings):
             st.session_state["is_recording"] = not st.session_state["is_recording"]
             if st.session_state["is_recording"]:
                 # Start: do NOT clear processor or pipeline; only reset buffers
-                state.frames.clear()
-                state.partial_buf.clear()
-                state.partial_text = ""
-                state.last_partial_time = 0.0
-                state.has_audio = False
+                state.reset()
+                state.recording = True
                 st.session_state["last_debug"] = "recording_started"
                 st.info("Recording... speak your question.")
             else:
+                state.recording = False
                 st.session_state["last_debug"] = "recording_stopped"
                 if state.has_audio:
                     st.success("Recording stopped. Click Transcribe and Reply.")
@@ -160,13 +217,21 @@ def render_audio_ui(settings: Settings):
     partial_box = st.empty()
     if st.session_state["is_recording"] and st.session_state["processor_attached"]:
         now = time.time()
-        if now - state.last_partial_time > PARTIAL_COOLDOWN_SEC:
-            part_pcm = _trim_to_window(state)
-            if part_pcm:
-                wav_bytes = _pcm_bytes_to_wav(part_pcm, state.sample_rate, channels=1)
-                stt_quick = STTService(settings)
+        # Leading silence is never decoded: wait until the VAD has heard speech
+        waiting_for_speech = state.vad is not None and not state.vad.has_speech
+        if now - state.last_partial_time > PARTIAL_COOLDOWN_SEC and not waiting_for_speech:
+            part_pcm = state.drain_partial()
+            if len(part_pcm) and state.transcriber is None:
+                view_start = state.partial_mark - len(part_pcm)
+                part_pcm = part_pcm[max(0, state.leading_silence_samples() - view_start):]
+            if len(part_pcm):
+                if state.transcriber is None:
+                    state.transcriber = IncrementalTranscriber(
+                        STTService(settings), language=settings.LANGUAGE, max_tail_sec=PARTIAL_WINDOW_SEC
+                    )
                 try:
-                    partial_text = stt_quick.transcribe(wav_bytes, language=settings.LANGUAGE) or ""
+                    state.transcriber.feed_pcm(part_pcm, state.sample_rate)
+                    partial_text = state.transcriber.step()
                     if partial_text:
                         state.partial_text = partial_text
                         state.last_partial_time = now
@@ -180,29 +245,33 @@ def render_audio_ui(settings: Settings):
     # Visible debug line to see state transitions
     st.caption(f"Debug: connected={st.session_state['webrtc_connected']}, processor={st.session_state['processor_attached']}, recording={st.session_state['is_recording']}, has_audio={state.has_audio}, last={st.session_state['last_debug']}")
 
+    _watch_endpoint(settings, state)
+
     st.divider()
-    if st.button("Transcribe and Reply", key="btn_process"):
+    process = st.button("Transcribe and Reply", key="btn_process")
+    if process or st.session_state.pop("auto_turn", False):
         if not state.has_audio or len(state.frames) == 0:
             st.warning("No audio captured. Click Start Recording, speak, then Stop Recording.")
             return
 
-        full_pcm = b"".join(state.frames)
-        wav_bytes = _pcm_bytes_to_wav(full_pcm, state.sample_rate, channels=1)
-
-        st.info("Transcribing final audio...")
-        stt = STTService(settings)
-        final_text = stt.transcribe(wav_bytes, language=settings.LANGUAGE) or ""
-        if not final_text:
-            st.warning("Could not transcribe. Please try again closer to the mic.")
-            return
-        st.success(f"Transcript: {final_text}")
-
-        st.info("Thinking (Mistral API)...")
-        llm = LLMService(settings, strict_api=True)
-        reply = llm.generate(final_text)
-        st.success(f"Tutor: {reply}")
+        def _final_transcript() -> str:
+            if state.speculative is not None:
+                # Segments finished while recording are already decoded; only the rest is left
+                text = state.speculative.finish(state.frames.view(), state.vad)
+                if text:
+                    return text
+            if state.transcriber is not None:
+                # Reuse the caption transcript: only the uncommitted tail is decoded again
+                state.transcriber.feed_pcm(state.drain_partial(), state.sample_rate)
+                text = state.transcriber.finalize()
+                if text:
+                    return text
+            # Only the speech regions (plus padding) go to Whisper
+            stt = STTService(settings)
+            return stt.transcribe_pcm(state.speech_pcm(), state.sample_rate, language=settings.LANGUAGE) or ""
 
-        st.info("Speaking...")
-        tts = TTSService(settings)
-        out_wav = tts.synthesize(reply)
-        save_and_play_audio(out_wav, "Tutor Reply")
+        st.info("Transcribing, thinking and speaking (Mistral API)...")
+        handle = session_pipeline(settings).start(transcribe=_final_transcript)
+        transcript, reply = render_turn(handle, settings)
+        if transcript and not reply:
+            st.warning("No reply was generated. Please try again.")
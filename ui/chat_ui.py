@@ -1,8 +1,6 @@
 import streamlit as st
-from nlp.mistral_service import LLMService
-from tts.tts_service import TTSService
-from tts.voice_utils import save_and_play_audio
 from config.settings import Settings
+from ui.turn_view import render_turn, session_pipeline
 
 def _init_session():
     if "messages" not in st.session_state:
@@ -20,16 +18,16 @@ def render_chat_ui(settings: Settings):
 
     if clear:
         st.session_state["messages"] = []
+        session_pipeline(settings).clear_context()
         st.rerun()
 
     if ask and user_input.strip():
         st.session_state["messages"].append(("user", user_input.strip()))
-        llm = LLMService(settings, strict_api=True)  # enforce Mistral API only
-        reply = llm.generate(user_input.strip())
-        st.session_state["messages"].append(("bot", reply))
-        tts = TTSService(settings)
-        out_wav = tts.synthesize(reply)  # prompt prevents emojis/symbols
-        save_and_play_audio(out_wav, "Tutor Reply")
+        # sentences are spoken as soon as they are generated; prompt prevents emojis/symbols
+        handle = session_pipeline(settings).start(user_text=user_input.strip())
+        _, reply = render_turn(handle, settings, show_transcript=False)
+        if reply:
+            st.session_state["messages"].append(("bot", reply))
 
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     for role, text in st.session_state["messages"]:
@@ -0,0 +1,39 @@
+import streamlit as st
+
+from telemetry.metrics import REGISTRY
+
+
+def render_metrics_panel():
+    # Sidebar view of the per-stage latency histograms and cache hit rates
+    with st.expander("Performance", expanded=False):
+        snap = REGISTRY.snapshot()
+        rows = [
+            {
+                "stage": name[: -len("_seconds")] if name.endswith("_seconds") else name,
+                "n": h["count"],
+                "p50 ms": round(h["p50"] * 1000, 1),
+                "p95 ms": round(h["p95"] * 1000, 1),
+                "p99 ms": round(h["p99"] * 1000, 1),
+            }
+            for name, h in sorted(snap["histograms"].items())
+            if name.endswith("_seconds")
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+        else:
+            st.caption("No timings yet.")
+
+        rtf = snap["histograms"].get("whisper_rtf")
+        if rtf:
+            st.text(f"Whisper RTF p50/p95: {rtf['p50']:.2f} / {rtf['p95']:.2f}")
+        batch = snap["histograms"].get("stt_batch_size")
+        if batch:
+            st.text(f"STT batch size p50/p95: {batch['p50']:.0f} / {batch['p95']:.0f}")
+        for name, value in sorted(snap["gauges"].items()):
+            if name.endswith("hit_rate"):
+                st.text(f"{name.replace('_', ' ')}: {value:.0%}")
+        for name, value in sorted(snap["counters"].items()):
+            st.text(f"{name}: {int(value)}")
+
+        st.download_button("Prometheus", REGISTRY.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+        st.download_button("JSON", REGISTRY.to_json(), file_name="metrics.json", mime="application/json")
@@ -0,0 +1,60 @@
+import time
+from typing import Tuple
+
+import streamlit as st
+
+from config.settings import Settings
+from pipeline.turn_pipeline import AUDIO, CANCELLED, DONE, ERROR, TOKEN, TRANSCRIPT, TurnHandle, TurnPipeline
+from tts.opus import encode_for_playback
+from tts.voice_utils import concat_wavs, wav_duration
+
+
+def session_pipeline(settings: Settings) -> TurnPipeline:
+    # One pipeline per browser session, shared by voice and chat, so a new turn cancels the old one
+    pipeline = st.session_state.get("turn_pipeline")
+    if pipeline is None:
+        pipeline = TurnPipeline(settings, strict_api=True)  # enforce Mistral API only
+        st.session_state["turn_pipeline"] = pipeline
+    pipeline.settings = settings
+    return pipeline
+
+
+def render_turn(handle: TurnHandle, settings: Settings, show_transcript: bool = True,
+                label: str = "Tutor") -> Tuple[str, str]:
+    # Draws a turn progressively from its event stream; returns (transcript, reply)
+    transcript_box = st.empty()
+    reply_box = st.empty()
+    player = st.empty()
+    transcript, reply, clips = "", "", []
+    play_until = 0.0
+
+    for event in handle.events():
+        if event.kind == TRANSCRIPT:
+            transcript = event.data
+            if show_transcript:
+                transcript_box.success(f"Transcript: {transcript}")
+            reply_box.info("Thinking...")
+        elif event.kind == TOKEN:
+            reply += event.data
+            reply_box.success(f"{label}: {reply.strip()}")
+        elif event.kind == AUDIO:
+            _, wav = event.data
+            clips.append(wav)
+            # Each sentence goes out as soon as it is encoded, while the previous one is still playing
+            data, mime = encode_for_playback(wav, settings)
+            # Replacing the element stops the previous clip, so wait for it to finish
+            time.sleep(max(0.0, play_until - time.time()))
+            player.audio(data, format=mime, autoplay=True)
+            play_until = time.time() + wav_duration(wav)
+        elif event.kind == DONE:
+            reply = event.data or reply.strip()
+        elif event.kind == ERROR:
+            reply_box.warning(event.data)
+        elif event.kind == CANCELLED:
+            reply_box.info("Stopped.")
+
+    if clips:
+        time.sleep(max(0.0, play_until - time.time()))
+        data, mime = encode_for_playback(concat_wavs(clips), settings)
+        player.audio(data, format=mime)
+    return transcript, reply.strip()
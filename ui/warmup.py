@@ -0,0 +1,64 @@
+import importlib
+import threading
+from typing import Optional
+
+from config.settings import Settings
+from telemetry.metrics import span
+
+# Set once ui.audio_ui (webrtc, aiortc, av, webrtcvad) has been imported
+audio_ready = threading.Event()
+audio_error: Optional[str] = None
+
+_started = False
+_lock = threading.Lock()
+
+
+def _import_audio_ui():
+    global audio_error
+    try:
+        with span("warmup_audio_ui_import"):
+            importlib.import_module("ui.audio_ui")
+    except Exception as e:
+        audio_error = str(e)
+        print("Voice UI unavailable:", e)
+    finally:
+        audio_ready.set()
+
+
+def _warm_engines(settings: Settings):
+    # Imported here so the page never waits on faster-whisper or the TTS pool
+    from stt.model_registry import warm_up_whisper
+    from stt.process_pool import get_stt_pool
+    from tts.tts_service import start_presynthesis
+    from tts.worker_pool import get_tts_pool
+
+    if settings.WHISPER_WARMUP and settings.STT_ENGINE.upper() == "WHISPER":
+        with span("warmup_whisper"):
+            if settings.STT_BACKEND == "process":
+                get_stt_pool(settings)  # starts the workers, each loading its own model
+            else:
+                warm_up_whisper(settings).join()
+    with span("warmup_tts"):
+        get_tts_pool(settings)
+    if settings.TTS_PRESYNTHESIZE:
+        start_presynthesis(settings)
+
+
+def _run(settings: Settings):
+    _import_audio_ui()
+    try:
+        _warm_engines(settings)
+    except Exception as e:
+        print("Warm-up error:", e)
+
+
+def start_warmup(settings: Settings) -> Optional[threading.Thread]:
+    """Loads the voice stack in the background, once per process; call after the first render."""
+    global _started
+    with _lock:
+        if _started:
+            return None
+        _started = True
+    t = threading.Thread(target=_run, args=(settings,), name="warmup", daemon=True)
+    t.start()
+    return t